@@ -2,30 +2,156 @@ from collections import deque
 import heapq
 import random
 import math
+import batched
+from search import bfs_search, heap_search, reconstruct_path, first_step, counters, deadline, CHECK_EVERY
+from jps_plus import jps_plus_search, first_move
+from rrt import RRT
+from dstar import DStarLite
+from hpa import HPAGraph
+from pathcache import path_cache
+import whca
 
-GRID_SIZE = 10  # Can be changed to a parameter
+GRID_SIZE = 10  # Default size when no grid object is given
+HPA_MIN_SIZE = 200  # hybrid_strategy switches to HPA* on grids at least this wide
 
 # ----------------- Helper Functions -----------------
 def manhattan_distance(a, b):
     """Calculate Manhattan distance between two points"""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def get_occupied_positions(bots, current_bot=None):
-    """Get set of occupied positions, optionally excluding current bot"""
+def get_occupied_positions(bots, current_bot=None, grid=None):
+    """Get set of occupied positions, optionally excluding current bot
+
+    When grid is a World with an occupancy index this is an O(1) view that
+    supports `pos in occupied`, instead of a freshly built set.
+    """
+    if getattr(grid, 'occupied', None) is not None:
+        return grid.occupancy(None if current_bot is None else (current_bot.x, current_bot.y))
     if current_bot is None:
         return {(bot.x, bot.y) for bot in bots}
     return {(bot.x, bot.y) for bot in bots if bot is not current_bot}
 
+def grid_bounds(grid):
+    """(width, height) of the grid object, or the default square grid"""
+    if grid is None:
+        return GRID_SIZE, GRID_SIZE
+    return grid.width, grid.height
+
+def nearest_point(start, points):
+    """Nearest point by Manhattan distance, the first one on ties
+
+    Uses the points' own index when they have one (points.PointSet).
+    """
+    nearest = getattr(points, 'nearest', None)
+    if nearest is not None:
+        return nearest(start)
+    return min(points, key=lambda pt: manhattan_distance(start, pt))
+
+def get_point_lookup(grid, points):
+    """Something supporting `pos in lookup` for the remaining points"""
+    if getattr(grid, 'point_map', None) is not None:
+        return grid.point_lookup()
+    return points
+
+def get_memory(bot):
+    """The bot's per-round scratch dict; bots without one get a fresh dict, so
+    strategies keeping state there just start over every call"""
+    memory = getattr(bot, 'memory', None)
+    return memory if memory is not None else {}
+
+def get_distance_field(grid):
+    """Shared per-turn distance field, when the engine provides one"""
+    return getattr(grid, 'distance_field', None)
+
+def get_assigned_target(bot, grid):
+    """Point the team assignment gave this bot, or None when it has no teammates"""
+    assignment = getattr(grid, 'assignment', None)
+    return assignment.target(bot) if assignment is not None else None
+
+def reachable_goals(start, goals, grid):
+    """The goals start can reach around the map's walls (all of them on an open board)
+
+    Each check is an O(1) component lookup, so a search never has to exhaust
+    the map to find out a goal is walled off.
+    """
+    connectivity = getattr(grid, 'connectivity', None)
+    if connectivity is None:
+        return goals
+    return [goal for goal in goals if connectivity.reachable(start, goal)]
+
+def get_target(bot, grid, points):
+    """The bot's assigned point, else the nearest one by Manhattan distance
+
+    On a map the nearest is measured around the walls and unreachable points
+    are skipped; None if there is no reachable point.
+    """
+    target = get_assigned_target(bot, grid)
+    if target is not None:
+        return target
+    start = (bot.x, bot.y)
+    connectivity = getattr(grid, 'connectivity', None)
+    if connectivity is None:
+        return nearest_point(start, points)
+    best = None
+    for pt in points:
+        d = connectivity.estimate(start, pt)
+        if d is not None and (best is None or d < best[0]):
+            best = (d, pt)
+    return best[1] if best is not None else None
+
+def cached_path(kind, search, start, goals, bots, grid):
+    """search's moves from start to the goals, through path_cache
+
+    search(start, goals, bots, grid) returns (goal or None, parent, first)
+    like _bfs; kind tells its answers apart in the cache.
+    """
+    if not path_cache.enabled or not goals:
+        goal, parent, _ = search(start, goals, bots, grid)
+        return reconstruct_path(parent, goal) if goal is not None else []
+    goal_set = frozenset(goals)
+    target = next(iter(goal_set)) if len(goal_set) == 1 else goal_set
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
+
+    def key_from(pos):
+        return (kind, width, height, pos, target, path_cache.signature(pos, goal_set, grid))
+
+    def can_enter(pos):
+        return (0 <= pos[0] < width and 0 <= pos[1] < height and
+                (pos not in occupied or pos in goal_set))
+
+    def board():
+        return path_cache.board_signature(occupied, grid)
+
+    key = key_from(start)
+    path = path_cache.lookup(key, start, can_enter, board)
+    if path is not None:
+        counters.path_length = len(path) if path else None
+    else:
+        deadline.hit = False
+        found, parent, _ = search(start, goals, bots, grid)
+        if deadline.hit:  # out of time: the answer only goes part of the way, if anywhere
+            return reconstruct_path(parent, found) if found is not None else []
+        if found is None:
+            path_cache.store(key, None, board())
+            return []
+        path = reconstruct_path(parent, found)
+        path_cache.store(key, path)
+    if len(path) > 1:
+        path_cache.store_rest(key_from((start[0] + path[0][0], start[1] + path[0][1])), path)
+    return path
+
 # ----------------- Random Strategy -----------------
 def random_strategy(bot, grid, points, bots):
     """Random movement strategy"""
     directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
     random.shuffle(directions)
-    occupied = get_occupied_positions(bots)
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
     
     for dx, dy in directions:
         nx, ny = bot.x + dx, bot.y + dy
-        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and (nx, ny) not in occupied:
+        if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in occupied:
             return dx, dy
     return 0, 0  # No movement if all directions blocked
 
@@ -34,9 +160,20 @@ def greedy_strategy(bot, grid, points, bots):
     """Greedy strategy targeting nearest point"""
     if not points:
         return 0, 0
-    
-    # Find nearest point using Manhattan distance
-    target = min(points, key=lambda pt: manhattan_distance((bot.x, bot.y), pt))
+
+    target = get_assigned_target(bot, grid)
+    if target is None:
+        # Follow the shared distance field when the engine provides one
+        field = get_distance_field(grid)
+        if field is not None:
+            return field.descend((bot.x, bot.y))
+
+        # Find nearest point using Manhattan distance
+        target = nearest_point((bot.x, bot.y), points)
+    else:
+        connectivity = getattr(grid, 'connectivity', None)
+        if connectivity is not None:
+            return connectivity.step_toward((bot.x, bot.y), target)  # around the map's walls
     
     # Choose direction that reduces distance to target
     if bot.x < target[0]: return 1, 0
@@ -48,103 +185,121 @@ def greedy_strategy(bot, grid, points, bots):
 # ----------------- Rule-based Strategy -----------------
 def rule_based_strategy(bot, grid, points, bots):
     """Rule-based strategy with fallback to greedy"""
-    occupied = get_occupied_positions(bots)
+    occupied = get_occupied_positions(bots, grid=grid)
+    point_lookup = get_point_lookup(grid, points)
     
     # First check adjacent cells for points
     for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
         nx, ny = bot.x + dx, bot.y + dy
-        if (nx, ny) in points and (nx, ny) not in occupied:
+        if (nx, ny) in point_lookup and (nx, ny) not in occupied:
             return dx, dy
     
     # Fallback to greedy strategy if no adjacent points
     return greedy_strategy(bot, grid, points, bots)
 
+random_strategy.batch = batched.random_batch
+greedy_strategy.batch = batched.greedy_batch
+rule_based_strategy.batch = batched.rule_based_batch
+
 # ----------------- BFS Strategy -----------------
-def bfs_path(start, goals, bots):
+def bfs_path(start, goals, bots, grid=None):
     """Breadth-First Search pathfinding"""
-    queue = deque([(start, [])])
-    visited = set()
-    occupied = get_occupied_positions(bots)
-    goal_set = set(goals)
-    
-    while queue:
-        (x, y), path = queue.popleft()
-        
-        if (x, y) in goal_set:
-            return path
-        
-        if (x, y) in visited:
-            continue
-            
-        visited.add((x, y))
-        
-        # Explore neighbors
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and 
-                (nx, ny) not in visited and 
-                (nx, ny) not in occupied or (nx, ny) in goal_set):
-                queue.append(((nx, ny), path + [(dx, dy)]))
-    
-    return []  # No path found
+    return cached_path('bfs', _bfs, start, goals, bots, grid)  # [] if no path is found
+
+def _bfs(start, goals, bots, grid):
+    goal_set = set(reachable_goals(start, goals, grid))
+    if not goal_set:
+        return None, {}, {}
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
+
+    def can_enter(pos):
+        return (0 <= pos[0] < width and 0 <= pos[1] < height and
+                pos not in occupied) or pos in goal_set
+
+    return bfs_search(start, goal_set, can_enter)
 
 def bfs_strategy(bot, grid, points, bots):
     """BFS-based movement strategy"""
     if not points:
         return 0, 0
+
+    field = get_distance_field(grid)
+    if field is not None:
+        return field.descend((bot.x, bot.y))
         
-    path = bfs_path((bot.x, bot.y), points, bots)
+    path = bfs_path((bot.x, bot.y), points, bots, grid)
     return path[0] if path else (0, 0)
 
 # ----------------- A* Strategy -----------------
-def a_star_path(start, goals, bots):
+def a_star_path(start, goals, bots, grid=None):
     """A* pathfinding algorithm with Manhattan heuristic"""
+    return cached_path('a_star', _a_star, start, goals, bots, grid)  # [] if no path is found
+
+def _a_star(start, goals, bots, grid):
+    goals = reachable_goals(start, goals, grid)
+    if not goals:
+        return None, {}, {}
+    # on a map, the precomputed distance around the walls is a tighter bound
+    connectivity = getattr(grid, 'connectivity', None)
+    distance = manhattan_distance if connectivity is None else connectivity.estimate
+
     def heuristic(pos):
-        return min(manhattan_distance(pos, goal) for goal in goals)
-    
-    open_set = []
-    heapq.heappush(open_set, (0, start, []))  # (f_score, position, path)
-    closed = set()
-    occupied = get_occupied_positions(bots)
+        if connectivity is None:
+            return manhattan_distance(pos, nearest_point(pos, goals))
+        return min(distance(pos, goal) for goal in goals)
+
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
     goal_set = set(goals)
-    
-    while open_set:
-        _, current, path = heapq.heappop(open_set)
-        
-        if current in goal_set:
-            return path
-            
-        if current in closed:
-            continue
-            
-        closed.add(current)
-        
-        x, y = current
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and 
-                (nx, ny) not in closed and 
-                ((nx, ny) not in occupied or (nx, ny) in goal_set)):
-                new_path = path + [(dx, dy)]
-                g_score = len(new_path)
-                h_score = heuristic((nx, ny))
-                f_score = g_score + h_score
-                heapq.heappush(open_set, (f_score, (nx, ny), new_path))
-    
-    return []  # No path found
+
+    def can_enter(pos):
+        return (0 <= pos[0] < width and 0 <= pos[1] < height and
+                (pos not in occupied or pos in goal_set))
+
+    return heap_search(start, goal_set, can_enter,
+                       lambda g, pos: (g + heuristic(pos),), (0,))  # (f_score,)
 
 def a_star_strategy(bot, grid, points, bots):
     """A*-based movement strategy"""
     if not points:
         return 0, 0
+
+    field = get_distance_field(grid)
+    if field is not None:
+        return field.descend((bot.x, bot.y))
         
-    path = a_star_path((bot.x, bot.y), points, bots)
+    path = a_star_path((bot.x, bot.y), points, bots, grid)
     return path[0] if path else (0, 0)
 
+# ----------------- D* Lite Strategy -----------------
+def dstar_lite_strategy(bot, grid, points, bots):
+    """D* Lite towards the nearest point
+
+    The search is kept in bot.memory and each turn only repairs it for the
+    bots that moved, the points that were taken and the bot's own step.
+    """
+    if not points:
+        return 0, 0
+    pos = (bot.x, bot.y)
+    others = [(b.x, b.y) for b in bots if b is not bot]
+    width, height = grid_bounds(grid)
+    memory = get_memory(bot)
+    planner = memory.get('dstar')
+    if planner is None or (planner.width, planner.height) != (width, height):
+        planner = memory['dstar'] = DStarLite(width, height, pos, reachable_goals(pos, points, grid),
+                                                  others, getattr(grid, 'walls', None))
+    else:
+        planner.move_start(pos)
+        planner.remove_goals(planner.goals.difference(points))
+        planner.set_blocked(others)
+    planner.compute()
+    return planner.next_move()
+
 # ----------------- JPS Strategy -----------------
-def jps_identify_successors(parent, current, goals, bots):
+def jps_identify_successors(parent, current, goals, bots, grid=None):
     x, y = current
-    occupied = get_occupied_positions(bots)
+    occupied = get_occupied_positions(bots, grid=grid)
     successors = []
 
     if parent is None:
@@ -192,16 +347,17 @@ def jps_identify_successors(parent, current, goals, bots):
     
     return successors
 
-def jps_jump(current, direction, goals, bots):
+def jps_jump(current, direction, goals, bots, grid=None):
     dx, dy = direction
+    width, height = grid_bounds(grid)
     x, y = current
-    occupied = get_occupied_positions(bots)
+    occupied = get_occupied_positions(bots, grid=grid)
     goal_set = set(goals)
     
     while True:
         x += dx
         y += dy
-        if not (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE):
+        if not (0 <= x < width and 0 <= y < height):
             return None
         if (x, y) in occupied:
             return None
@@ -214,8 +370,8 @@ def jps_jump(current, direction, goals, bots):
                 ((x + dx, y - dy) in occupied and (x, y - dy) not in occupied)):
                 return (x, y)
             # 斜向時也要對正交方向遞迴 jump
-            if (jps_jump((x, y), (dx, 0), goals, bots) is not None or
-                jps_jump((x, y), (0, dy), goals, bots) is not None):
+            if (jps_jump((x, y), (dx, 0), goals, bots, grid) is not None or
+                jps_jump((x, y), (0, dy), goals, bots, grid) is not None):
                 return (x, y)
         else:  # straight
             if dx == 0:  # vertical
@@ -227,104 +383,144 @@ def jps_jump(current, direction, goals, bots):
                    ((x, y - 1) in occupied and (x - dx, y - 1) not in occupied):
                     return (x, y)
 
-def jps_path(start, goals, bots):
-    """Jump Point Search main algorithm"""
+def jps_path(start, goals, bots, grid=None):
+    """Jump Point Search main algorithm
+
+    Past search.deadline it returns the path to the jump point it was about
+    to expand instead.
+    """
+    goals = reachable_goals(start, goals, grid)
+    if not goals:
+        return []
     open_set = []
-    heapq.heappush(open_set, (0, start, None, []))  # (f, node, parent, path)
+    heapq.heappush(open_set, (0, start))  # (f, node)
+    parent = {start: None}  # node -> jump point it was reached from
+    first = {start: None}   # node -> first jump direction
+    best = {start: (0, None)}  # node -> (f, parent), the old heap tie-break order
+    depth = {start: 0}
     closed = set()
-    occupied = get_occupied_positions(bots)
     goal_set = set(goals)
+    timed = deadline.at is not None
     
     while open_set:
-        _, current, parent, path = heapq.heappop(open_set)
+        _, current = heapq.heappop(open_set)
         
         if current in goal_set:
+            counters.expanded += len(closed)
+            counters.pushed += len(parent) - 1
+            path = reconstruct_path(parent, current)
+            counters.path_length = len(path)
             return path
             
         if current in closed:
             continue
+
+        if timed and len(closed) % CHECK_EVERY == 0 and deadline.passed():
+            counters.expanded += len(closed)
+            counters.pushed += len(parent) - 1
+            return reconstruct_path(parent, current)
             
         closed.add(current)
         
         # Get valid jump directions
-        directions = jps_identify_successors(parent, current, goal_set, bots)
+        directions = jps_identify_successors(parent[current], current, goal_set, bots, grid)
         
         for dx, dy in directions:
-            jump_point = jps_jump(current, (dx, dy), goal_set, bots)
+            jump_point = jps_jump(current, (dx, dy), goal_set, bots, grid)
             
-            if jump_point:
+            if jump_point and jump_point not in closed:
                 jx, jy = jump_point
-                new_path = path + [(dx, dy)]
-                g = len(new_path)
+                g = depth[current] + 1
                 h = min(manhattan_distance((jx, jy), goal) for goal in goals)
                 f = g + h
-                heapq.heappush(open_set, (f, jump_point, current, new_path))
+                old = best.get(jump_point)
+                if old is None or (f, current) < old:
+                    best[jump_point] = (f, current)
+                    parent[jump_point] = current
+                    first[jump_point] = first[current] or (dx, dy)
+                    depth[jump_point] = g
+                    heapq.heappush(open_set, (f, jump_point))
     
+    counters.expanded += len(closed)
+    counters.pushed += len(parent) - 1
     return []  # No path found
 
 def jps_strategy(bot, grid, points, bots):
     if not points:
         return 0, 0
-    occupied = {(b.x, b.y) for b in bots if b is not bot}
-    target = min(points, key=lambda pt: abs(bot.x - pt[0]) + abs(bot.y - pt[1]))
-    path = jps_path((bot.x, bot.y), [target], bots)
-    print("bot位置:", (bot.x, bot.y), "目標:", target, "路徑:", path)
-    return path[0] if path else (0, 0)
+    target = get_target(bot, grid, points)
+    if target is None:
+        return 0, 0
+
+    # JPS+ on the engine's shared jump tables (4-connected)
+    table = getattr(grid, 'jump_table', None)
+    if table is not None:
+        return first_move(jps_plus_search(table, (bot.x, bot.y), target))
+
+    path = jps_path((bot.x, bot.y), [target], bots, grid)
+    if not path:
+        return 0, 0
+    dx, dy = path[0]
+    if dx != 0 and dy != 0:
+        # 8 方向的跳躍換成 4 方向可走的一步
+        occupied = get_occupied_positions(bots, grid=grid)
+        return (dx, 0) if (bot.x + dx, bot.y) not in occupied else (0, dy)
+    return dx, dy
 
 # ----------------- Improved RRT Strategy -----------------
-def rrt_path(start, goal, bots, max_iter=500):
-    """Rapidly-exploring Random Tree pathfinding"""
-    occupied = get_occupied_positions(bots)
-    tree = {start: None}  # Node: parent
-    
-    for _ in range(max_iter):
-        # Bias sampling toward goal (80% chance)
-        if random.random() < 0.8:
-            target = goal
-        else:
-            target = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-        
-        # Find nearest node in tree
-        nearest = min(tree.keys(), 
-                     key=lambda n: manhattan_distance(n, target))
-        
-        # Calculate step direction (max step size = 1)
-        dx = target[0] - nearest[0]
-        dy = target[1] - nearest[1]
-        step_x = 0 if dx == 0 else (1 if dx > 0 else -1)
-        step_y = 0 if dy == 0 else (1 if dy > 0 else -1)
-        
-        new_node = (nearest[0] + step_x, nearest[1] + step_y)
-        
-        # Check validity
-        if (0 <= new_node[0] < GRID_SIZE and 0 <= new_node[1] < GRID_SIZE and 
-            new_node not in occupied and new_node not in tree):
-            
-            tree[new_node] = nearest
-            
-            # Check if goal reached
-            if new_node == goal:
-                # Reconstruct path
-                path = []
-                current = new_node
-                while tree[current] is not None:
-                    parent = tree[current]
-                    path.append((current[0]-parent[0], current[1]-parent[1]))
-                    current = parent
-                return path[::-1]  # Reverse to start->goal
-    
+def rrt_path(start, goal, bots, max_iter=500, grid=None, goal_bias=0.8):
+    """Rapidly-exploring Random Tree pathfinding
+
+    Stopped by search.deadline, it returns the path to the tree node nearest
+    the goal.
+    """
+    if not reachable_goals(start, [goal], grid):
+        return []
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
+    tree = RRT(start, width, height)
+    deadline.hit = False
+    if tree.grow(goal, occupied, max_iter, goal_bias):
+        return tree.path_to(goal)
+    if deadline.hit:
+        return tree.path_to(tree.index.nearest(goal))
     return []  # No path found
 
-def rrt_strategy(bot, grid, points, bots):
-    """RRT-based movement strategy"""
+def rrt_strategy(bot, grid, points, bots, max_iter=500, goal_bias=0.8):
+    """RRT-based movement strategy
+
+    The tree is kept in bot.memory between turns: it is re-rooted at the bot's
+    new cell and loses the branches other bots now block, so later turns only
+    grow what is missing.
+    """
     if not points:
         return 0, 0
     
-    # Find nearest point
-    target = min(points, key=lambda pt: manhattan_distance((bot.x, bot.y), pt))
-    
-    path = rrt_path((bot.x, bot.y), target, bots)
-    return path[0] if path else (0, 0)
+    # Find nearest point (or the team's pick for this bot)
+    start = (bot.x, bot.y)
+    target = get_target(bot, grid, points)
+    if target is None:
+        return 0, 0
+
+    memory = get_memory(bot)
+    width, height = grid_bounds(grid)
+    tree = memory.get('rrt')
+    if tree is None or (tree.width, tree.height) != (width, height):
+        tree = memory['rrt'] = RRT(start, width, height)
+    else:
+        tree.reroot(start)
+        tree.prune((b.x, b.y) for b in bots if b is not bot)
+
+    occupied = get_occupied_positions(bots, grid=grid)
+    deadline.hit = False
+    if tree.grow(target, occupied, max_iter, goal_bias):
+        path = tree.path_to(target)
+        return path[0] if path else (0, 0)
+    if deadline.hit:
+        # out of time: head for the part of the tree that got closest
+        path = tree.path_to(tree.index.nearest(target))
+        return path[0] if path else (0, 0)
+    return 0, 0
 
 # ----------------- Hybrid Strategy -----------------
 def hybrid_strategy(bot, grid, points, bots):
@@ -333,75 +529,178 @@ def hybrid_strategy(bot, grid, points, bots):
         return 0, 0
     
     # If target is adjacent, take it immediately
+    occupied = get_occupied_positions(bots, grid=grid)
+    point_lookup = get_point_lookup(grid, points)
     for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
         nx, ny = bot.x + dx, bot.y + dy
-        if (nx, ny) in points and (nx, ny) not in get_occupied_positions(bots):
+        if (nx, ny) in point_lookup and (nx, ny) not in occupied:
             return dx, dy
     
+    size = max(grid_bounds(grid))
+
+    # On very large grids, plan over the cluster graph
+    if size >= HPA_MIN_SIZE and getattr(grid, 'hpa', None) is not None:
+        return hpa_strategy(bot, grid, points, bots)
+
     # For small number of points in large grid, use RRT
-    if len(points) < GRID_SIZE // 5:
+    if len(points) < size // 5:
         return rrt_strategy(bot, grid, points, bots)
     
     # For very open spaces with few obstacles, use JPS
-    if len(bots) < GRID_SIZE // 4:
+    if len(bots) < size // 4:
         return jps_strategy(bot, grid, points, bots)
     
     # Default to A* which works well in most cases
     return a_star_strategy(bot, grid, points, bots)
 
+# ----------------- HPA* Strategy -----------------
+def hpa_path(start, goals, bots, grid=None):
+    """Hierarchical A*: route over the cluster graph, then refine every leg
+
+    Falls back to a_star_path when bots block a leg inside its clusters.
+    """
+    goals = reachable_goals(start, goals, grid)
+    if not goals:
+        return []
+    goal = nearest_point(start, goals)
+    graph = getattr(grid, 'hpa', None)
+    if graph is None:
+        width, height = grid_bounds(grid)
+        graph = HPAGraph(width, height, obstacles=[(b.x, b.y) for b in bots])
+    return graph.path(start, goal, get_occupied_positions(bots, grid=grid)) or a_star_path(start, [goal], bots, grid)
+
+def hpa_strategy(bot, grid, points, bots):
+    """HPA*: plan over the World's cluster graph, refine only the leg to the next waypoint
+
+    The waypoints are kept in bot.memory until the target changes or a
+    transition on them moves.
+    """
+    if not points:
+        return 0, 0
+    target = get_target(bot, grid, points)
+    if target is None:
+        return 0, 0
+    graph = getattr(grid, 'hpa', None)
+    if graph is None:
+        return a_star_strategy(bot, grid, points, bots)
+
+    pos = (bot.x, bot.y)
+    memory = get_memory(bot)
+    plan = memory.get('hpa')
+    if plan is not None:
+        waypoints = plan[1]
+        while waypoints and waypoints[0] == pos:
+            waypoints.popleft()
+    if plan is None or plan[0] != target or not plan[1] or not graph.still_open(list(plan[1])):
+        plan = memory['hpa'] = (target, deque(graph.abstract_path(pos, target)))
+    waypoints = plan[1]
+    if not waypoints:
+        return 0, 0
+
+    found, _, first = graph.refine(pos, waypoints[0], get_occupied_positions(bots, bot, grid))
+    if found is None:
+        # bots wall off the leg: search the whole grid around them instead
+        memory.pop('hpa', None)
+        path = a_star_path(pos, [target], bots, grid)
+        return path[0] if path else (0, 0)
+    return first_step(first, found)
+
 # ----------------- Best_First_strategy -----------------
+def _best_first(start, goals, bots, grid):
+    goal = next(iter(goals))
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
+
+    def can_enter(pos):
+        return 0 <= pos[0] < width and 0 <= pos[1] < height and pos not in occupied
+
+    return heap_search(start, {goal}, can_enter,
+                       lambda g, pos: (manhattan_distance(pos, goal),),
+                       (manhattan_distance(start, goal),))
+
 def best_first_strategy(bot, grid, points, bots):
     """Best-First Search: 只用啟發式排序"""
     if not points:
         return 0, 0
-    start = (bot.x, bot.y)
-    goal = min(points, key=lambda pt: manhattan_distance(start, pt))
-    heap = []
-    heapq.heappush(heap, (manhattan_distance(start, goal), start, []))
-    visited = set()
-    occupied = get_occupied_positions(bots, bot)
-    while heap:
-        h, curr, path = heapq.heappop(heap)
-        if curr == goal:
-            return path[0] if path else (0, 0)
-        if curr in visited:
-            continue
-        visited.add(curr)
-        x, y = curr
-        for dx, dy in [(0,1),(0,-1),(1,0),(-1,0)]:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and (nx, ny) not in occupied and (nx, ny) not in visited:
-                heapq.heappush(heap, (manhattan_distance((nx, ny), goal), (nx, ny), path+[(dx,dy)]))
-    return 0, 0
+    goal = get_target(bot, grid, points)
+    if goal is None:
+        return 0, 0
+    path = cached_path('best_first', _best_first, (bot.x, bot.y), [goal], bots, grid)
+    return path[0] if path else (0, 0)
 
 # ----------------- Weighted_A_Star_strategy -----------------
+def _weighted_a_star(start, goals, bots, grid, weight):
+    goal = next(iter(goals))
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
+
+    def can_enter(pos):
+        return (0 <= pos[0] < width and 0 <= pos[1] < height and
+                (pos not in occupied or pos == goal))
+
+    return heap_search(start, {goal}, can_enter,
+                       lambda g, pos: (g + weight * manhattan_distance(pos, goal), g),
+                       (0, 0))  # (f, g)
+
 def weighted_a_star_strategy(bot, grid, points, bots, weight=2.0):
     """Weighted A*: 啟發式乘權重，速度快但不一定最短路"""
     if not points:
         return 0, 0
-    start = (bot.x, bot.y)
-    goal = min(points, key=lambda pt: manhattan_distance(start, pt))
-    heap = []
-    heapq.heappush(heap, (0, 0, start, []))
-    visited = set()
-    occupied = get_occupied_positions(bots, bot)
-    while heap:
-        f, g, curr, path = heapq.heappop(heap)
-        if curr == goal:
-            return path[0] if path else (0, 0)
-        if curr in visited:
-            continue
-        visited.add(curr)
-        x, y = curr
-        for dx, dy in [(0,1),(0,-1),(1,0),(-1,0)]:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and ((nx, ny) not in occupied or (nx, ny) == goal):
-                if (nx, ny) not in visited:
-                    new_path = path+[(dx,dy)]
-                    g2 = len(new_path)
-                    h = manhattan_distance((nx,ny), goal)
-                    heapq.heappush(heap, (g2+weight*h, g2, (nx,ny), new_path))
-    return 0, 0
+    goal = get_target(bot, grid, points)
+    if goal is None:
+        return 0, 0
+
+    def search(start, goals, bots, grid):
+        return _weighted_a_star(start, goals, bots, grid, weight)
+
+    path = cached_path(('weighted_a_star', weight), search, (bot.x, bot.y), [goal], bots, grid)
+    return path[0] if path else (0, 0)
+
+# ----------------- WHCA* Strategy -----------------
+def whca_strategy(bot, grid, points, bots, window=8):
+    """Windowed hierarchical cooperative A*
+
+    Bots using this strategy reserve their next `window` cells in the World's
+    shared space-time table, head for points no other of them has claimed, and
+    follow their plan for window // 2 turns before replanning. Other bots are
+    treated as standing still.
+    """
+    if not points:
+        return 0, 0
+    table = getattr(grid, 'reservations', None)
+    if table is None:
+        return a_star_strategy(bot, grid, points, bots)
+
+    now = grid.turn
+    pos = (bot.x, bot.y)
+    occupied = get_occupied_positions(bots, bot, grid)
+    memory = get_memory(bot)
+    plan = memory.get('whca')
+    if plan is not None:
+        start, path, target = plan
+        i = now - start
+        if (0 <= i < min(len(path) - 1, window // 2) and path[i] == pos and
+                target in get_point_lookup(grid, points) and path[i + 1] not in occupied):
+            return path[i + 1][0] - pos[0], path[i + 1][1] - pos[1]
+
+    table.release(bot)
+    goals = reachable_goals(pos, points, grid)
+    if not goals:
+        memory.pop('whca', None)
+        return 0, 0
+    connectivity = getattr(grid, 'connectivity', None)
+    estimate = connectivity.estimate if connectivity is not None else None
+    target = table.pick_target(bot, pos, goals, estimate)
+    static = {(b.x, b.y) for b in bots if b is not bot and not table.active(b, now)}
+    width, height = grid_bounds(grid)
+    path = whca.plan(table, bot, pos, target, now, window, width, height, static, occupied,
+                     grid.wall_lookup(), estimate)
+    if len(path) < 2:
+        memory.pop('whca', None)
+        return 0, 0
+    table.reserve(bot, path, now, target)
+    memory['whca'] = (now, path, target)
+    return path[1][0] - pos[0], path[1][1] - pos[1]
 
 # ----------------- Wall_Follower_strategy -----------------
 class WallFollowerBot:
@@ -420,12 +719,13 @@ def wall_follower_strategy(bot, grid, points, bots):
         (-1, 0): [(0, 1), (-1, 0), (0, -1), (1, 0)]     # 當前向左 → 優先嘗試向上
     }
 
-    occupied = get_occupied_positions(bots)
+    width, height = grid_bounds(grid)
+    occupied = get_occupied_positions(bots, grid=grid)
     
     # 根據上一次方向，取得優先級順序
     for dx, dy in directions_order[bot.last_direction]:
         nx, ny = bot.x + dx, bot.y + dy
-        if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and 
+        if (0 <= nx < width and 0 <= ny < height and 
             (nx, ny) not in occupied):
             bot.last_direction = (dx, dy)  # 記住當前方向
             return dx, dy
@@ -0,0 +1,174 @@
+from collections import deque
+from points import ring
+from search import deadline
+
+# ----------------- Team target assignment -----------------
+# Bots running the same strategy are a team. Within a team, points are shared
+# out by an auction (Bertsekas): an unassigned bidder takes the item with the
+# lowest cost = distance + price, raising its price by the margin over the
+# second-best item plus eps and taking it from its previous holder, who then
+# bids again. Prices persist between turns, so a turn only re-runs bids for
+# bidders whose item disappeared or was taken; everyone else keeps theirs.
+#
+# While there are at least as many points as bots, bots bid for points. Once
+# points run short the roles swap and points bid for bots: an auction only
+# settles quickly when bidders do not outnumber items.
+#
+# Costs are shortest-path distances on the board without bots: the Manhattan
+# distance on an open board, or on a map its precomputed distance around the
+# walls (items a bidder cannot reach are skipped). Bots move every turn, so
+# counting them as walls would only make assignments flip. Items are kept in buckets
+# and a bid scans rings of buckets outwards, stopping once a ring is further
+# away than the second-best cost found. A bidder that finds no item settles
+# for none; its bot then falls back to its strategy's own choice. eps = 1
+# keeps the total distance within one step per bot of optimal while avoiding
+# long price wars between near-equal bids.
+
+BIDS_PER_TURN = 10  # bounds a turn's work; bidders still queued use their own choice meanwhile
+# A decision deadline (search.deadline) passing between bids ends the turn's
+# bidding the same way.
+
+def team_of(bot):
+    return bot.strategy
+
+class Auction:
+    def __init__(self, world, bots, eps=1.0, bucket=8):
+        self.world = world
+        self.bots = bots
+        self.eps = eps
+        self.bucket = bucket
+        self.rings = max(world.width, world.height) // bucket + 2
+        self.connectivity = getattr(world, 'connectivity', None)
+        self.none_cost = world.width + world.height + 1
+        if self.connectivity is not None:
+            self.none_cost = world.width * world.height  # longer than any path around the walls
+        self.reverse = False  # False: bots bid for points; True: points bid for bots
+        self.price = {}   # item -> price
+        self.holds = {}   # bidder -> item, or None when it settled for none
+        self.holder = {}  # item -> bidder
+        self.queue = deque(bots)
+        self.points = self._index(world.points)  # bucket -> {point: point}
+        self.turn = None
+        self.bids = 0     # total bids, for benchmarks
+
+    def _index(self, items):
+        """Bucket items by cell; items maps item -> (x, y), or is a list of cells"""
+        buckets = {}
+        b = self.bucket
+        pairs = items.items() if isinstance(items, dict) else ((p, p) for p in items)
+        for item, (x, y) in pairs:
+            buckets.setdefault((x // b, y // b), {})[item] = (x, y)
+        return buckets
+
+    def _swap_roles(self):
+        self.reverse = True
+        self.price, self.holds, self.holder = {}, {}, {}
+        self.queue = deque(self.world.points)
+
+    def target(self, bot):
+        """The bot's point, or None"""
+        return self.holder.get(bot) if self.reverse else self.holds.get(bot)
+
+    def point_collected(self, pos):
+        b = self.bucket
+        cell = self.points.get((pos[0] // b, pos[1] // b))
+        if cell is not None:
+            cell.pop(pos, None)
+        if self.reverse:
+            bot = self.holds.pop(pos, None)  # the point was a bidder
+            if bot is not None:
+                del self.holder[bot]
+            return
+        self.price.pop(pos, None)
+        bot = self.holder.pop(pos, None)
+        if bot is not None:
+            del self.holds[bot]
+            self.queue.append(bot)
+
+    def update(self, budget=BIDS_PER_TURN):
+        """Run queued bids, at most budget of them; leftovers wait a turn"""
+        world = self.world
+        if not self.reverse and len(world.points) < len(self.bots):
+            self._swap_roles()
+        if self.reverse:
+            items = self._index({bot: (bot.x, bot.y) for bot in self.bots})
+            lookup = world.point_lookup()
+        while self.queue and budget and not deadline.passed():
+            bidder = self.queue.popleft()
+            if bidder in self.holds:
+                continue
+            if self.reverse:
+                if bidder in lookup:
+                    self._bid(bidder, bidder, items)
+            else:
+                self._bid(bidder, (bidder.x, bidder.y), self.points)
+            budget -= 1
+
+    def _bid(self, bidder, pos, buckets):
+        x, y = pos
+        b, price, connectivity = self.bucket, self.price, self.connectivity
+        bx, by = x // b, y // b
+        best = second = self.none_cost
+        best_item = None
+        for r in range(self.rings):
+            # every cell in ring r is at least (r - 1) * bucket + 1 steps away
+            if r > 0 and (r - 1) * b + 1 >= second:
+                break
+            for key in ring(bx, by, r):
+                for item, (ix, iy) in buckets.get(key, {}).items():
+                    if connectivity is None:
+                        cost = abs(ix - x) + abs(iy - y) + price.get(item, 0)
+                    else:
+                        d = connectivity.estimate(pos, (ix, iy))
+                        if d is None:
+                            continue
+                        cost = d + price.get(item, 0)
+                    if cost < best:
+                        best, second, best_item = cost, best, item
+                    elif cost < second:
+                        second = cost
+
+        self.bids += 1
+        if best_item is None:
+            self.holds[bidder] = None
+            return
+        price[best_item] = price.get(best_item, 0) + second - best + self.eps
+        previous = self.holder.get(best_item)
+        if previous is not None:
+            del self.holds[previous]
+            self.queue.append(previous)
+        self.holder[best_item] = bidder
+        self.holds[bidder] = best_item
+
+class Assignment:
+    """Team-level bot -> point assignment the World offers strategies.
+
+    target(bot) runs the team's auction at most once per turn; single-bot
+    teams get None so their strategy keeps its own nearest-point choice.
+    """
+    def __init__(self, world, team=team_of):
+        self.world = world
+        self.team = team
+        self.auctions = {}  # team key -> Auction, or None for a one-bot team
+
+    def auction(self, bot):
+        key = self.team(bot)
+        if key not in self.auctions:
+            members = [b for b in self.world.bots if getattr(b, 'strategy', None) is not None
+                       and self.team(b) == key]
+            self.auctions[key] = Auction(self.world, members) if len(members) > 1 else None
+        return self.auctions[key]
+
+    def target(self, bot):
+        auction = self.auction(bot)
+        if auction is None:
+            return None
+        if auction.turn != self.world.turn:
+            auction.update()
+            auction.turn = self.world.turn
+        return auction.target(bot)
+
+    def point_collected(self, pos):
+        for auction in self.auctions.values():
+            if auction is not None:
+                auction.point_collected(pos)
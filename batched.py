@@ -0,0 +1,148 @@
+import random
+from array import array
+from operator import itemgetter
+
+try:
+    import numpy as np  # optional: the plain-Python versions below give the same moves
+except ImportError:
+    np = None
+
+# ----------------- Batched strategy protocol -----------------
+# A strategy may carry a `batch` attribute deciding for every bot it controls
+# in one call:
+#
+#     strategy.batch(world, bots, seats, xs, ys, points) -> (dxs, dys)
+#
+# xs / ys hold every bot's position in seat order (array('i')), seats lists
+# the seats to decide for, and world.occupied / world.point_map are the
+# row-major occupancy and point arrays. dxs[k], dys[k] is the move for
+# seats[k]. All decisions see the board as it was at the start of the turn;
+# Match(batch=True) then applies them in seat order like ordinary moves.
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+_DX = array('b', [0, 0, 1, -1])
+_DY = array('b', [1, -1, 0, 0])
+
+def _moves(codes):
+    """Direction indices (-1 = stay) -> (dxs, dys)"""
+    if np is not None and isinstance(codes, np.ndarray):
+        dx = np.array([0, 0, 1, -1, 0], dtype=np.int8)
+        dy = np.array([1, -1, 0, 0, 0], dtype=np.int8)
+        return dx[codes], dy[codes]  # -1 picks the trailing stay entry
+    return (array('b', (_DX[c] if c >= 0 else 0 for c in codes)),
+            array('b', (_DY[c] if c >= 0 else 0 for c in codes)))
+
+# ----------------- Random -----------------
+def random_batch(world, bots, seats, xs, ys, points):
+    """random_strategy for many bots: a uniformly random free neighbour each"""
+    # No NumPy version: the draws have to come from random, one per bot, to
+    # match random_strategy, and that per-row loop is slower than this one.
+    w, h = world.width, world.height
+    occupied = world.occupied
+    codes = []
+    for s in seats:
+        x, y = xs[s], ys[s]
+        legal = [k for k, (dx, dy) in enumerate(DIRECTIONS)
+                 if 0 <= x + dx < w and 0 <= y + dy < h and not occupied[(y + dy) * w + x + dx]]
+        codes.append(random.choice(legal) if legal else -1)
+    return _moves(codes)
+
+# ----------------- Greedy -----------------
+def _assigned(world, bots, seats):
+    """{seat index in seats: target} for bots the team assignment has given a point"""
+    if not seats:
+        return {}
+    auction = world.assignment.auction(bots[seats[0]])
+    if auction is None:
+        return {}
+    world.assignment.target(bots[seats[0]])  # runs this turn's bids
+    index = {bots[s]: k for k, s in enumerate(seats)}
+    # (bot, point): bots bid for points, or after the roles swap points for bots
+    pairs = auction.holder.items() if auction.reverse else auction.holds.items()
+    return {index[bot]: target for bot, target in pairs if target is not None and bot in index}
+
+def _toward(world, x, y, target):
+    """greedy_strategy's step towards an assigned target, as a direction index"""
+    connectivity = world.connectivity
+    if connectivity is not None:
+        move = connectivity.step_toward((x, y), target)
+        return DIRECTIONS.index(move) if move != (0, 0) else -1
+    if x < target[0]: return 2
+    if x > target[0]: return 3
+    if y < target[1]: return 0
+    if y > target[1]: return 1
+    return -1
+
+def _descend(world, seats, xs, ys):
+    """DistanceField.descend for every seat, as direction indices"""
+    field = world.distance_field
+    if not seats:
+        return []
+    if not hasattr(field, 'dist'):  # a Bitboard or NearestSearch (boards up to 625 cells) keeps no per-cell distances
+        return [DIRECTIONS.index(move) if move != (0, 0) else -1
+                for move in (field.descend((xs[seat], ys[seat])) for seat in seats)]
+    s = field.stride
+    if np is not None:
+        i = (np.frombuffer(ys, dtype=np.intc)[seats] + 1) * s + np.frombuffer(xs, dtype=np.intc)[seats] + 1
+        cells = (i[:, None] + np.array([s, -s, 1, -1])).ravel().tolist()
+        # field.dist is a list: gather just the neighbours rather than copying the board
+        near = np.array(itemgetter(*cells)(field.dist) if len(cells) > 1 else [field.dist[cells[0]]],
+                        dtype=float).reshape(-1, 4)
+        return np.where(np.isfinite(near.min(axis=1)), near.argmin(axis=1), -1)
+
+    dist = field.dist
+    codes = []
+    for seat in seats:
+        i = (ys[seat] + 1) * s + xs[seat] + 1
+        best, code = float('inf'), -1
+        for k, j in enumerate((i + s, i - s, i + 1, i - 1)):
+            if dist[j] < best:
+                best, code = dist[j], k
+        codes.append(code)
+    return codes
+
+def greedy_batch(world, bots, seats, xs, ys, points):
+    """greedy_strategy for many bots: the team's assigned point, else down the distance field"""
+    if not points:
+        return _moves([-1] * len(seats))
+    codes = _descend(world, seats, xs, ys)
+    for k, target in _assigned(world, bots, seats).items():
+        codes[k] = _toward(world, xs[seats[k]], ys[seats[k]], target)
+    return _moves(codes)
+
+# ----------------- Rule-based -----------------
+def rule_based_batch(world, bots, seats, xs, ys, points):
+    """rule_based_strategy for many bots: step onto an adjacent free point, else greedy"""
+    w, h = world.width, world.height
+    occupied, point_map = world.occupied, world.point_map
+    if np is not None:
+        x = np.frombuffer(xs, dtype=np.intc)[seats]
+        y = np.frombuffer(ys, dtype=np.intc)[seats]
+        nx = x[:, None] + np.array([0, 0, 1, -1])
+        ny = y[:, None] + np.array([1, -1, 0, 0])
+        inside = (nx >= 0) & (nx < w) & (ny >= 0) & (ny < h)
+        cell = np.where(inside, ny * w + nx, 0)
+        grab = (inside & (np.frombuffer(point_map, dtype=np.uint8)[cell] != 0)
+                & (np.frombuffer(occupied, dtype=np.uint8)[cell] == 0))
+        adjacent = np.where(grab.any(axis=1), grab.argmax(axis=1), -1)
+    else:
+        adjacent = []
+        for s in seats:
+            x, y = xs[s], ys[s]
+            code = -1
+            for k, (dx, dy) in enumerate(DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < w and 0 <= ny < h and point_map[ny * w + nx] and not occupied[ny * w + nx]:
+                    code = k
+                    break
+            adjacent.append(code)
+
+    rest = [k for k, code in enumerate(adjacent) if code < 0]
+    if rest and points:
+        rest_seats = [seats[k] for k in rest]
+        codes = _descend(world, rest_seats, xs, ys)
+        for k, target in _assigned(world, bots, rest_seats).items():
+            codes[k] = _toward(world, xs[rest_seats[k]], ys[rest_seats[k]], target)
+        for k, code in zip(rest, codes):
+            adjacent[k] = code
+    return _moves(adjacent)
@@ -0,0 +1,733 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import algorithms
+from bitboard import Bitboard
+from flowfield import DistanceField, INF
+from host import StrategyHost
+from jps_plus import JumpTable, jps_plus_search
+from maps import GridMap, load_map, parse_map
+from pathcache import path_cache
+from points import PointSet
+from search import DIRECTIONS, counters
+from simulation import BOT_COLORS, STRATEGIES, Bot, Match, round_seed
+from watchdog import decide
+from world import World
+
+BASELINE_FILE = "benchmarks_baseline.json"
+THRESHOLD = 0.25  # fail --check when a tracked time grows by more than this fraction
+NOISE_FLOOR = 2e-5  # ...and by more than this many seconds, so microsecond jitter is ignored
+
+SUITES = {}
+
+def suite(name):
+    """Register a benchmark suite runnable as `python benchmarks.py <name>`
+
+    A suite prints its table and returns {metric: seconds} for the timings
+    that are tracked against the saved baseline (lower is better).
+    """
+    def register(func):
+        SUITES[name] = func
+        return func
+    return register
+
+class Obstacle:
+    """Stand-in bot that only blocks a cell"""
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+def random_map(size, density, seed):
+    """A size x size World with a fraction of its cells blocked by obstacle bots"""
+    rng = random.Random(seed)
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    obstacles = [Obstacle(x, y) for x, y in rng.sample(cells, int(len(cells) * density))]
+    world = World(size, size)
+    world.start_round([], obstacles)
+    blocked = {(o.x, o.y) for o in obstacles}
+    free = [c for c in cells if c not in blocked]
+    queries = [tuple(rng.sample(free, 2)) for _ in range(20)]
+    return world, obstacles, queries
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+# ----------------- JPS+ vs A* -----------------
+@suite("jps")
+def bench_jps(quick=False):
+    sizes = [32, 64] if quick else [32, 64, 128, 256]
+    tracked = {}
+    print(f"{'size':>6}{'density':>9}{'build ms':>10}{'patch ms':>10}{'A* ms':>9}{'JPS+ ms':>9}"
+          f"{'speedup':>9}{'JPS+ nodes':>12}")
+    for size in sizes:
+        for density in (0.0, 0.1, 0.2):
+            world, obstacles, queries = random_map(size, density, seed=size)
+            table, build = timed(JumpTable, size, size, [(o.x, o.y) for o in obstacles])
+            a_star_time = jps_time = 0.0
+            expanded = 0
+            for start, goal in queries:
+                a_path, t = timed(algorithms.a_star_path, start, [goal], obstacles, world)
+                a_star_time += t
+                before = counters.expanded
+                j_path, t = timed(jps_plus_search, table, start, goal)
+                jps_time += t
+                expanded += counters.expanded - before
+                j_len = sum(abs(a[0] - b[0]) + abs(a[1] - b[1]) for a, b in zip(j_path, j_path[1:]))
+                assert j_len == len(a_path), (start, goal, j_len, len(a_path))
+            n = len(queries)
+            # a bot stepping to a free neighbour, then back
+            patch = 0.0
+            for o in obstacles[:20]:
+                new = (o.x + 1, o.y) if o.x + 1 < size else (o.x - 1, o.y)
+                if not table.is_blocked(*new):
+                    _, t = timed(table.move_obstacle, (o.x, o.y), new)
+                    table.move_obstacle(new, (o.x, o.y))
+                    patch += t
+            patch /= max(1, min(20, len(obstacles)))
+            tracked[f"jps/{size}/{density}/search"] = jps_time / n
+            print(f"{size:>6}{density:>9.1f}{build * 1000:>10.1f}{patch * 1000:>10.2f}{a_star_time / n * 1000:>9.2f}"
+                  f"{jps_time / n * 1000:>9.2f}{a_star_time / max(jps_time, 1e-9):>8.1f}x{expanded / n:>12.0f}")
+    return tracked
+
+# ----------------- Path functions -----------------
+PATH_FUNCTIONS = [
+    ("bfs_path", lambda start, goal, bots, world: algorithms.bfs_path(start, [goal], bots, world)),
+    ("a_star_path", lambda start, goal, bots, world: algorithms.a_star_path(start, [goal], bots, world)),
+    ("jps_path", lambda start, goal, bots, world: algorithms.jps_path(start, [goal], bots, world)),
+    ("rrt_path", lambda start, goal, bots, world: algorithms.rrt_path(start, goal, bots, grid=world)),
+    ("hpa_path", lambda start, goal, bots, world: algorithms.hpa_path(start, [goal], bots, world)),
+]
+
+@suite("paths")
+def bench_paths(quick=False, repeat=3):
+    """Per-query time of the path functions in algorithms.py and their length against BFS"""
+    sizes = [10, 50] if quick else [10, 50, 100]
+    tracked = {}
+    print(f"{'size':>6}{'function':>14}{'ms/query':>10}{'found':>7}{'length/BFS':>12}")
+    enabled, path_cache.enabled = path_cache.enabled, False  # time the searches, not the cache
+    try:
+        _bench_paths(sizes, repeat, tracked)
+    finally:
+        path_cache.enabled = enabled
+    return tracked
+
+def _bench_paths(sizes, repeat, tracked):
+    for size in sizes:
+        world, obstacles, queries = random_map(size, 0.2, seed=size)
+        shortest = [len(algorithms.bfs_path(s, [g], obstacles, world)) for s, g in queries]
+        for name, func in PATH_FUNCTIONS:
+            best = INF
+            for _ in range(repeat):
+                random.seed(size)  # rrt_path samples from the module random
+                paths, t = timed(lambda: [func(s, g, obstacles, world) for s, g in queries])
+                best = min(best, t)
+            # jps_path returns one move per jump, so its ratio is below 1
+            found = [(len(p), bfs) for p, bfs in zip(paths, shortest) if p and bfs]
+            ratio = sum(p for p, _ in found) / max(1, sum(bfs for _, bfs in found))
+            tracked[f"paths/{size}/{name}"] = best / len(queries)
+            print(f"{size:>6}{name:>14}{best / len(queries) * 1000:>10.3f}{len(found):>4}/{len(queries):<2}"
+                  f"{ratio:>12.3f}")
+
+@suite("pathcache")
+def bench_pathcache(quick=False, size=100, turns=50, wander=5):
+    """The same 20 a_star_path routes every turn while a few obstacles wander: without and with the cache"""
+    capacities = [64] if quick else [8, 64, 4096]
+    tracked = {}
+    print(f"{'capacity':>9}{'search ms':>11}{'cached ms':>11}{'hit %':>7}{'invalid':>9}{'evicted':>9}{'longer':>8}")
+
+    def play():
+        world, obstacles, queries = random_map(size, 0.2, seed=size)
+        rng = random.Random(size)
+        paths, elapsed = [], 0.0
+        for _ in range(turns):
+            for o in rng.sample(obstacles, wander):
+                dx, dy = rng.choice(DIRECTIONS)
+                new = (o.x + dx, o.y + dy)
+                if world.in_bounds(*new) and not world.is_occupied(*new):
+                    world.bot_moved((o.x, o.y), new)
+                    o.x, o.y = new
+            start = time.perf_counter()
+            paths += [algorithms.a_star_path(s, [g], obstacles, world) for s, g in queries]
+            elapsed += time.perf_counter() - start
+        return paths, elapsed / len(paths)
+
+    saved = path_cache.capacity, path_cache.enabled
+    try:
+        path_cache.enabled = False
+        plain, search = play()
+        for capacity in capacities:
+            path_cache.clear()
+            path_cache.capacity = capacity
+            path_cache.enabled = True
+            cached, per_query = play()
+            stats = path_cache.stats()
+            longer = sum(len(c) > len(p) for c, p in zip(cached, plain))
+            tracked[f"pathcache/{capacity}"] = per_query
+            print(f"{capacity:>9}{search * 1000:>11.3f}{per_query * 1000:>11.3f}{100 * stats['hit_rate']:>7.1f}"
+                  f"{stats['invalidations']:>9}{stats['evictions']:>9}{longer:>8}")
+    finally:
+        path_cache.capacity, path_cache.enabled = saved
+        path_cache.clear()
+    return tracked
+
+# ----------------- HPA* vs A* -----------------
+@suite("hpa")
+def bench_hpa(quick=False, queries=10):
+    """First move on large maps: A* over the whole grid vs the cluster graph plus one leg"""
+    sizes = [200] if quick else [200, 500, 1000]
+    tracked = {}
+    print(f"{'size':>6}{'build s':>9}{'A* ms':>9}{'A* nodes':>10}{'HPA cold ms':>13}{'HPA ms':>9}"
+          f"{'HPA nodes':>11}{'speedup':>9}")
+    for size in sizes:
+        rng = random.Random(size)
+        walls = bytearray(rng.random() < 0.1 for _ in range(size * size))
+        world = World(grid_map=GridMap(size, size, walls))
+        world.start_round([], [])
+        conn = world.connectivity
+        cells = [(i % size, i // size) for i in conn.cells if conn.labels[i] == conn.main]
+        pairs = [tuple(rng.sample(cells, 2)) for _ in range(queries)]
+        graph, build = timed(lambda: world.hpa)
+        occupied = world.occupancy()
+
+        def first_moves():
+            for start, goal in pairs:
+                waypoints = graph.abstract_path(start, goal)
+                graph.refine(start, waypoints[0], occupied)
+
+        before = counters.expanded
+        _, cold = timed(first_moves)  # builds the intra-cluster distances it touches
+        _, warm = timed(first_moves)
+        hpa_nodes = (counters.expanded - before) / (2 * queries)
+        before = counters.expanded
+        _, a_star = timed(lambda: [algorithms._a_star(s, [g], [], world) for s, g in pairs])
+        a_star_nodes = (counters.expanded - before) / queries
+        tracked[f"hpa/{size}/first_move"] = warm / queries
+        print(f"{size:>6}{build:>9.2f}{a_star / queries * 1000:>9.1f}{a_star_nodes:>10.0f}"
+              f"{cold / queries * 1000:>13.1f}{warm / queries * 1000:>9.1f}{hpa_nodes:>11.0f}"
+              f"{a_star / max(warm, 1e-9):>8.1f}x")
+    return tracked
+
+# ----------------- D* Lite vs A* -----------------
+@suite("dstar")
+def bench_dstar(quick=False, team=8, turns=30):
+    """Per-decision work as bots move: D* Lite repairing its search vs A* from scratch.
+
+    Bots play dstar_lite_strategy; every decision is also timed with a fresh
+    A* from the same position, so both searches see the same boards.
+    """
+    sizes = [50] if quick else [50, 100, 200]
+    tracked = {}
+    print(f"{'size':>6}{'turn':>8}{'D* nodes':>10}{'D* ms':>8}{'A* nodes':>10}{'A* ms':>8}{'speedup':>9}")
+    for size in sizes:
+        rng = random.Random(size)
+        walls = bytearray(rng.random() < 0.1 for _ in range(size * size))
+        world = World(grid_map=GridMap(size, size, walls))
+        spawns = world.spawn_positions(team)
+        random.seed(size)
+        points = world.generate_points(size, spawns)
+        bots = [Bot(x, y, BOT_COLORS[i % len(BOT_COLORS)], algorithms.dstar_lite_strategy, f"D* Lite {i}")
+                for i, (x, y) in enumerate(spawns)]
+        world.start_round(points, bots)
+        # phase -> [decisions, D* nodes, D* seconds, A* nodes, A* seconds]
+        totals = {"first": [0, 0, 0.0, 0, 0.0], "later": [0, 0, 0.0, 0, 0.0]}
+        for turn in range(turns):
+            row = totals["first" if turn == 0 else "later"]
+            for bot in bots:
+                if not points:
+                    break
+                pos = (bot.x, bot.y)
+                before = counters.expanded
+                move, elapsed = timed(algorithms.dstar_lite_strategy, bot, world, points, bots)
+                row[1] += counters.expanded - before
+                row[2] += elapsed
+                before = counters.expanded
+                _, elapsed = timed(algorithms._a_star, pos, points, bots, world)
+                row[3] += counters.expanded - before
+                row[4] += elapsed
+                row[0] += 1
+                bot.apply(move, world, bots)
+                if (bot.x, bot.y) != pos:
+                    world.bot_moved(pos, (bot.x, bot.y))
+                if world.has_point(bot.x, bot.y):
+                    points.remove((bot.x, bot.y))
+                    world.point_collected((bot.x, bot.y))
+            world.end_turn()
+        for phase, (n, d_nodes, d_time, a_nodes, a_time) in totals.items():
+            n = max(n, 1)
+            tracked[f"dstar/{size}/{phase}"] = d_time / n
+            print(f"{size:>6}{phase:>8}{d_nodes / n:>10.0f}{d_time / n * 1000:>8.2f}"
+                  f"{a_nodes / n:>10.0f}{a_time / n * 1000:>8.2f}{a_time / max(d_time, 1e-9):>8.1f}x")
+    return tracked
+
+# ----------------- Decision budgets -----------------
+@suite("budget")
+def bench_budget(quick=False, team=8):
+    """First decisions on a large map under a time budget: worst case, overruns and
+    how many of the anytime moves match the unbudgeted ones"""
+    size = 200 if quick else 400
+    names = ["Best-First Search", "Weighted A*", "RRT", "D* Lite", "JPS"]
+    tracked = {}
+    print(f"{'strategy':<20}{'budget ms':>10}{'avg ms':>9}{'max ms':>9}{'overruns':>10}{'same move':>11}")
+    rng = random.Random(size)
+    walls = bytearray(rng.random() < 0.2 for _ in range(size * size))
+    grid_map = GridMap(size, size, walls)
+    for name in names:
+        strategy = dict(STRATEGIES)[name]
+        reference = None
+        for budget in (None, 0.005, 0.001):
+            world = World(grid_map=grid_map)  # fresh shared tables: the first turn pays for them
+            spawns = world.spawn_positions(team)
+            random.seed(size)
+            points = PointSet(size, size, world.generate_points(team, spawns))  # few, far apart
+            bots = [Bot(x, y, BOT_COLORS[i % len(BOT_COLORS)], strategy, f"{name} {i}")
+                    for i, (x, y) in enumerate(spawns)]
+            world.start_round(points, bots)
+            decisions = [decide(bot, world, points, bots, budget) for bot in bots]
+            moves = [move for move, _ in decisions]
+            times = [elapsed for _, elapsed in decisions]
+            if reference is None:
+                reference = moves
+            same = sum(tuple(a) == tuple(b) for a, b in zip(moves, reference))
+            label = f"{budget * 1000:g}" if budget is not None else "-"
+            tracked[f"budget/{name}/{label}"] = sum(times) / team
+            print(f"{name:<20}{label:>10}{sum(times) / team * 1000:>9.2f}{max(times) * 1000:>9.2f}"
+                  f"{sum(bot.overruns for bot in bots):>10}{same:>8}/{team}")
+    return tracked
+
+# ----------------- Worker processes -----------------
+@suite("host")
+def bench_host(quick=False, team=8, turns=20):
+    """ms per turn with every bot deciding in this process vs in StrategyHost workers"""
+    size = 100 if quick else 200
+    name = "Weighted A*"  # searches from scratch every turn
+    workers = sorted({1, min(team, os.cpu_count() or 1)})
+    tracked = {}
+    print(f"{'size':>6}{'bots':>6}{'processes':>11}{'ms/turn':>9}{'publish us':>12}")
+    rng = random.Random(size)
+    grid_map = GridMap(size, size, bytearray(rng.random() < 0.2 for _ in range(size * size)))
+    for processes in [0] + workers:
+        host = StrategyHost(processes) if processes else None
+        try:
+            bots = [Bot(0, 0, BOT_COLORS[i % len(BOT_COLORS)], dict(STRATEGIES)[name], f"{name} {i}")
+                    for i in range(team)]
+            match = Match(bots, max_turns=turns + 1, seed=size, grid_map=grid_map, point_count=team,
+                          host=host)
+            match.step()  # workers build their shared services
+            _, played = timed(match.run)
+            per_turn = played / max(1, match.turn - 1)
+            publish = timed(host._publish, match)[1] if host else 0.0
+        finally:
+            if host is not None:
+                host.close()
+        label = processes or "-"
+        tracked[f"host/{size}/{label}"] = per_turn
+        print(f"{size:>6}{team:>6}{label:>11}{per_turn * 1000:>9.2f}{publish * 1e6:>12.1f}")
+    return tracked
+
+# ----------------- Bitboard vs sets -----------------
+class Bounds:
+    """A grid with a size but no occupancy index, so searches fall back to tuple sets"""
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+
+@suite("bitboard")
+def bench_bitboard(quick=False, bots=8):
+    """First step towards the nearest point: set-based BFS, DistanceField and Bitboard"""
+    sizes = [64, 256] if quick else [64, 128, 256, 512, 1024]
+    tracked = {}
+    print(f"{'size':>6}{'set BFS ms':>12}{'field build ms':>16}{'field us':>10}"
+          f"{'bits build ms':>15}{'bits ms':>9}{'layers ms':>11}")
+    for size in sizes:
+        rng = random.Random(size)
+        walls = bytearray(rng.random() < 0.1 for _ in range(size * size))
+        free = [(i % size, i // size) for i in range(size * size) if not walls[i]]
+        picked = rng.sample(free, size + bots)
+        points, starts = picked[:size], picked[size:]
+        wall_cells = [(i % size, i // size) for i in range(size * size) if walls[i]]
+        obstacles = [Obstacle(x, y) for x, y in wall_cells + starts]
+
+        plain = Bounds(size, size)
+        _, bfs = timed(lambda: [algorithms._bfs(s, points, obstacles, plain) for s in starts])
+        field, field_build = timed(DistanceField, size, size, points, wall_cells + starts)
+        moves, field_query = timed(lambda: [field.descend(s) for s in starts])
+        bits, bits_build = timed(Bitboard, size, size, walls, points, starts)
+        bit_moves, bits_query = timed(lambda: [bits.descend(s) for s in starts])
+        assert bit_moves == moves
+        _, layers = timed(lambda: sum(1 for _ in bits.layers()))
+        n = len(starts)
+        tracked[f"bitboard/{size}/descend"] = bits_query / n
+        print(f"{size:>6}{bfs / n * 1000:>12.2f}{field_build * 1000:>16.1f}{field_query / n * 1e6:>10.1f}"
+              f"{bits_build * 1000:>15.1f}{bits_query / n * 1000:>9.2f}{layers * 1000:>11.1f}")
+    return tracked
+
+# ----------------- Strategies -----------------
+class Scenario:
+    """A seeded starting position: grid size, point count, bot count and obstacle density
+
+    With map_file the walls (and size) come from that map instead of random
+    obstacles. Timings are the best of `repeat` runs.
+    """
+    def __init__(self, name, size, points, bots, density, turns=20, repeat=3, map_file=None):
+        self.name = name
+        self.size = size
+        self.points = points
+        self.bots = bots
+        self.density = density
+        self.turns = turns
+        self.repeat = repeat
+        self.map_file = map_file
+
+SCENARIOS = [
+    Scenario("10", 10, 12, 4, 0.0),
+    Scenario("10-dense", 10, 12, 4, 0.2),
+    Scenario("50", 50, 40, 8, 0.1),
+    Scenario("200", 200, 200, 8, 0.2),
+    Scenario("1000", 1000, 1000, 16, 0.1, turns=5, repeat=1),
+    Scenario("warehouse", None, 40, 8, 0.0, map_file="maps/warehouse.map"),
+]
+QUICK_SCENARIOS = SCENARIOS[:3] + SCENARIOS[-1:]
+
+def setup(scenario, strategy, name, seed):
+    """World, moving bots, everything that blocks (bots + obstacles) and points for one scenario"""
+    if scenario.map_file is not None:
+        world = World(grid_map=load_map(scenario.map_file))
+        spawns = world.spawn_positions(scenario.bots)
+        random.seed(seed)
+        points = world.generate_points(scenario.points, spawns)
+        bots = [Bot(x, y, BOT_COLORS[i % len(BOT_COLORS)], strategy, f"{name} {i}")
+                for i, (x, y) in enumerate(spawns)]
+        points = PointSet(world.width, world.height, points)
+        world.start_round(points, bots)
+        return world, bots, bots, points
+
+    rng = random.Random(seed)
+    size = scenario.size
+    world = World(size, size)
+    spawns = world.spawn_positions(scenario.bots)
+    taken = set(spawns)
+    cells = [(x, y) for x in range(size) for y in range(size) if (x, y) not in taken]
+    picked = rng.sample(cells, int(len(cells) * scenario.density) + scenario.points)
+    walls, points = picked[scenario.points:], picked[:scenario.points]
+    points = PointSet(size, size, points)
+    bots = [Bot(x, y, BOT_COLORS[i % len(BOT_COLORS)], strategy, f"{name} {i}")
+            for i, (x, y) in enumerate(spawns)]
+    everyone = bots + [Obstacle(x, y) for x, y in walls]
+    world.start_round(points, everyone)
+    return world, bots, everyone, points
+
+def play(scenario, strategy, name, seed, score=True, turns=None):
+    """Run a scenario with every seat on one strategy.
+
+    Returns (decisions, seconds spent deciding, decisions scored, decisions
+    on a shortest path). A decision is scored when some point is reachable,
+    and counts as optimal when it steps onto a neighbour with the smallest
+    BFS distance to the nearest point.
+    """
+    random.seed(seed)  # the random strategies draw from the module random
+    world, bots, everyone, points = setup(scenario, strategy, name, seed)
+    field = DistanceField(world.width, world.height, points, world.obstacles()) if score else None
+    return run_turns(world, bots, everyone, points, strategy,
+                     scenario.turns if turns is None else turns, field)
+
+def run_turns(world, bots, everyone, points, strategy, turns, field=None):
+    decisions = scored = optimal = 0
+    elapsed = 0.0
+    for _ in range(turns):
+        for bot in bots:
+            if not points:
+                break
+            start = time.perf_counter()
+            move = strategy(bot, world, points, everyone)
+            elapsed += time.perf_counter() - start
+            decisions += 1
+            if field is not None:
+                steps = [field.distance((bot.x + dx, bot.y + dy)) for dx, dy in DIRECTIONS]
+                best = min(steps)
+                if best != INF:
+                    scored += 1
+                    if tuple(move) in DIRECTIONS and steps[DIRECTIONS.index(tuple(move))] == best:
+                        optimal += 1
+            old = (bot.x, bot.y)
+            bot.apply(move, world, everyone)
+            new = (bot.x, bot.y)
+            if new != old:
+                world.bot_moved(old, new)
+                if field is not None:
+                    field.move_obstacle(old, new)
+            if world.has_point(*new):
+                points.remove(new)
+                world.point_collected(new)
+                if field is not None:
+                    field.remove_point(new)
+        world.end_turn()
+    return decisions, elapsed, scored, optimal
+
+def peak_memory(scenario, strategy, name, seed, turns=1):
+    """Peak bytes the strategy allocates over the first turns of a scenario
+
+    Setup is not traced. The first turn is where shared tables get built;
+    tracing whole runs is too slow on the big grids.
+    """
+    random.seed(seed)
+    world, bots, everyone, points = setup(scenario, strategy, name, seed)
+    tracemalloc.start()
+    try:
+        run_turns(world, bots, everyone, points, strategy, turns)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@suite("strategies")
+def bench_strategies(quick=False, seed=1):
+    """Every registered strategy on every scenario: decisions/s, peak memory, optimality"""
+    tracked = {}
+    print(f"{'scenario':>10}{'strategy':>20}{'decisions/s':>13}{'peak KB':>10}{'optimal':>9}")
+    for scenario in (QUICK_SCENARIOS if quick else SCENARIOS):
+        for name, strategy in STRATEGIES:
+            decisions, elapsed, scored, optimal = play(scenario, strategy, name, seed)
+            for _ in range(scenario.repeat - 1):
+                elapsed = min(elapsed, play(scenario, strategy, name, seed, score=False)[1])
+            peak = peak_memory(scenario, strategy, name, seed)
+            rate = decisions / max(elapsed, 1e-9)
+            share = f"{100 * optimal / scored:.1f}%" if scored else "-"
+            tracked[f"strategies/{scenario.name}/{name}"] = elapsed / max(1, decisions)
+            print(f"{scenario.name:>10}{name:>20}{rate:>13.0f}{peak / 1024:>10.0f}{share:>9}")
+    return tracked
+
+# ----------------- Cooperative planning -----------------
+@suite("whca")
+def bench_whca(quick=False, rounds=20, max_turns=400):
+    """Turns to collect every point with all seats on WHCA* against all on independent A*"""
+    setups = [(10, 4, 12), (20, 8, 40)] if quick else [(10, 4, 12), (20, 8, 40), (30, 16, 90), (50, 32, 250)]
+    tracked = {}
+    print(f"{'size':>6}{'bots':>6}{'points':>8}{'strategy':>10}{'turns':>8}{'cleared':>9}{'stalled':>9}{'ms/turn':>9}")
+    for size, count, point_count in setups:
+        for name, strategy in (("A*", algorithms.a_star_strategy), ("WHCA*", algorithms.whca_strategy)):
+            turns = cleared = stalled = 0
+            elapsed = 0.0
+            for r in range(rounds):
+                bots = [Bot(0, 0, BOT_COLORS[i % len(BOT_COLORS)], strategy, f"{name} {i}") for i in range(count)]
+                match = Match(bots, max_turns=max_turns, seed=round_seed(size, r),
+                              width=size, height=size, point_count=point_count)
+                start = time.perf_counter()
+                while not match.finished:
+                    before = [(b.x, b.y) for b in bots]
+                    match.step()
+                    stalled += sum((b.x, b.y) == p for b, p in zip(bots, before))
+                elapsed += time.perf_counter() - start
+                turns += match.turn
+                cleared += not match.points
+            tracked[f"whca/{size}/{count}/{name}"] = elapsed / max(1, turns)
+            print(f"{size:>6}{count:>6}{point_count:>8}{name:>10}{turns / rounds:>8.1f}"
+                  f"{100 * cleared / rounds:>8.0f}%{100 * stalled / max(1, turns * count):>8.1f}%"
+                  f"{elapsed / max(1, turns) * 1000:>9.2f}")
+    return tracked
+
+# ----------------- Team assignment -----------------
+@suite("assignment")
+def bench_assignment(quick=False, max_turns=300):
+    """Per-turn cost of the team auction, and turns to clear with and without it"""
+    setups = [(30, 10, 100)] if quick else [(30, 10, 100), (100, 50, 500)]
+    tracked = {}
+    print(f"{'size':>6}{'bots':>6}{'points':>8}{'first ms':>10}{'ms/turn':>9}{'max ms':>8}"
+          f"{'turns':>8}{'turns alone':>13}")
+    for size, count, point_count in setups:
+        results = []
+        for teams in (True, False):
+            bots = [Bot(0, 0, BOT_COLORS[i % len(BOT_COLORS)], algorithms.greedy_strategy, f"Greedy {i}")
+                    for i in range(count)]
+            match = Match(bots, max_turns=max_turns, seed=size, width=size, height=size,
+                          point_count=point_count)
+            assignment = match.world.assignment
+            if not teams:
+                assignment.team = id  # every bot on its own: nearest point
+            times = []
+            while not match.finished:
+                _, t = timed(assignment.target, bots[0])  # runs the turn's auction
+                times.append(t)
+                match.step()
+            results.append((match.turn, times))
+        (turns, times), (alone, _) = results
+        per_turn = sum(times[1:]) / max(1, len(times) - 1)
+        tracked[f"assignment/{size}/{count}/{point_count}"] = per_turn
+        print(f"{size:>6}{count:>6}{point_count:>8}{times[0] * 1000:>10.2f}{per_turn * 1000:>9.3f}"
+              f"{max(times[1:], default=0) * 1000:>8.2f}{turns:>8}{alone:>13}")
+    return tracked
+
+@suite("batch")
+def bench_batch(quick=False, turns=5):
+    """µs per bot of deciding a turn: one strategy call per bot vs one batched call"""
+    counts = [100, 1000] if quick else [100, 1000, 10000]
+    tracked = {}
+    print(f"{'strategy':<12}{'bots':>7}{'size':>6}{'per-bot us':>12}{'batched us':>12}{'turn us':>10}")
+    for name, strategy in STRATEGIES:
+        if not hasattr(strategy, "batch"):
+            continue
+        for count in counts:
+            size = int((25 * count) ** 0.5)  # same density at every count
+            bots = [Bot(0, 0, BOT_COLORS[i % len(BOT_COLORS)], strategy, f"{name} {i}")
+                    for i in range(count)]
+            match = Match(bots, max_turns=turns + 1, seed=count, width=size, height=size,
+                          point_count=count, batch=True)
+            match.step()  # builds the distance field and the team auction
+            single = batched = whole = 0.0
+            played = 0
+            while played < turns and not match.finished:
+                # both decide from the same turn-start board; only the batch is played
+                start = time.perf_counter()
+                for bot in bots:
+                    strategy(bot, match.world, match.points, bots)
+                single += time.perf_counter() - start
+                start = time.perf_counter()
+                match.decide_batches()
+                batched += time.perf_counter() - start
+                start = time.perf_counter()
+                match.step()
+                whole += time.perf_counter() - start
+                played += 1
+            per_bot = max(1, played) * count
+            tracked[f"batch/{name}/{count}"] = batched / per_bot
+            print(f"{name:<12}{count:>7}{size:>6}{single / per_bot * 1e6:>12.2f}"
+                  f"{batched / per_bot * 1e6:>12.2f}{whole / per_bot * 1e6:>10.2f}")
+    return tracked
+
+# ----------------- Points -----------------
+@suite("points")
+def bench_points(quick=False, size=1000, queries=200, turns=10):
+    """Nearest point, removal and generation on a 1000x1000 board: list vs PointSet"""
+    counts = [1000, 10000] if quick else [1000, 10000, 100000]
+    tracked = {}
+    print(f"{'points':>8}{'gen ms':>8}{'min() us':>10}{'nearest us':>12}{'list.remove us':>16}"
+          f"{'remove us':>11}{'turn ms':>9}")
+    world = World(size, size)
+    for count in counts:
+        random.seed(count)
+        cells, gen = timed(world.generate_points, count)
+        points = PointSet(size, size, cells)
+        rng = random.Random(count)
+        spots = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+        few = spots[:max(1, queries * 1000 // count)]  # min() gets slow: fewer queries
+        _, scan = timed(lambda: [algorithms.nearest_point(q, cells) for q in few])
+        _, indexed = timed(lambda: [points.nearest(q) for q in spots])
+        gone = rng.sample(cells, min(queries, count))
+        as_list = list(cells)
+        _, list_remove = timed(lambda: [as_list.remove(p) for p in gone])
+        _, set_remove = timed(lambda: [points.remove(p) for p in gone])
+
+        # whole turns of a round with that many points, strategies that look up the nearest one
+        picked = dict(STRATEGIES)
+        names = ["Greedy", "Rule-based", "Best-First Search", "Weighted A*"]
+        bots = [Bot(0, 0, BOT_COLORS[i], picked[n], n) for i, n in enumerate(names)]
+        match = Match(bots, max_turns=turns, seed=count, width=size, height=size, point_count=count)
+        match.step()  # builds the distance field
+        _, played = timed(match.run)
+        per_turn = played / max(1, match.turn - 1)
+        tracked[f"points/{count}/nearest"] = indexed / len(spots)
+        tracked[f"points/{count}/turn"] = per_turn
+        print(f"{count:>8}{gen * 1000:>8.1f}{scan / len(few) * 1e6:>10.1f}{indexed / len(spots) * 1e6:>12.2f}"
+              f"{list_remove / len(gone) * 1e6:>16.2f}{set_remove / len(gone) * 1e6:>11.2f}{per_turn * 1000:>9.2f}")
+    return tracked
+
+# ----------------- Obstacle maps -----------------
+@suite("maps")
+def bench_maps(quick=False, queries=20):
+    """Map precompute cost, cached load, and searches for walled-off goals with and without it"""
+    files = sorted(f for f in os.listdir("maps") if not f.startswith(".")) if os.path.isdir("maps") else []
+    tracked = {}
+    print(f"{'map':<18}{'size':>9}{'parts':>7}{'table MB':>10}{'build s':>9}{'cached ms':>11}"
+          f"{'A* unreachable ms':>19}{'with check us':>15}")
+    for name in files:
+        path = os.path.join("maps", name)
+        with open(path) as f:
+            grid_map = parse_map(f.read(), name)
+        _, build = timed(grid_map.precompute, None)
+        load_map(path)  # make sure the disk cache exists
+        loaded, cached = timed(load_map, path)
+        conn = loaded.connectivity
+        table_mb = 2 * len(conn.table) / 1e6 if conn.table is not None else 0.0
+
+        # goals in a component the spawn cannot reach: a plain A* has to exhaust
+        # the spawn's whole area before giving up, the component check does not
+        world = World(grid_map=loaded)
+        world.start_round([], [])
+        start = loaded.nearest_open((0, 0))
+        walled = [(i % loaded.width, i // loaded.width) for i in conn.cells
+                  if conn.labels[i] != conn.labels[start[1] * loaded.width + start[0]]]
+        blind = World(grid_map=loaded)
+        blind.start_round([], [])
+        blind.map = None  # same walls, no connectivity
+        rng = random.Random(1)
+        goals = [[rng.choice(walled)] for _ in range(queries)] if walled else []
+        plain = sum(timed(algorithms.a_star_path, start, g, [], blind)[1] for g in goals)
+        checked = sum(timed(algorithms.a_star_path, start, g, [], world)[1] for g in goals)
+        n = max(1, len(goals))
+        tracked[f"maps/{name}/load"] = cached
+        if goals:
+            tracked[f"maps/{name}/unreachable"] = checked / n
+        print(f"{name:<18}{f'{loaded.width}x{loaded.height}':>9}{conn.components:>7}{table_mb:>10.2f}"
+              f"{build:>9.2f}{cached * 1000:>11.2f}"
+              f"{(plain / n * 1000 if goals else 0):>19.2f}{(checked / n * 1e6 if goals else 0):>15.2f}")
+    return tracked
+
+# ----------------- Baselines -----------------
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(results, path=BASELINE_FILE):
+    """Merge results into the baseline file, keeping metrics from suites not run this time"""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def regressions(results, baseline, threshold=THRESHOLD):
+    """[(metric, baseline seconds, current seconds)] for tracked times that grew past threshold"""
+    slower = []
+    for metric, seconds in sorted(results.items()):
+        base = baseline.get(metric)
+        if base and seconds > base * (1 + threshold) and seconds - base > NOISE_FLOOR:
+            slower.append((metric, base, seconds))
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pathfinding benchmarks")
+    parser.add_argument("suites", nargs="*", default=None, help=f"any of: {', '.join(SUITES)}")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these timings as the baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with status 1 if a tracked time is slower than the baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.suites or list(SUITES):
+        print(f"== {name} ==")
+        results.update(SUITES[name](quick=args.quick) or {})
+        print()
+
+    if args.check:
+        slower = regressions(results, load_baseline(args.baseline), args.threshold)
+        for metric, base, seconds in slower:
+            print(f"REGRESSION {metric}: {base * 1000:.3f} ms -> {seconds * 1000:.3f} ms "
+                  f"(+{100 * (seconds / base - 1):.0f}%)")
+        if slower:
+            sys.exit(1)
+        print(f"No tracked time regressed by more than {100 * args.threshold:.0f}%")
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Saved {len(results)} timings to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+from search import DIRECTIONS, counters
+
+INF = float('inf')
+
+# ----------------- Bitboard -----------------
+class Bitboard:
+    """Free cells, bots and points of a 4-connected grid as Python big ints.
+
+    Cell (x, y) is bit y * stride + x with stride = width + 1: the extra
+    column is always 0, so shifting a set of cells by 1 or by stride moves it
+    one step left, right, up or down without wrapping rows, and one mask
+    keeps what stayed on open cells. A BFS layer is then a handful of
+    whole-board int operations instead of a Python loop over its cells.
+
+    Offers the DistanceField queries (distance, descend) with the same
+    semantics: cells holding a bot are blocked, points are always enterable.
+    Nothing is stored per cell; each query floods from the asking cell until
+    it meets a point, so moves and collected points only flip a bit.
+    """
+    def __init__(self, width, height, walls=None, points=(), obstacles=()):
+        self.width = width
+        self.height = height
+        self.stride = s = width + 1
+        flags = bytearray(b'0') * (s * height)
+        for y in range(height):
+            row = y * s
+            if walls is None:
+                flags[row:row + width] = b'1' * width
+            else:
+                flags[row:row + width] = bytes(walls[y * width:(y + 1) * width]).translate(_OPEN)
+        self.open = _to_int(flags)
+        self.bots = self.mask(obstacles)
+        self.free = self.open & ~self.bots
+        self.points = self.mask(points)
+
+    def index(self, pos):
+        return pos[1] * self.stride + pos[0]
+
+    def mask(self, cells):
+        """Int with the bits of the given cells set"""
+        flags = bytearray(b'0') * (self.stride * self.height)
+        for x, y in cells:
+            flags[y * self.stride + x] = 49  # '1'
+        return _to_int(flags)
+
+    def _spread(self, front):
+        s = self.stride
+        return (front << 1) | (front >> 1) | (front << s) | (front >> s)
+
+    # --- incremental updates (the DistanceField interface) ---
+    def remove_point(self, pos):
+        self.points &= ~(1 << self.index(pos))
+
+    def add_obstacle(self, pos):
+        bit = 1 << self.index(pos)
+        self.bots |= bit
+        self.free &= ~bit
+
+    def remove_obstacle(self, pos):
+        bit = 1 << self.index(pos)
+        self.bots &= ~bit
+        self.free |= bit & self.open
+
+    def move_obstacle(self, old, new):
+        if old != new:
+            self.remove_obstacle(old)
+            self.add_obstacle(new)
+
+    # --- queries ---
+    def reachable(self, start):
+        """Cells reachable from start through free cells, as a mask (start included)"""
+        free = self.free
+        seen = front = 1 << self.index(start)
+        while front:
+            front = self._spread(front) & free & ~seen
+            seen |= front
+        return seen
+
+    def layers(self):
+        """BFS layers from every point: yields the mask of cells at distance 0, 1, 2, ..."""
+        free = self.free
+        seen = front = self.points
+        while front:
+            yield front
+            front = self._spread(front) & free & ~seen
+            seen |= front
+
+    def distance(self, pos):
+        """Steps from pos to the nearest point, INF if none can be reached"""
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return INF
+        bit = 1 << self.index(pos)
+        points = self.points
+        if points & bit:
+            return 0
+        passable = self.free | points
+        if not passable & bit:
+            return INF
+        seen = front = bit
+        d = 0
+        while front:
+            if front & points:
+                return d
+            front = self._spread(front) & passable & ~seen
+            seen |= front
+            d += 1
+        return INF
+
+    def descend(self, pos):
+        """Move to the neighbour nearest to a point; ties keep the bfs_path direction order
+
+        Floods from the four neighbours at once, one front each. Within a step
+        the fronts claim new cells in direction order, so the first front to
+        touch a point belongs to the lowest-ordered neighbour at the smallest
+        distance, as in DistanceField.descend.
+        """
+        i = self.index(pos)
+        s = self.stride
+        points = self.points
+        passable = self.free | points  # the bot's own cell only if it holds a point
+        seen = 0
+        fronts = []
+        for dx, dy in DIRECTIONS:
+            j = i + dy * s + dx
+            bit = (1 << j) & passable if j >= 0 else 0
+            seen |= bit
+            fronts.append(bit)
+        steps = 1
+        while any(fronts):
+            for k, front in enumerate(fronts):
+                if front & points:
+                    counters.path_length = steps
+                    return DIRECTIONS[k]
+            for k, front in enumerate(fronts):
+                if front:
+                    front = self._spread(front) & passable & ~seen
+                    seen |= front
+                    fronts[k] = front
+            steps += 1
+        counters.path_length = None
+        return 0, 0
+
+_OPEN = bytes.maketrans(b'\x00\x01', b'10')  # wall flags -> open bits
+
+def _to_int(flags):
+    """bytearray of b'0' / b'1', index = bit number -> int"""
+    return int(flags[::-1], 2) if flags else 0
@@ -0,0 +1,147 @@
+import heapq
+from search import DIRECTIONS, counters, deadline
+
+INF = float('inf')
+
+# ----------------- D* Lite -----------------
+# Koenig & Likhachev's D* Lite, searching backwards from every remaining point
+# to the bot, so g(s) is the distance from s to the nearest point. Between
+# turns only what changed is fed back in:
+#   * a cell becoming blocked or free (another bot moved) changes the cost of
+#     entering it, so its neighbours are updated;
+#   * a point disappearing makes its cell an ordinary one, so it is updated;
+#   * the bot moving only shifts the heuristic, absorbed by km.
+# compute() then repairs g just where those changes matter. Entering a cell
+# costs 1, and INF if a wall or another bot is on it; points are always
+# enterable, as in the other searches.
+
+class DStarLite:
+    def __init__(self, width, height, start, goals, blocked, walls=None):
+        self.width = width
+        self.height = height
+        self.walls = walls
+        self.start = start
+        self.goals = set(goals)
+        self.blocked = set(blocked)
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.queue = []
+        self.queued = {}  # cell -> its key in queue; other entries are stale
+        self.pushes = 0
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self._push(goal)
+
+    def _h(self, s):
+        return abs(s[0] - self.start[0]) + abs(s[1] - self.start[1])
+
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self._h(s) + self.km, m)
+
+    def _push(self, s):
+        key = self._key(s)
+        self.queued[s] = key
+        heapq.heappush(self.queue, (key, s))
+        self.pushes += 1
+
+    def _neighbours(self, s):
+        x, y = s
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                yield nx, ny
+
+    def _cost(self, v):
+        """Cost of stepping onto v"""
+        if v in self.goals:
+            return 1
+        if v in self.blocked or (self.walls is not None and self.walls[v[1] * self.width + v[0]]):
+            return INF
+        return 1
+
+    def _update(self, u):
+        if u not in self.goals:
+            g = self.g
+            self.rhs[u] = min((self._cost(v) + g.get(v, INF) for v in self._neighbours(u)), default=INF)
+        self.queued.pop(u, None)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self._push(u)
+
+    def compute(self):
+        """Repair g until the bot's cell is consistent
+
+        Stopping early at search.deadline leaves the queue as it is, so the
+        next call carries on where this one left off; next_move() meanwhile
+        goes by the g values repaired so far.
+        """
+        queue, queued, g, rhs = self.queue, self.queued, self.g, self.rhs
+        start = self.start
+        expanded, pushes = 0, self.pushes
+        timed = deadline.at is not None
+        while queue:
+            if timed and deadline.passed():  # an expansion updates a dozen cells: look every time
+                break
+            key, u = queue[0]
+            if queued.get(u) != key:
+                heapq.heappop(queue)  # stale entry
+                continue
+            if key >= self._key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            new_key = self._key(u)
+            if key < new_key:
+                heapq.heappop(queue)
+                self._push(u)
+                continue
+            heapq.heappop(queue)
+            del queued[u]
+            expanded += 1
+            if g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                for s in self._neighbours(u):
+                    self._update(s)
+            else:
+                g[u] = INF
+                self._update(u)
+                for s in self._neighbours(u):
+                    self._update(s)
+        counters.expanded += expanded
+        counters.pushed += self.pushes - pushes
+        counters.path_length = g[start] if g.get(start, INF) != INF else None
+
+    # --- turn-to-turn changes ---
+    def move_start(self, start):
+        if start != self.start:
+            self.km += self._h(start)  # h from the old start to the new one
+            self.start = start
+
+    def set_blocked(self, blocked):
+        """Replace the set of cells other bots stand on, updating around the ones that changed"""
+        blocked = set(blocked)
+        changed = blocked ^ self.blocked
+        self.blocked = blocked
+        for v in changed:
+            for u in self._neighbours(v):
+                self._update(u)
+
+    def remove_goals(self, gone):
+        for p in gone:
+            if p in self.goals:
+                self.goals.discard(p)
+                self._update(p)
+                if p in self.blocked:  # a bot stands on it: now an ordinary blocked cell
+                    for u in self._neighbours(p):
+                        self._update(u)
+
+    def next_move(self):
+        """Step to the neighbour with the smallest cost-to-go, (0, 0) if nothing is reachable"""
+        best, move = INF, (0, 0)
+        x, y = self.start
+        for dx, dy in DIRECTIONS:
+            v = (x + dx, y + dy)
+            if 0 <= v[0] < self.width and 0 <= v[1] < self.height:
+                d = self._cost(v) + self.g.get(v, INF)
+                if d < best:
+                    best, move = d, (dx, dy)
+        return move
@@ -1,16 +1,25 @@
+import argparse
 import pygame
 import random
+import time
 from collections import deque
 import algorithms  # 引入演算法集合
+from maps import load_map
+from pacing import SKIP_BUDGET, SPEEDS, turns_due
+from simulation import Bot, BOT_COLORS, STRATEGIES, Simulation
+from profiler import Profiler
+from replay import ReplayReader, ReplayWriter, numbered_path
+from world import World
 
 # --- Parameters ---
-GRID_SIZE = 10
+GRID_SIZE = algorithms.GRID_SIZE  # 預設大小，可用 --width/--height 改變
 CELL_SIZE = 50
 INFO_HEIGHT = 100
 SCREEN_WIDTH = GRID_SIZE * CELL_SIZE
 SCREEN_HEIGHT = GRID_SIZE * CELL_SIZE + INFO_HEIGHT
 POINT_COUNT = 12
 DEFAULT_TOTAL_ROUNDS = 20
+FPS = 60
 
 # --- Theme Colors ---
 CARD_COLOR = (44, 52, 82)
@@ -19,57 +28,11 @@ GRID_LINE_COLOR = (0, 0, 0)
 TITLE_COLOR = (230, 230, 255)
 SCORE_FONT_COLOR = (255, 255, 255)
 POINT_COLOR = (255, 210, 70)
+WALL_COLOR = (70, 70, 90)
 BTN_BG = (36, 40, 60)
 BTN_BG_HOVER = (77, 88, 120)
 BTN_TEXT = (255, 255, 255)
 
-STRATEGIES = [
-    ("Random", algorithms.random_strategy),
-    ("Greedy", algorithms.greedy_strategy),
-    ("Rule-based", algorithms.rule_based_strategy),
-    ("BFS", algorithms.bfs_strategy),
-    ("A*", algorithms.a_star_strategy),
-    ("JPS", algorithms.jps_strategy),
-    ("RRT", algorithms.rrt_strategy),
-    ("Hybrid", algorithms.hybrid_strategy),
-    ("Best-First Search", algorithms.best_first_strategy),
-    ("Weighted A*", algorithms.weighted_a_star_strategy),
-    ("Wall Follower", algorithms.wall_follower_strategy),
-]
-
-# --- Bot Class ---
-class Bot:
-    def __init__(self, x, y, color, strategy, name):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.strategy = strategy
-        self.name = name
-        self.score = 0
-        self.total_score = 0
-        self.wins = 0
-        self.turns_taken = 0
-
-    def move(self, grid, points, bots):
-        dx, dy = self.strategy(self, grid, points, bots)
-        nx, ny = self.x + dx, self.y + dy
-        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-            if not any(bot.x == nx and bot.y == ny for bot in bots if bot is not self):
-                self.x, self.y = nx, ny
-
-def generate_points():
-    points = set()
-    corners = {(0,0), (GRID_SIZE-1,0), (0,GRID_SIZE-1), (GRID_SIZE-1,GRID_SIZE-1)}
-    while len(points) < POINT_COUNT:
-        p = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-        points.add(p)
-        points -= corners
-    while len(points) < POINT_COUNT:
-        p = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-        if p not in corners:
-            points.add(p)
-    return list(points)
-
 def draw_button(screen, rect, text, font, is_hover):
     pygame.draw.rect(screen, BTN_BG_HOVER if is_hover else BTN_BG, rect, border_radius=8)
     pygame.draw.rect(screen, CARD_BORDER, rect, 2, border_radius=8)
@@ -172,58 +135,162 @@ def main_menu(screen, background_img):
                         selected_strategies[i] = (selected_strategies[i] + 1) % len(STRATEGIES)
 
 # 其餘程式碼與之前範例相同
-# ... render_game_screen, show_final_results, run_game, main ...
-
-def render_game_screen(screen, background_img, bots, points, round_num, turn, 
-                      font, big_font, GRID_SIZE, CELL_SIZE, INFO_HEIGHT, 
-                      SCREEN_WIDTH, SCREEN_HEIGHT, CARD_COLOR, CARD_BORDER, 
-                      TITLE_COLOR, SCORE_FONT_COLOR, GRID_LINE_COLOR, POINT_COLOR):
-    bg_scaled = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    screen.blit(bg_scaled, (0, 0))
-
-    info_rect = pygame.Rect(0, 0, SCREEN_WIDTH, INFO_HEIGHT)
-    pygame.draw.rect(screen, CARD_COLOR, info_rect)
-    pygame.draw.line(screen, CARD_BORDER, (0, INFO_HEIGHT), (SCREEN_WIDTH, INFO_HEIGHT), 3)
-
-    round_text = big_font.render(f"Round {round_num} - Turn {turn}", True, TITLE_COLOR)
-    screen.blit(round_text, (SCREEN_WIDTH // 2 - round_text.get_width() // 2, 10))
-
-    score_card = pygame.Rect(SCREEN_WIDTH // 2 - 260, 54, 520, 36)
-    pygame.draw.rect(screen, CARD_COLOR, score_card, border_radius=12)
-    pygame.draw.rect(screen, CARD_BORDER, score_card, 2, border_radius=12)
-    bot_scores = [f"{bot.name}: {bot.score}" for bot in bots]
-    scores_text = font.render("   ".join(bot_scores), True, SCORE_FONT_COLOR)
-    screen.blit(scores_text, (SCREEN_WIDTH // 2 - scores_text.get_width() // 2, 60))
-
-    grid_surface = pygame.Surface((GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE), pygame.SRCALPHA)
-    grid_surface.fill((0, 0, 0, 0))
-    for x in range(GRID_SIZE):
-        for y in range(GRID_SIZE):
-            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(grid_surface, GRID_LINE_COLOR, rect, 1)
-
-    for px, py in points:
-        pygame.draw.circle(grid_surface, POINT_COLOR, (px * CELL_SIZE + CELL_SIZE // 2, py * CELL_SIZE + CELL_SIZE // 2), CELL_SIZE // 4)
-
-    available_height = SCREEN_HEIGHT - INFO_HEIGHT
-    scale_factor = min(SCREEN_WIDTH / (GRID_SIZE * CELL_SIZE), available_height / (GRID_SIZE * CELL_SIZE))
-    scaled_width = int(GRID_SIZE * CELL_SIZE * scale_factor)
-    scaled_height = int(GRID_SIZE * CELL_SIZE * scale_factor)
-    scaled_grid = pygame.transform.scale(grid_surface, (scaled_width, scaled_height))
-    grid_x = (SCREEN_WIDTH - scaled_width) // 2
-    grid_y = INFO_HEIGHT + (available_height - scaled_height) // 2
-    screen.blit(scaled_grid, (grid_x, grid_y))
-
-    cell_scale = scale_factor
-    for bot in bots:
-        cx = int(bot.x * CELL_SIZE * cell_scale + CELL_SIZE * cell_scale // 2) + grid_x
-        cy = int(bot.y * CELL_SIZE * cell_scale + CELL_SIZE * cell_scale // 2) + grid_y
-        pygame.draw.circle(screen, (255,255,255), (cx, cy), int(CELL_SIZE * cell_scale // 3 + 2))
-        pygame.draw.circle(screen, bot.color, (cx, cy), int(CELL_SIZE * cell_scale // 3))
+# ... GameView, show_final_results, run_game, main ...
+
+class GameView:
+    """Draws the board, redrawing only what changed since the last frame.
+
+    The scaled background, info panel frame, grid lines and walls are drawn
+    once per window size into `board`. A frame copies back from it the cells
+    that points and bots have left, draws the new ones and passes just those
+    rects to pygame.display.update. `plan` does the bookkeeping for a frame
+    and `render` only draws what it returns.
+    """
+    def __init__(self, background_img, font, big_font):
+        self.background_img = background_img
+        self.font = font
+        self.big_font = big_font
+        self.key = None        # (window size, grid size, map) the board was built for
+        self.board = None
+        self.points = set()    # points on screen
+        self.bot_rects = []    # screen rects of the bots on screen
+        self.info = None       # round, turn and scores on screen
+
+    def invalidate(self):
+        """Redraw everything next frame, e.g. after set_mode"""
+        self.key = None
+
+    def _layout(self, size, world):
+        """Where the grid and the info panel go in a window of this size"""
+        width, height = size
+        grid_w, grid_h = world.width, world.height
+        available = height - INFO_HEIGHT
+        self.grid_w, self.grid_h = grid_w, grid_h
+        self.scale = max(min(width / grid_w, available / grid_h), 0.01)
+        self.grid_x = (width - int(grid_w * self.scale)) // 2
+        self.grid_y = INFO_HEIGHT + (available - int(grid_h * self.scale)) // 2
+        self.info_rect = pygame.Rect(0, 0, width, INFO_HEIGHT + 2)
+        self.points, self.bot_rects, self.info = set(), [], None
+
+    def _build(self, size, world):
+        self._layout(size, world)
+        width, height = size
+        grid_w, grid_h = world.width, world.height
+        board = pygame.transform.scale(self.background_img, size)
+        pygame.draw.rect(board, CARD_COLOR, (0, 0, width, INFO_HEIGHT))
+        pygame.draw.line(board, CARD_BORDER, (0, INFO_HEIGHT), (width, INFO_HEIGHT), 3)
+        score_card = pygame.Rect(width // 2 - 260, 54, 520, 36)
+        pygame.draw.rect(board, CARD_COLOR, score_card, border_radius=12)
+        pygame.draw.rect(board, CARD_BORDER, score_card, 2, border_radius=12)
+
+        left, top = self.grid_x, self.grid_y
+        right, bottom = left + int(grid_w * self.scale), top + int(grid_h * self.scale)
+        if self.scale >= 4:  # 格子太小時不畫格線
+            for x in range(grid_w + 1):
+                px = min(left + int(x * self.scale), right - 1)
+                pygame.draw.line(board, GRID_LINE_COLOR, (px, top), (px, bottom - 1))
+            for y in range(grid_h + 1):
+                py = min(top + int(y * self.scale), bottom - 1)
+                pygame.draw.line(board, GRID_LINE_COLOR, (left, py), (right - 1, py))
+        if world.map is not None:
+            for wx, wy in world.map.wall_positions():
+                board.fill(WALL_COLOR, self._cell(wx, wy))
+        self.board = board
+
+    def _cell(self, x, y):
+        s = self.scale
+        x0, y0 = self.grid_x + int(x * s), self.grid_y + int(y * s)
+        return pygame.Rect(x0, y0, max(1, self.grid_x + int((x + 1) * s) - x0),
+                           max(1, self.grid_y + int((y + 1) * s) - y0))
+
+    def _center(self, x, y):
+        return self.grid_x + int((x + 0.5) * self.scale), self.grid_y + int((y + 0.5) * self.scale)
+
+    def _cells_under(self, rect):
+        s = self.scale
+        x0 = max(0, int((rect.left - self.grid_x) / s))
+        x1 = min(self.grid_w - 1, int((rect.right - self.grid_x) / s))
+        y0 = max(0, int((rect.top - self.grid_y) / s))
+        y1 = min(self.grid_h - 1, int((rect.bottom - self.grid_y) / s))
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                yield x, y
+
+    def _point_rect(self, pos):
+        x, y = self._center(*pos)
+        r = max(1, int(self.scale) // 4)  # spills out of cells under 4 px
+        return self._cell(*pos).union(pygame.Rect(x - r, y - r, 2 * r + 1, 2 * r + 1))
+
+    def _draw_point(self, screen, pos):
+        pygame.draw.circle(screen, POINT_COLOR, self._center(*pos), max(1, int(self.scale) // 4))
+
+    def _bot_rect(self, bot):
+        x, y = self._center(bot.x, bot.y)
+        radius = max(2, int(self.scale // 3 + 2))
+        return pygame.Rect(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)
+
+    def _draw_bot(self, screen, bot):
+        center = self._center(bot.x, bot.y)
+        pygame.draw.circle(screen, (255, 255, 255), center, max(2, int(self.scale // 3 + 2)))
+        pygame.draw.circle(screen, bot.color, center, max(1, int(self.scale // 3)))
+
+    def _draw_info(self, screen, round_num, turn, bots, status):
+        width = self.info_rect.width
+        screen.blit(self.board, self.info_rect, self.info_rect)
+        title = f"Round {round_num} - Turn {turn}" + (f"  ({status})" if status else "")
+        round_text = self.big_font.render(title, True, TITLE_COLOR)
+        screen.blit(round_text, (width // 2 - round_text.get_width() // 2, 10))
+        bot_scores = [f"{bot.name}: {bot.score}" for bot in bots]
+        scores_text = self.font.render("   ".join(bot_scores), True, SCORE_FONT_COLOR)
+        screen.blit(scores_text, (width // 2 - scores_text.get_width() // 2, 60))
+
+    def plan(self, bots, points, info):
+        """Bookkeeping for the next frame, without drawing anything
+        (rects to copy back from the board, points to draw, whether the info
+        panel changed, rects to pass to display.update). Bots are always
+        drawn; the returned rects cover where they were and where they are.
+        """
+        current = set(points)
+        restore = [self._point_rect(pos) for pos in self.points - current] + self.bot_rects
+        draw = current - self.points
+        pad = max(1, int(self.scale) // 4) + 1
+        for rect in restore:  # points the copied-back rects cut into
+            draw.update(pos for pos in self._cells_under(rect.inflate(2 * pad, 2 * pad))
+                        if pos in current and self._point_rect(pos).colliderect(rect))
+        bot_rects = [self._bot_rect(bot) for bot in bots]
+        dirty = restore + [self._point_rect(pos) for pos in current - self.points] + bot_rects
+        info_changed = info != self.info
+        if info_changed:
+            dirty.append(self.info_rect)
+        self.points, self.bot_rects, self.info = current, bot_rects, info
+        return restore, draw, info_changed, dirty
+
+    def render(self, screen, bots, points, round_num, turn, world, status=""):
+        size = screen.get_size()
+        key = (size, world.width, world.height, world.map)
+        full = key != self.key
+        if full:
+            self._build(size, world)
+            self.key = key
+            screen.blit(self.board, (0, 0))
+
+        info = (round_num, turn, status, tuple(bot.score for bot in bots))
+        restore, draw, info_changed, dirty = self.plan(bots, points, info)
+        for rect in restore:
+            screen.blit(self.board, rect, rect)
+        for pos in draw:
+            self._draw_point(screen, pos)
+        for bot in bots:
+            self._draw_bot(screen, bot)
+        if info_changed:
+            self._draw_info(screen, round_num, turn, bots, status)
 
-    pygame.display.flip()
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
 
-def show_final_results(screen, bots, performance, total_rounds, background_img):
+def show_final_results(screen, bots, performance, total_rounds, background_img, profile=None):
     SCREEN_WIDTH, SCREEN_HEIGHT = pygame.display.get_surface().get_size()
     base_font_size = max(SCREEN_HEIGHT // 40, 18)
     font = pygame.font.SysFont("Segoe UI", base_font_size)
@@ -249,6 +316,9 @@ def show_final_results(screen, bots, performance, total_rounds, background_img):
 
     headers = ["Bot", "Wins", "Avg Score", "Efficiency"]
     col_widths = [0.25, 0.15, 0.3, 0.3]
+    if profile is not None:  # Profiler.summary()
+        headers += ["Avg ms", "Nodes/turn", "Stalls"]
+        col_widths = [0.22, 0.1, 0.14, 0.14, 0.12, 0.14, 0.14]
     col_positions = [box_x + int(sum(col_widths[:i]) * box_width) + 20 for i in range(len(headers))]
 
     header_y = box_y + 60
@@ -278,6 +348,13 @@ def show_final_results(screen, bots, performance, total_rounds, background_img):
             font.render(f"{avg_score:.2f}", True, SCORE_FONT_COLOR),
             font.render(f"{efficiency:.1f}%", True, SCORE_FONT_COLOR)
         ]
+        if profile is not None:
+            prof = profile.get(bot.name, {'avg_ms': 0.0, 'nodes_per_turn': 0.0, 'stalls': 0})
+            values += [
+                font.render(f"{prof['avg_ms']:.2f}", True, SCORE_FONT_COLOR),
+                font.render(f"{prof['nodes_per_turn']:.1f}", True, SCORE_FONT_COLOR),
+                font.render(str(prof['stalls']), True, SCORE_FONT_COLOR)
+            ]
 
         for i, text in enumerate(values):
             screen.blit(text, (col_positions[i], row_y + 6))
@@ -305,101 +382,219 @@ def show_final_results(screen, bots, performance, total_rounds, background_img):
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 return "menu"
 
-def run_game(screen, total_rounds, strategies, strategy_names, background_img):
+def run_game(screen, total_rounds, strategies, strategy_names, background_img,
+             grid_width=GRID_SIZE, grid_height=GRID_SIZE, profile=False, record=None, grid_map=None):
     global SCREEN_WIDTH, SCREEN_HEIGHT
     font = pygame.font.SysFont('Segoe UI', 22, bold=False)
     big_font = pygame.font.SysFont('Segoe UI', 32, bold=True)
     title_font = pygame.font.SysFont('Segoe UI', 40, bold=True)
     clock = pygame.time.Clock()
 
-    bots_template = [
-        (0, 0, (255, 0, 0), strategies[0], strategy_names[0]),
-        (GRID_SIZE-1, 0, (0, 128, 255), strategies[1], strategy_names[1]),
-        (0, GRID_SIZE-1, (0, 200, 0), strategies[2], strategy_names[2]),
-        (GRID_SIZE-1, GRID_SIZE-1, (255, 128, 0), strategies[3], strategy_names[3])
-    ]
-    bots = [Bot(*args) for args in bots_template]
-    performance = {bot.name: {'wins': 0, 'total_score': 0, 'total_turns': 0} for bot in bots}
-
-    for round_num in range(1, total_rounds+1):
-        for i, args in enumerate(bots_template):
-            bots[i].x, bots[i].y = args[0], args[1]
-            bots[i].score = 0
-            bots[i].turns_taken = 0
-
-        points = generate_points()
-        turn = 0
-        max_turns = 100
-        running = True
-
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); exit()
-                elif event.type == pygame.VIDEORESIZE:
-                    SCREEN_WIDTH, SCREEN_HEIGHT = event.size
-                    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_f:
-                        if screen.get_flags() & pygame.FULLSCREEN:
-                            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-                        else:
-                            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                        SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
-
-            if turn == 0:
-                render_game_screen(
-                    screen, background_img, bots, points, round_num, turn,
-                    font, big_font, GRID_SIZE, CELL_SIZE, INFO_HEIGHT,
-                    SCREEN_WIDTH, SCREEN_HEIGHT, CARD_COLOR, CARD_BORDER,
-                    TITLE_COLOR, SCORE_FONT_COLOR, GRID_LINE_COLOR, POINT_COLOR
-                )
-                pygame.time.wait(350)
-                turn += 1
-                continue
-
-            for bot in bots:
-                bot.move(None, points, bots)
-                if (bot.x, bot.y) in points:
-                    bot.score += 1
-                    points.remove((bot.x, bot.y))
-                    
-            render_game_screen(
-                screen, background_img, bots, points, round_num, turn,
-                font, big_font, GRID_SIZE, CELL_SIZE, INFO_HEIGHT,
-                SCREEN_WIDTH, SCREEN_HEIGHT, CARD_COLOR, CARD_BORDER,
-                TITLE_COLOR, SCORE_FONT_COLOR, GRID_LINE_COLOR, POINT_COLOR
-            )
-            pygame.time.wait(350)
-            clock.tick(60)
-            turn += 1
-
-            if not points or turn > max_turns:
-                running = False
-
-        winner_bot = max(bots, key=lambda b: b.score)
-        performance[winner_bot.name]['wins'] += 1
-        for bot in bots:
-            performance[bot.name]['total_score'] += bot.score
-            performance[bot.name]['total_turns'] += turn
-
+    profiler = Profiler(keep_rows=False) if profile else None
+    sim = Simulation(strategies, strategy_names, width=grid_width, height=grid_height,
+                     profiler=profiler, grid_map=grid_map)
+    log = ReplayWriter(record, sim.width, sim.height, strategy_names) if record else None
+    sim.log = log
+    bots = sim.bots
+    view = GameView(background_img, font, big_font)
+    # Up/Down: speed, Space: pause, S: finish this round, E: finish every round.
+    # pacing.turns_due says how many turns each frame plays, so the simulation
+    # runs at its own pace while the window keeps drawing at FPS.
+    speed = SPEEDS.index(1)
+    paused = False
+    skip_all = False
+
+    try:
+        for round_num in range(1, total_rounds+1):
+            match = sim.new_match()
+            points = match.points
+            skip = skip_all
+            owed = 0.0  # ms of turns due
+            done = False
+            clock.tick()
+
+            while not done:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit(); exit()
+                    elif event.type == pygame.VIDEORESIZE:
+                        SCREEN_WIDTH, SCREEN_HEIGHT = event.size
+                        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+                        view.invalidate()
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_f:
+                            if screen.get_flags() & pygame.FULLSCREEN:
+                                screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+                            else:
+                                screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+                            SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
+                            view.invalidate()
+                        elif event.key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                            speed = min(speed + 1, len(SPEEDS) - 1)
+                        elif event.key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+                            speed = max(speed - 1, 0)
+                        elif event.key == pygame.K_SPACE:
+                            paused = not paused
+                        elif event.key == pygame.K_s:
+                            skip = True
+                        elif event.key == pygame.K_e:
+                            skip = skip_all = True
+
+                turns, owed = turns_due(owed, clock.tick(FPS), SPEEDS[speed], paused, skip)
+                deadline = time.perf_counter() + SKIP_BUDGET
+                if turns is None:
+                    # 快轉：不等畫面，每幀只留一點時間處理事件和繪圖
+                    while not match.finished and time.perf_counter() < deadline:
+                        match.step()
+                    done = match.finished
+                else:
+                    for _ in range(turns):
+                        if match.finished:
+                            done = True  # the last turn has had its time on screen
+                            break
+                        match.step()
+                        if time.perf_counter() > deadline:
+                            owed = 0.0  # strategies slower than the speed: drop the backlog, stay responsive
+                            break
+
+                status = "skipping" if skip else "paused" if paused else f"x{SPEEDS[speed]:g}"
+                view.render(screen, bots, points, round_num, match.turn, match.world, status)
+
+            sim.record(match)
+    finally:  # quitting mid-game still leaves a readable log
+        if log is not None:
+            log.close()
+    performance = sim.performance
     result = show_final_results(
-        screen, bots, performance, total_rounds, background_img
+        screen, bots, performance, total_rounds, background_img,
+        profiler.summary() if profiler is not None else None
     )
 
     if result == "menu":
         return  # 回主選單
 
-def main():
+def replay_game(screen, background_img, path, round_index=0, grid_map=None):
+    """Play rounds back from a replay log; Left/Right seek to the previous/next round, M returns
+
+    Speed, pause and skipping work as in run_game; after a round's last turn
+    playback goes on with the next round. Logs do not store walls: pass the
+    map the rounds were played on to draw them.
+    """
     global SCREEN_WIDTH, SCREEN_HEIGHT
+    font = pygame.font.SysFont('Segoe UI', 22, bold=False)
+    big_font = pygame.font.SysFont('Segoe UI', 32, bold=True)
+    reader = ReplayReader(path)
+    if grid_map is not None and (grid_map.width, grid_map.height) != (reader.width, reader.height):
+        raise ValueError(f"{path} is {reader.width}x{reader.height}, the map is {grid_map.width}x{grid_map.height}")
+    world = World(reader.width, reader.height, grid_map)
+    bots = [Bot(0, 0, BOT_COLORS[i % len(BOT_COLORS)], None, name) for i, name in enumerate(reader.names)]
+    view = GameView(background_img, font, big_font)
+    clock = pygame.time.Clock()
+    speed = SPEEDS.index(1)
+    paused = False
+    skip = skip_all = False
+
+    round_index = max(0, min(round_index, len(reader) - 1))
+    frames = reader.round(round_index).frames()
+    frame = next(frames)
+    owed = 0.0  # ms of turns due
+    clock.tick()
+    while True:
+        seek = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit(); exit()
+            elif event.type == pygame.VIDEORESIZE:
+                SCREEN_WIDTH, SCREEN_HEIGHT = event.size
+                screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+                view.invalidate()
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_ESCAPE, pygame.K_m):
+                    reader.close()
+                    return
+                elif event.key == pygame.K_RIGHT:
+                    seek = round_index + 1
+                elif event.key == pygame.K_LEFT:
+                    seek = round_index - 1
+                elif event.key == pygame.K_PAGEUP:
+                    seek = round_index + 100
+                elif event.key == pygame.K_PAGEDOWN:
+                    seek = round_index - 100
+                elif event.key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    speed = min(speed + 1, len(SPEEDS) - 1)
+                elif event.key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+                    speed = max(speed - 1, 0)
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_s:
+                    skip = True
+                elif event.key == pygame.K_e:
+                    skip = skip_all = True
+        if seek is not None and 0 <= seek < len(reader) and seek != round_index:
+            round_index = seek  # 直接跳到該回合，不重跑前面的回合
+            frames = reader.round(round_index).frames()
+            frame = next(frames)
+            owed = 0.0
+            skip = skip_all
+
+        turns, owed = turns_due(owed, clock.tick(FPS), SPEEDS[speed], paused, skip)
+        deadline = time.perf_counter() + SKIP_BUDGET
+        while turns is None or turns > 0:
+            following = next(frames, None)
+            if following is None:
+                if round_index + 1 < len(reader):  # the last turn has had its time on screen
+                    round_index += 1
+                    frames = reader.round(round_index).frames()
+                    frame = next(frames)
+                    skip = skip_all
+                else:
+                    skip = skip_all = False  # end of the log: stay on the final board
+                owed = 0.0
+                break
+            frame = following
+            if turns is not None:
+                turns -= 1
+            if time.perf_counter() > deadline:
+                owed = 0.0  # drop the backlog, stay responsive
+                break
+
+        turn, positions, points, scores = frame
+        for bot, (x, y), score in zip(bots, positions, scores):
+            bot.x, bot.y, bot.score = x, y, score
+        status = "skipping" if skip else "paused" if paused else f"x{SPEEDS[speed]:g}"
+        view.render(screen, bots, points, f"{round_index + 1}/{len(reader)}", turn, world, status)
+
+def main(argv=None):
+    global SCREEN_WIDTH, SCREEN_HEIGHT
+    parser = argparse.ArgumentParser(description="AI Battle Bots")
+    parser.add_argument("--width", type=int, default=GRID_SIZE)
+    parser.add_argument("--height", type=int, default=GRID_SIZE)
+    parser.add_argument("--profile", action="store_true",
+                        help="time strategy decisions and show them in the results table")
+    parser.add_argument("--record", metavar="FILE",
+                        help="write the rounds played to a replay log (FILE, then FILE-2, ... per game)")
+    parser.add_argument("--replay", metavar="FILE", help="play back a replay log instead of a new game")
+    parser.add_argument("--round", type=int, default=1, help="first round to show with --replay")
+    parser.add_argument("--map", metavar="FILE", help="obstacle map (MovingAI .map or text grid); sets the size")
+    args = parser.parse_args(argv)
+    grid_map = load_map(args.map) if args.map else None
+
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
     pygame.display.set_caption("AI Battle Bots")
     background_img = pygame.image.load("image/background.png").convert()
 
+    if args.replay:
+        replay_game(screen, background_img, args.replay, args.round - 1, grid_map)
+        return
+
+    games = 0
     while True:
         total_rounds, strategies, strategy_names = main_menu(screen, background_img)
-        run_game(screen, total_rounds, strategies, strategy_names, background_img)
+        games += 1  # each game gets its own log: the menu may have changed the bots
+        record = numbered_path(args.record, games) if args.record else None
+        run_game(screen, total_rounds, strategies, strategy_names, background_img,
+                 args.width, args.height, args.profile, record, grid_map)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
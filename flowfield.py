@@ -0,0 +1,239 @@
+from collections import deque
+import heapq
+from search import counters, deadline
+
+INF = float('inf')
+SEARCH_CELLS = 625  # boards up to this many cells (25x25) use NearestSearch instead of a DistanceField
+
+# ----------------- Distance Field -----------------
+class DistanceField:
+    """Multi-source BFS distance from every cell to the nearest remaining point.
+
+    Cells holding a bot are obstacles. A point is always enterable, like a goal
+    in bfs_path, so its distance is 0 even if a bot stands on it. The field is
+    built once and then repaired locally as points disappear and bots move.
+
+    Cells are stored row-major with a one-cell blocked border, so the four
+    neighbours of cell i are just i + stride, i - stride, i + 1 and i - 1.
+    """
+    def __init__(self, width, height, points, obstacles):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        size = self.stride * (height + 2)
+        self.dist = [INF] * size
+        self.blocked = bytearray(b'\x01') * size
+        for y in range(height):
+            row = (y + 1) * self.stride + 1
+            self.blocked[row:row + width] = bytes(width)
+        for p in obstacles:
+            self.blocked[self.index(p)] = 1
+        self.sources = {self.index(p) for p in points}
+        self.rebuild()
+
+    def index(self, pos):
+        return (pos[1] + 1) * self.stride + pos[0] + 1
+
+    def rebuild(self):
+        """Full multi-source BFS, O(cells)"""
+        dist = self.dist
+        for i in range(len(dist)):
+            dist[i] = INF
+        for i in self.sources:
+            dist[i] = 0
+        self._spread(deque(self.sources))
+
+    def _spread(self, queue):
+        """BFS relaxation from the cells in queue through unblocked cells"""
+        dist, blocked, s = self.dist, self.blocked, self.stride
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for j in (i + s, i - s, i + 1, i - 1):
+                if d < dist[j] and not blocked[j]:
+                    dist[j] = d
+                    queue.append(j)
+
+    # --- incremental updates ---
+    def remove_point(self, pos):
+        i = self.index(pos)
+        if i in self.sources:
+            self.sources.discard(i)
+            self._raise(i)
+
+    def add_obstacle(self, pos):
+        i = self.index(pos)
+        if not self.blocked[i]:
+            self.blocked[i] = 1
+            if i not in self.sources:
+                self._raise(i)
+
+    def remove_obstacle(self, pos):
+        i = self.index(pos)
+        if self.blocked[i]:
+            self.blocked[i] = 0
+            if i not in self.sources:
+                self._lower(i)
+
+    def move_obstacle(self, old, new):
+        if old != new:
+            self.add_obstacle(new)
+            self.remove_obstacle(old)
+
+    def _lower(self, i):
+        """Cell i became passable: distances can only drop, spread them by BFS"""
+        dist, blocked, sources, s = self.dist, self.blocked, self.sources, self.stride
+        best = INF
+        for j in (i + s, i - s, i + 1, i - 1):
+            if dist[j] < best and (not blocked[j] or j in sources):
+                best = dist[j]
+        if best + 1 < dist[i]:
+            dist[i] = best + 1
+            self._spread(deque([i]))
+
+    def _raise(self, seed):
+        """The seed lost its point or became blocked: distances can only grow.
+
+        First collect every cell whose shortest path ran through the seed (in
+        increasing distance order, so a cell is only dropped once none of its
+        closer neighbours still supports it), then re-run Dijkstra into just
+        that region from its boundary.
+        """
+        dist, blocked, sources, s = self.dist, self.blocked, self.sources, self.stride
+        if dist[seed] == INF:
+            return
+        affected = set()
+        heap = [(dist[seed], seed)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if i in affected or i in sources:
+                continue
+            if not blocked[i]:
+                supported = False
+                for j in (i + s, i - s, i + 1, i - 1):
+                    if dist[j] == d - 1 and j not in affected and (not blocked[j] or j in sources):
+                        supported = True
+                        break
+                if supported:
+                    continue
+            affected.add(i)
+            for j in (i + s, i - s, i + 1, i - 1):
+                if dist[j] == d + 1 and j not in affected:
+                    heapq.heappush(heap, (d + 1, j))
+
+        for i in affected:
+            dist[i] = INF
+        heap = []
+        for i in affected:
+            if not blocked[i]:
+                best = INF
+                for j in (i + s, i - s, i + 1, i - 1):
+                    if dist[j] < best and (not blocked[j] or j in sources):
+                        best = dist[j]
+                if best != INF:
+                    dist[i] = best + 1
+                    heap.append((best + 1, i))
+        heapq.heapify(heap)
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            for j in (i + s, i - s, i + 1, i - 1):
+                if d + 1 < dist[j] and not blocked[j]:
+                    dist[j] = d + 1
+                    heapq.heappush(heap, (d + 1, j))
+
+    # --- queries ---
+    def distance(self, pos):
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.dist[self.index(pos)]
+        return INF
+
+    def descend(self, pos):
+        """Steepest-descent move from pos; ties keep the bfs_path direction order"""
+        i = self.index(pos)
+        dist, s = self.dist, self.stride
+        best, move = INF, (0, 0)
+        for j, step in ((i + s, (0, 1)), (i - s, (0, -1)), (i + 1, (1, 0)), (i - 1, (-1, 0))):
+            if dist[j] < best:
+                best, move = dist[j], step
+        counters.path_length = best + 1 if best != INF else None
+        return move
+
+# ----------------- Direct search -----------------
+class NearestSearch:
+    """DistanceField's queries answered by a BFS from the asking cell.
+
+    A field pays for its upkeep when many decisions share it, but on a small
+    board repairing it after every bot move costs more than searching. World
+    uses this class up to SEARCH_CELLS cells. It reads the World's occupancy
+    and point arrays as they are, so the updates are no-ops. The BFS runs
+    level by level over flat indices in bfs_path's direction order and stops
+    at the first point it sees, so descend gives the same move as
+    DistanceField.descend.
+    """
+    def __init__(self, world):
+        self.world = world
+
+    def remove_point(self, pos):
+        pass
+
+    def add_obstacle(self, pos):
+        pass
+
+    def remove_obstacle(self, pos):
+        pass
+
+    def move_obstacle(self, old, new):
+        pass
+
+    def _search(self, pos):
+        """(first move, steps) to the nearest point from pos, ((0, 0), INF) if none is reachable
+
+        Past search.deadline it gives up the same way.
+        """
+        world = self.world
+        w = world.width
+        n = w * world.height
+        occupied, point_map = world.occupied, world.point_map
+        seen = bytearray(n)
+        start = pos[1] * w + pos[0]
+        seen[start] = 1
+        frontier = [(start, None)]
+        steps = 0
+        timed = deadline.at is not None
+        while frontier:
+            if timed and deadline.passed():
+                break  # every cell in the frontier is as far from a point as the next
+            steps += 1
+            following = []
+            for i, move in frontier:
+                x = i % w
+                for j, step, inside in ((i + w, (0, 1), i + w < n), (i - w, (0, -1), i >= w),
+                                        (i + 1, (1, 0), x < w - 1), (i - 1, (-1, 0), x > 0)):
+                    if not inside or seen[j]:
+                        continue
+                    seen[j] = 1
+                    if point_map[j]:
+                        return move or step, steps
+                    if not occupied[j]:
+                        following.append((j, move or step))
+            frontier = following
+        return (0, 0), INF
+
+    def distance(self, pos):
+        x, y = pos
+        world = self.world
+        if not (0 <= x < world.width and 0 <= y < world.height):
+            return INF
+        if world.has_point(x, y):
+            return 0
+        if world.is_occupied(x, y):
+            return INF
+        return self._search(pos)[1]
+
+    def descend(self, pos):
+        move, steps = self._search(pos)
+        counters.path_length = steps if steps != INF else None
+        return move
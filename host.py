@@ -0,0 +1,325 @@
+import multiprocessing
+import os
+import random
+import time
+import traceback
+from multiprocessing import shared_memory
+from points import PointSet
+from watchdog import DEFAULT_MOVE, OVERRUN_GRACE, decide
+from world import World
+
+# ----------------- Strategy host -----------------
+# Runs bots' strategies in worker processes. Each worker gets a copy of the
+# bots once, when it starts (strategies, names, seats), and keeps its own
+# World and PointSet for the round. Per turn nothing about the board is
+# pickled: the host writes the state into one shared-memory block, every
+# worker reads it in place through memoryviews and replays what changed into
+# its World's services (distance field, jump tables, ...), then sends back
+# only its seats' moves over a pipe.
+#
+# All workers decide at once from the board as it was at the start of the
+# turn; Match applies the moves in seat order like batched decisions, so a
+# step another bot took first is refused as usual. Budgets (watchdog.py) are
+# enforced in the worker that makes the decision. Services bots coordinate
+# through (WHCA*'s reservation table) are per worker; the team auction only
+# depends on the board, so every worker reaches the same one.
+#
+# Strategies reach the workers the way multiprocessing passes arguments: as
+# they are under fork, pickled by name under spawn, where they then have to
+# be importable module-level callables.
+#
+# Budgets are also enforced from the host, which a strategy cannot ignore:
+# a worker sends each seat's move as soon as it has it, and the host waits at
+# most the worker's seats' budgets (plus grace and WORKER_SLACK) in all.
+# Seats still undecided then play DEFAULT_MOVE with an overrun counted, and
+# the worker is replaced by a fresh one that rejoins the round from the
+# shared block; its bots' strategy state starts over.
+
+HEADER_FIELDS = 3  # turn, points at the start of the round, points collected since
+WORKER_SLACK = 0.05  # seconds a worker gets on top of its budgets for the pipe and waking up
+
+class Layout:
+    """Offsets of the parts of the shared block
+
+    int32 parts first: the header, every bot's x, y in seat order, the
+    round's points and the points collected so far (x, y pairs, in order).
+    Then the row-major occupancy and point arrays, one byte per cell.
+    """
+    def __init__(self, width, height, bots, capacity):
+        self.width = width
+        self.height = height
+        self.bots = bots
+        self.capacity = capacity
+        cells = width * height
+        self.header = 0
+        self.positions = self.header + 4 * HEADER_FIELDS
+        self.points = self.positions + 8 * bots
+        self.collected = self.points + 8 * capacity
+        self.occupied = self.collected + 8 * capacity
+        self.point_map = self.occupied + cells
+        self.size = self.point_map + cells
+
+    def views(self, buf, readonly=False):
+        """(header, positions, points, collected, occupied, point_map) over buf"""
+        def ints(start, count):
+            view = buf[start:start + 4 * count].cast('i')
+            return view.toreadonly() if readonly else view
+
+        def cells(start):
+            view = buf[start:start + self.width * self.height]
+            return view.toreadonly() if readonly else view
+
+        return (ints(self.header, HEADER_FIELDS), ints(self.positions, 2 * self.bots),
+                ints(self.points, 2 * self.capacity), ints(self.collected, 2 * self.capacity),
+                cells(self.occupied), cells(self.point_map))
+
+def _release(views):
+    for view in views or ():
+        view.release()
+
+# ----------------- Worker side -----------------
+class SharedWorld(World):
+    """A worker's World: occupancy and points are read-only views of the shared block
+
+    The host has already written every move and collected point there, so
+    bot_moved / point_collected only update the services.
+    """
+    def attach(self, occupied, point_map):
+        self.shared = (occupied, point_map)
+
+    def start_round(self, points, bots):
+        super().start_round(points, bots)
+        self.occupied, self.point_map = self.shared
+
+    def bot_moved(self, old, new):
+        self._services_moved(old, new)
+
+    def point_collected(self, pos):
+        self._services_collected(pos)
+
+def _serve(conn, bots, seats, grid_map, bitboard):
+    """Worker process: answer the host's messages until it says stop"""
+    shm = views = world = points = budgets = None
+    seen = 0
+    try:
+        while True:
+            message = conn.recv()
+            kind = message[0]
+            if kind == 'stop':
+                break
+            if kind == 'attach':  # a new shared block
+                _, name, layout = message
+                _release(views)
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name=name)
+                views = layout.views(shm.buf, readonly=True)
+                world = SharedWorld(layout.width, layout.height, grid_map, bitboard)
+                world.attach(views[4], views[5])
+            elif kind == 'round':
+                _, seed, budgets = message
+                header, positions, shared_points = views[:3]
+                points = PointSet(world.width, world.height,
+                                  [(shared_points[2 * i], shared_points[2 * i + 1]) for i in range(header[1])])
+                for seat, bot in enumerate(bots):
+                    bot.reset(positions[2 * seat], positions[2 * seat + 1])
+                world.start_round(points, bots)
+                seen = 0
+                random.seed(seed)
+            elif kind == 'turn':
+                seen = _sync(world, bots, points, views, seen)
+                for seat in seats:
+                    bot = bots[seat]
+                    overruns = bot.overruns
+                    try:
+                        move, _ = decide(bot, world, points, bots, budgets[seat] if budgets else None)
+                    except Exception:
+                        conn.send(('error', bot.name, traceback.format_exc()))
+                        break
+                    conn.send(('move', seat, move[0], move[1], bot.overruns != overruns))
+                else:
+                    conn.send(('done',))
+    except (EOFError, KeyboardInterrupt):
+        pass  # the host went away
+    finally:
+        _release(views)
+        if shm is not None:
+            shm.close()
+
+def _sync(world, bots, points, views, seen):
+    """Replay the host's last turn into the worker's World; returns the points seen collected"""
+    header, positions, _, collected = views[:4]
+    for seat, bot in enumerate(bots):  # seat order, as the host applied them
+        new = (positions[2 * seat], positions[2 * seat + 1])
+        if new != (bot.x, bot.y):
+            world.bot_moved((bot.x, bot.y), new)
+            bot.x, bot.y = new
+    for i in range(seen, header[2]):
+        pos = (collected[2 * i], collected[2 * i + 1])
+        points.discard(pos)
+        world.point_collected(pos)
+    world.turn = header[0]
+    return header[2]
+
+# ----------------- Host side -----------------
+class StrategyHost:
+    """Decides every bot's move in worker processes; hand one to Match/Simulation as host=...
+
+    processes defaults to one per bot, at most one per CPU; seats are dealt
+    out round-robin. Workers start with the first round and are reused while
+    the bots, map and board size stay the same. close() (or a with block)
+    stops them and frees the shared block.
+    """
+    def __init__(self, processes=None):
+        self.processes = processes
+        self.workers = []  # (process, connection)
+        self.seats = []    # each worker's seats
+        self.started_for = None
+        self.shm = None
+        self.layout = None
+        self.views = None
+        self.round_seed = None
+
+    def start_round(self, match):
+        world, bots = match.world, match.bots
+        key = (tuple(map(id, bots)), world.map, world.width, world.height, world.bitboard)
+        if key != self.started_for:
+            self.close()
+        layout = self.layout
+        if (layout is None or (layout.width, layout.height, layout.bots) != (world.width, world.height, len(bots))
+                or layout.capacity < len(match.points)):
+            self._allocate(Layout(world.width, world.height, len(bots), len(match.points)))
+        if not self.workers:
+            # after the block exists, so the workers share this process's
+            # resource tracker instead of each starting one that unlinks it
+            self._start(bots, world)
+            self.started_for = key
+
+        header, positions, points, _, _, _ = self.views
+        header[1] = len(match.points)
+        header[2] = 0
+        for i, (x, y) in enumerate(match.points):
+            points[2 * i], points[2 * i + 1] = x, y
+        self._publish(match)
+        self.round_seed = random.getrandbits(32)
+        for _, conn in self.workers:
+            conn.send(('round', self.round_seed, match.budgets))
+
+    def _start(self, bots, world):
+        count = self.processes or min(len(bots), os.cpu_count() or 1)
+        count = max(1, min(count, len(bots)))
+        self.seats = [list(range(i, len(bots), count)) for i in range(count)]
+        self.workers = [self._spawn(bots, seats, world) for seats in self.seats]
+
+    def _spawn(self, bots, seats, world):
+        host_end, worker_end = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_serve, args=(worker_end, bots, seats, world.map, world.bitboard), daemon=True)
+        process.start()
+        worker_end.close()
+        host_end.send(('attach', self.shm.name, self.layout))
+        return process, host_end
+
+    def _replace(self, i, match):
+        """Stop worker i, which overran, and start a fresh one on the round as it stands"""
+        process, conn = self.workers[i]
+        process.terminate()
+        process.join(timeout=5)
+        conn.close()
+        # positions in the block are the turn's, and the worker replays the
+        # points collected since the round started on its first turn
+        self.workers[i] = self._spawn(match.bots, self.seats[i], match.world)
+        self.workers[i][1].send(('round', self.round_seed, match.budgets))
+
+    def _limit(self, seats, budgets):
+        """Seconds the host waits for a worker deciding seats, or None for no limit"""
+        if budgets is None or any(budgets[seat] is None for seat in seats):
+            return None
+        return sum(budgets[seat] for seat in seats) + len(seats) * OVERRUN_GRACE + WORKER_SLACK
+
+    def _allocate(self, layout):
+        self._free()
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, layout.size))
+        self.layout = layout
+        self.views = layout.views(self.shm.buf)
+        for _, conn in self.workers:
+            conn.send(('attach', self.shm.name, layout))
+
+    def _publish(self, match):
+        """Write the turn's board into the shared block"""
+        world = match.world
+        header, positions, _, _, occupied, point_map = self.views
+        header[0] = world.turn
+        for seat, bot in enumerate(match.bots):
+            positions[2 * seat], positions[2 * seat + 1] = bot.x, bot.y
+        occupied[:] = world.occupied
+        point_map[:] = world.point_map
+
+    def point_collected(self, pos):
+        """Record a collected point; called by Match as it happens, between decisions"""
+        header, collected = self.views[0], self.views[3]
+        i = header[2]
+        collected[2 * i], collected[2 * i + 1] = pos
+        header[2] = i + 1
+
+    def decide(self, match):
+        """{seat: move} for every bot, decided in parallel from the current board"""
+        self._publish(match)
+        for _, conn in self.workers:
+            conn.send(('turn',))
+        sent = time.perf_counter()
+        decided = {}
+        failure = None
+        for i, (_, conn) in enumerate(self.workers):
+            limit = self._limit(self.seats[i], match.budgets)
+            while True:
+                if limit is not None and not conn.poll(max(0.0, sent + limit - time.perf_counter())):
+                    for seat in self.seats[i]:
+                        if seat not in decided:
+                            decided[seat] = DEFAULT_MOVE
+                            match.bots[seat].overruns += 1
+                    self._replace(i, match)
+                    break
+                reply = conn.recv()
+                if reply[0] == 'move':
+                    _, seat, dx, dy, overran = reply
+                    decided[seat] = (dx, dy)
+                    if overran:
+                        match.bots[seat].overruns += 1
+                    continue
+                if reply[0] == 'error':
+                    failure = failure or reply
+                break
+        if failure is not None:
+            raise RuntimeError(f"Strategy of {failure[1]} failed in a worker:\n{failure[2]}")
+        return decided
+
+    def _free(self):
+        _release(self.views)
+        self.views = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        self.layout = None
+
+    def close(self):
+        for process, conn in self.workers:
+            try:
+                conn.send(('stop',))
+            except (BrokenPipeError, OSError):
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self.workers = []
+        self.started_for = None
+        self._free()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
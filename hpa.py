@@ -0,0 +1,272 @@
+import heapq
+from collections import deque
+from search import CHECK_EVERY, counters, deadline, heap_search, reconstruct_path
+
+# ----------------- Hierarchical path-finding A* -----------------
+# The grid is cut into CLUSTER_SIZE x CLUSTER_SIZE clusters. Along every
+# border between two clusters, each run of cells that is open on both sides
+# is an entrance, crossed at one transition: the facing pair of cells nearest
+# the middle of the run. Transition cells are the nodes of an abstract graph,
+# joined by a step of cost 1 across the border and, inside a cluster, by the
+# BFS distance between them around the walls. Those intra-cluster distances
+# are computed the first time a search touches the cluster and kept until a
+# transition in it moves.
+#
+# Walls are static; bots only move transitions. A bot standing on a
+# transition pushes it to the nearest free pair of its run (or closes the
+# entrance when the whole run is blocked), which only invalidates the two
+# clusters on either side. Bots elsewhere are left to the low-level search
+# that refines the path one leg at a time.
+
+CLUSTER_SIZE = 16
+
+class Entrance:
+    __slots__ = ('pairs', 'current')
+
+    def __init__(self, pairs):
+        self.pairs = pairs    # [(a, b)]: facing cells, a in the left/upper cluster
+        self.current = None   # index into pairs of the transition, None if closed
+
+class HPAGraph:
+    def __init__(self, width, height, walls=None, obstacles=(), cluster=CLUSTER_SIZE):
+        self.width = width
+        self.height = height
+        self.cluster = cluster
+        self.walls = walls if walls is not None else bytearray(width * height)
+        self.bots = set(obstacles)
+        self.entrances = []
+        self.by_cell = {}  # cell -> ids of the entrances whose run contains it
+        self.links = {}    # node -> nodes across a border
+        self.nodes = {}    # cluster -> {node: number of transitions using it}
+        self.intra = {}    # cluster -> {node: [(node, distance)]}, built on demand
+        self.local = {}    # cluster -> its open cells, for the BFS inside it
+        self._find_entrances()
+
+    def cluster_of(self, pos):
+        return pos[0] // self.cluster, pos[1] // self.cluster
+
+    def _open(self, x, y):
+        return not self.walls[y * self.width + x]
+
+    def _find_entrances(self):
+        c, w, h = self.cluster, self.width, self.height
+        borders = []
+        for x in range(c - 1, w - 1, c):  # vertical borders between x and x + 1
+            borders.append([((x, y), (x + 1, y)) for y in range(h)])
+        for y in range(c - 1, h - 1, c):  # horizontal borders between y and y + 1
+            borders.append([((x, y), (x, y + 1)) for x in range(w)])
+        for border in borders:
+            run = []
+            for i, (a, b) in enumerate(border):
+                if self._open(*a) and self._open(*b):
+                    run.append((a, b))
+                # runs also end where the border crosses into the next pair of clusters
+                last = i + 1 == len(border) or i % c == c - 1
+                if run and (last or not (self._open(*a) and self._open(*b))):
+                    self._add_entrance(run)
+                    run = []
+
+    def _add_entrance(self, pairs):
+        e = len(self.entrances)
+        self.entrances.append(Entrance(pairs))
+        for a, b in pairs:
+            self.by_cell.setdefault(a, []).append(e)
+            self.by_cell.setdefault(b, []).append(e)
+        self._place(e)
+
+    def _place(self, e):
+        """Put entrance e's transition on the free pair nearest the middle of its run"""
+        entrance = self.entrances[e]
+        pairs, bots = entrance.pairs, self.bots
+        mid = (len(pairs) - 1) / 2
+        best = None
+        for i, (a, b) in enumerate(pairs):
+            if a not in bots and b not in bots and (best is None or abs(i - mid) < abs(best - mid)):
+                best = i
+        if best == entrance.current:
+            return
+        if entrance.current is not None:
+            self._link(*pairs[entrance.current], -1)
+        entrance.current = best
+        if best is not None:
+            self._link(*pairs[best], 1)
+
+    def _link(self, a, b, delta):
+        for node, other in ((a, b), (b, a)):
+            cluster = self.cluster_of(node)
+            nodes = self.nodes.setdefault(cluster, {})
+            count = nodes.get(node, 0) + delta
+            if count:
+                nodes[node] = count
+            else:
+                del nodes[node]
+            partners = self.links.setdefault(node, set())
+            if delta > 0:
+                partners.add(other)
+            else:
+                partners.discard(other)
+            self.intra.pop(cluster, None)
+
+    # --- dynamic obstacles ---
+    def move_obstacle(self, old, new):
+        self.bots.discard(old)
+        self.bots.add(new)
+        for e in set(self.by_cell.get(old, ())) | set(self.by_cell.get(new, ())):
+            self._place(e)
+
+    # --- searching ---
+    def _cluster_bfs(self, start):
+        """BFS distances from start to every cell of its cluster, around the walls"""
+        c = self.cluster
+        x0, y0 = (start[0] // c) * c, (start[1] // c) * c
+        s = c + 2  # the cluster's cells with a blocked border, like DistanceField
+        grid = self._local(x0 // c, y0 // c)
+        first = (start[1] - y0 + 1) * s + start[0] - x0 + 1
+        dist = {first: 0}
+        queue = deque([first])
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for j in (i + s, i - s, i + 1, i - 1):
+                if j not in dist and grid[j]:
+                    dist[j] = d
+                    queue.append(j)
+        return {(x0 + i % s - 1, y0 + i // s - 1): d for i, d in dist.items()}
+
+    def _local(self, cx, cy):
+        """Open cells of a cluster as a padded bytearray (1 = open), cached"""
+        grid = self.local.get((cx, cy))
+        if grid is None:
+            c, w = self.cluster, self.width
+            s = c + 2
+            grid = bytearray(s * s)
+            x0, y0 = cx * c, cy * c
+            x1 = min(x0 + c, w)
+            for y in range(y0, min(y0 + c, self.height)):
+                row = (y - y0 + 1) * s + 1
+                grid[row:row + x1 - x0] = bytes(1 - wall for wall in self.walls[y * w + x0:y * w + x1])
+            self.local[(cx, cy)] = grid
+        return grid
+
+    def _intra(self, cluster):
+        edges = self.intra.get(cluster)
+        if edges is None:
+            edges = self.intra[cluster] = {}
+            nodes = self.nodes.get(cluster, {})
+            for node in nodes:
+                dist = self._cluster_bfs(node)
+                edges[node] = [(other, dist[other]) for other in nodes if other != node and other in dist]
+        return edges
+
+    def _edges(self, cell):
+        cluster = self.cluster_of(cell)
+        if cell in self.nodes.get(cluster, ()):
+            yield from self._intra(cluster)[cell]
+            for other in self.links.get(cell, ()):
+                yield other, 1
+            return
+        # not a transition (the start): reach its cluster's transitions, or step
+        # straight over a border it stands on
+        dist = self._cluster_bfs(cell)
+        for node in self.nodes.get(cluster, ()):
+            if node in dist:
+                yield node, dist[node]
+        for e in self.by_cell.get(cell, ()):
+            for a, b in self.entrances[e].pairs:
+                other = b if a == cell else a if b == cell else None
+                if other is not None and other not in self.bots:
+                    yield other, 1
+
+    def abstract_path(self, start, goal):
+        """Waypoints from start to goal over the cluster graph, ending with goal; [] if none
+
+        Past search.deadline the waypoints end at the transition nearest the
+        goal it reached instead.
+        """
+        if start == goal:
+            return []
+        to_goal = self._cluster_bfs(goal)
+        goal_cluster = self.cluster_of(goal)
+        gx, gy = goal
+        parent = {start: None}
+        depth = {start: 0}
+        closed = set()
+        heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+        pushed = 0
+        found = False
+        best = (abs(start[0] - gx) + abs(start[1] - gy), start)
+        timed = deadline.at is not None
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            if cell == goal:
+                found = True
+                break
+            if cell in closed:
+                continue
+            closed.add(cell)
+            best = min(best, (abs(cell[0] - gx) + abs(cell[1] - gy), cell))
+            if timed and len(closed) % CHECK_EVERY == 0 and deadline.passed():
+                goal, found = best[1], True
+                break
+            edges = list(self._edges(cell))
+            if self.cluster_of(cell) == goal_cluster and cell in to_goal:
+                edges.append((goal, to_goal[cell]))
+            for other, cost in edges:
+                d = g + cost
+                if other not in closed and d < depth.get(other, d + 1):
+                    depth[other] = d
+                    parent[other] = cell
+                    heapq.heappush(heap, (d + abs(other[0] - gx) + abs(other[1] - gy), d, other))
+                    pushed += 1
+        counters.expanded += len(closed)
+        counters.pushed += pushed
+        if not found:
+            return []
+        waypoints = []
+        while goal != start:
+            waypoints.append(goal)
+            goal = parent[goal]
+        return waypoints[::-1]
+
+    def still_open(self, waypoints):
+        """True if every transition on a path from abstract_path is still in place"""
+        for a, b in zip(waypoints, waypoints[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                if b not in self.links.get(a, ()):
+                    return False
+            elif b != waypoints[-1] and b not in self.nodes.get(self.cluster_of(b), ()):
+                return False
+        return True
+
+    def refine(self, start, waypoint, occupied):
+        """Low-level A* from start to the next waypoint inside the box of their two
+        clusters, around the cells in occupied; returns (goal or None, parent, first)"""
+        c = self.cluster
+        (sx, sy), (wx, wy) = self.cluster_of(start), self.cluster_of(waypoint)
+        x0, y0 = min(sx, wx) * c, min(sy, wy) * c
+        x1, y1 = min((max(sx, wx) + 1) * c, self.width), min((max(sy, wy) + 1) * c, self.height)
+
+        def can_enter(pos):
+            return (x0 <= pos[0] < x1 and y0 <= pos[1] < y1 and
+                    (pos not in occupied or pos == waypoint))
+
+        return heap_search(start, {waypoint}, can_enter,
+                           lambda g, pos: (g + abs(pos[0] - wx) + abs(pos[1] - wy),), (0,))
+
+    def path(self, start, goal, occupied):
+        """Every move from start to goal, refining each leg in turn; [] if some leg fails
+
+        A leg cut short by search.deadline ends the path there.
+        """
+        moves = []
+        pos = start
+        for waypoint in self.abstract_path(start, goal):
+            found, parent, _ = self.refine(pos, waypoint, occupied)
+            if found is None:
+                return []
+            moves += reconstruct_path(parent, found)
+            if found != waypoint:
+                break
+            pos = waypoint
+        counters.path_length = len(moves)
+        return moves
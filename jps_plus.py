@@ -0,0 +1,249 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from search import counters, deadline, CHECK_EVERY
+
+# ----------------- JPS+ for 4-connected grids -----------------
+# Horizontal moves act as JPS "straight" moves and vertical moves as its
+# "diagonal" ones:
+#   * moving horizontally, a cell is a jump point when a vertical neighbour is
+#     free but the same neighbour of the previous cell was blocked (forced);
+#   * moving vertically, a cell is a jump point when a horizontal jump from it
+#     reaches a jump point (or the goal).
+# JumpTable precomputes, for every cell and horizontal direction, the distance
+# to the next jump point (> 0) or minus the number of free steps before a wall
+# (<= 0), the same encoding JPS+ uses. Vertical values come from a sorted list
+# per column of the rows that stop a vertical move (walls and jump points),
+# since one bot changing rows moves those stops for every column it spans.
+# Bots are obstacles; a bot moving re-walks, in the rows around it, only the
+# run of cells up to the next wall or jump point, and fixes the column lists
+# where a cell's stop changed.
+
+def _sign(v):
+    return (v > 0) - (v < 0)
+
+class JumpTable:
+    def __init__(self, width, height, obstacles=()):
+        self.width = width
+        self.height = height
+        size = width * height
+        # Blocked cells with a one-cell blocked border: cell (x, y) is at
+        # (y + 1) * stride + x + 1, so neighbour checks need no bounds tests
+        self.stride = width + 2
+        self.blocked = bytearray(b'\x01') * (self.stride * (height + 2))
+        for y in range(height):
+            row = (y + 1) * self.stride + 1
+            self.blocked[row:row + width] = bytes(width)
+        for x, y in obstacles:
+            self.blocked[(y + 1) * self.stride + x + 1] = 1
+        self.east = [0] * size
+        self.west = [0] * size
+        for y in range(height):
+            self._scan_row(y)
+        self.stops = [[] for _ in range(width)]  # per column, the rows a vertical move stops at
+        for y in range(height):
+            for x in range(width):
+                if self._stops_at(x, y):
+                    self.stops[x].append(y)
+
+    def is_blocked(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.blocked[(y + 1) * self.stride + x + 1] != 0
+        return True
+
+    def forced(self, x, y, dx):
+        """Forced vertical moves at (x, y) when arriving horizontally with step dx"""
+        moves = []
+        for dy in (1, -1):
+            if not self.is_blocked(x, y + dy) and self.is_blocked(x - dx, y + dy):
+                moves.append((0, dy))
+        return moves
+
+    def _scan_row(self, y):
+        w, s = self.width, self.stride
+        row = y * w
+        blocked = self.blocked
+        here = (y + 1) * s + 1  # padded index of (0, y)
+        for table, dx, xs in ((self.east, 1, range(w - 1, -1, -1)), (self.west, -1, range(w))):
+            nxt = 0
+            for x in xs:
+                j = here + x + dx  # the cell we step onto
+                if blocked[j]:
+                    nxt = 0
+                elif ((not blocked[j + s] and blocked[j + s - dx]) or
+                      (not blocked[j - s] and blocked[j - s - dx])):
+                    nxt = 1  # forced vertical neighbour
+                else:
+                    nxt = nxt + 1 if nxt > 0 else nxt - 1
+                table[row + x] = nxt
+
+    def _stops_at(self, x, y):
+        """Whether a vertical move stops at (x, y): a wall, or a cell a horizontal jump starts from"""
+        i = y * self.width + x
+        return self.blocked[(y + 1) * self.stride + x + 1] or self.east[i] > 0 or self.west[i] > 0
+
+    def vertical(self, x, y, dy):
+        """Table value from (x, y) moving down (dy = 1) or up (dy = -1), encoded like east/west"""
+        column = self.stops[x]
+        if dy > 0:
+            k = bisect_right(column, y)
+            stop = column[k] if k < len(column) else self.height
+        else:
+            k = bisect_left(column, y)
+            stop = column[k - 1] if k else -1
+        d = (stop - y) * dy
+        return 1 - d if self.is_blocked(x, stop) else d
+
+    # --- dynamic obstacles ---
+    def set_blocked(self, pos, value):
+        x, y = pos
+        i = (y + 1) * self.stride + x + 1
+        if self.blocked[i] == value:
+            return
+        self.blocked[i] = value
+        changed = [(x, y)]
+        for r in range(max(0, y - 1), min(self.height, y + 2)):
+            changed.extend((c, r) for c in self._rewalk_row(r, x))
+        for c, r in changed:
+            self._update_stop(c, r)
+
+    def _rewalk_row(self, y, x0):
+        """Recompute row y's values where (x0, y +- 1) or (x0, y) changing reaches; returns the x whose values changed
+
+        Moving east the cells at x0 and x0 - 1 look at the changed cell, and
+        each cell further west only at its east neighbour's value, so the walk
+        stops at the first unchanged value past them; west mirrors it.
+        """
+        w, s = self.width, self.stride
+        row = y * w
+        blocked = self.blocked
+        here = (y + 1) * s + 1
+        changed = []
+        for table, dx in ((self.east, 1), (self.west, -1)):
+            x = x0
+            while 0 <= x < w:
+                j = here + x + dx
+                if blocked[j]:
+                    nxt = 0
+                elif ((not blocked[j + s] and blocked[j + s - dx]) or
+                      (not blocked[j - s] and blocked[j - s - dx])):
+                    nxt = 1
+                else:
+                    nxt = table[row + x + dx]
+                    nxt = nxt + 1 if nxt > 0 else nxt - 1
+                if table[row + x] == nxt:
+                    if x != x0:
+                        break
+                else:
+                    table[row + x] = nxt
+                    changed.append(x)
+                x -= dx
+        return changed
+
+    def _update_stop(self, x, y):
+        column = self.stops[x]
+        k = bisect_left(column, y)
+        present = k < len(column) and column[k] == y
+        if bool(self._stops_at(x, y)) != present:
+            if present:
+                del column[k]
+            else:
+                column.insert(k, y)
+
+    def move_obstacle(self, old, new):
+        if old != new:
+            self.set_blocked(new, 1)
+            self.set_blocked(old, 0)
+
+    # --- jumps with a goal ---
+    def jump(self, x, y, dx, dy, goal):
+        """Next jump point from (x, y) in direction (dx, dy), or None"""
+        gx, gy = goal
+        i = y * self.width + x
+        if dy == 0:
+            d = (self.east if dx > 0 else self.west)[i]
+            if gy == y and 0 < (gx - x) * dx <= abs(d):
+                return goal
+            return (x + dx * d, y) if d > 0 else None
+
+        d = self.vertical(x, y, dy)
+        k = (gy - y) * dy  # steps to the goal's row
+        if 0 < k <= abs(d) and (d <= 0 or k < d) and self._row_reaches(x, gy, gx):
+            return (x, gy)
+        return (x, y + dy * d) if d > 0 else None
+
+    def _row_reaches(self, x, y, gx):
+        if gx == x:
+            return True
+        i = y * self.width + x
+        d = self.east[i] if gx > x else self.west[i]
+        return abs(gx - x) <= abs(d)
+
+# ----------------- Search -----------------
+def successors(table, node, parent):
+    """Pruned directions at node given the jump point it was reached from"""
+    if parent is None:
+        return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    dx = _sign(node[0] - parent[0])
+    dy = _sign(node[1] - parent[1])
+    if dy == 0:
+        return [(dx, 0)] + table.forced(node[0], node[1], dx)
+    return [(0, dy), (1, 0), (-1, 0)]
+
+def jps_plus_search(table, start, goal):
+    """A* over jump points; returns the list of jump points from start to goal, or []
+
+    Past search.deadline it returns the jump points to the one it was about
+    to expand instead. Like a goal in bfs_path, the goal is enterable even
+    with a bot on it: the table treats it as free while the search runs.
+    """
+    if not table.is_blocked(*goal):
+        return _search(table, start, goal)
+    table.set_blocked(goal, 0)
+    try:
+        return _search(table, start, goal)
+    finally:
+        table.set_blocked(goal, 1)
+
+def _search(table, start, goal):
+    def h(p):
+        return abs(p[0] - goal[0]) + abs(p[1] - goal[1])
+
+    parent = {start: None}
+    g_score = {start: 0}
+    closed = set()
+    heap = [(h(start), start)]
+    timed = deadline.at is not None
+    while heap:
+        _, current = heapq.heappop(heap)
+        if current == goal or (current not in closed and timed and
+                               len(closed) % CHECK_EVERY == 0 and deadline.passed()):
+            counters.expanded += len(closed)
+            counters.pushed += len(parent) - 1
+            counters.path_length = g_score[current]
+            path = [current]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            return path[::-1]
+        if current in closed:
+            continue
+        closed.add(current)
+
+        for dx, dy in successors(table, current, parent[current]):
+            nxt = table.jump(current[0], current[1], dx, dy, goal)
+            if nxt is None or nxt in closed:
+                continue
+            g = g_score[current] + abs(nxt[0] - current[0]) + abs(nxt[1] - current[1])
+            if g < g_score.get(nxt, float('inf')):
+                g_score[nxt] = g
+                parent[nxt] = current
+                heapq.heappush(heap, (g + h(nxt), nxt))
+    counters.expanded += len(closed)
+    counters.pushed += len(parent) - 1
+    return []
+
+def first_move(path):
+    """Unit 4-connected move from the first two jump points of a path"""
+    if len(path) < 2:
+        return 0, 0
+    (x0, y0), (x1, y1) = path[0], path[1]
+    return _sign(x1 - x0), _sign(y1 - y0)
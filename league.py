@@ -0,0 +1,151 @@
+import argparse
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from simulation import MAX_TURNS, STRATEGIES, find_strategy
+from tournament import run_shard
+
+SEATS = 4
+DEFAULT_CACHE = "league_cache.json"
+CACHE_VERSION = 1  # bump when code every strategy shares (simulation, search, world, ...) changes results
+
+# ----------------- Scheduling -----------------
+def schedule(names, permutations=True):
+    """Every 4-combination of names, and optionally every seat order of each"""
+    pairings = []
+    for combo in itertools.combinations(names, SEATS):
+        if permutations:
+            pairings.extend(itertools.permutations(combo))
+        else:
+            pairings.append(combo)
+    return pairings
+
+_versions = {}
+
+def strategy_version(name):
+    """Short hash of a strategy function's source: editing it invalidates its pairings"""
+    version = _versions.get(name)
+    if version is None:
+        try:
+            source = inspect.getsource(find_strategy(name))
+        except (OSError, TypeError):  # no source to read, e.g. a built-in
+            source = name
+        version = _versions[name] = hashlib.sha1(source.encode()).hexdigest()[:8]
+    return version
+
+def pairing_key(pairing, rounds, seed, max_turns):
+    """Cache key: the seat order plus everything that changes the outcome"""
+    return (f"v{CACHE_VERSION}|{seed}|{rounds}|{max_turns}|" +
+            ",".join(f"{name}@{strategy_version(name)}" for name in pairing))
+
+# ----------------- Disk cache -----------------
+def load_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_cache(path, cache):
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+# ----------------- League -----------------
+def run_league(names=None, rounds=100, seed=0, workers=None, cache_path=DEFAULT_CACHE,
+               permutations=True, max_turns=MAX_TURNS, progress=None):
+    """Play every scheduled pairing not already in the cache.
+
+    Every pairing uses the same round seeds, so all seat orders see the same
+    point layouts. Returns {pairing tuple: performance table}.
+    """
+    names = names or [name for name, _ in STRATEGIES]
+    pairings = schedule(names, permutations)
+    cache = load_cache(cache_path)
+    todo = [p for p in pairings if pairing_key(p, rounds, seed, max_turns) not in cache]
+
+    if todo:
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_shard, list(p), seed, 0, rounds, max_turns): p for p in todo}
+            for future in as_completed(futures):
+                pairing = futures[future]
+                cache[pairing_key(pairing, rounds, seed, max_turns)] = future.result()
+                done += 1
+                if progress:
+                    progress(done, len(todo))
+                if done % 200 == 0:
+                    save_cache(cache_path, cache)
+        save_cache(cache_path, cache)
+
+    return {p: cache[pairing_key(p, rounds, seed, max_turns)] for p in pairings}
+
+def win_rate_matrix(results, rounds):
+    """matrix[a][b]: share of rounds a won in pairings that also contained b"""
+    wins = {}
+    played = {}
+    for pairing, performance in results.items():
+        for a in pairing:
+            for b in pairing:
+                if a == b:
+                    continue
+                wins[(a, b)] = wins.get((a, b), 0) + performance[a]['wins']
+                played[(a, b)] = played.get((a, b), 0) + rounds
+    names = sorted({name for pairing in results for name in pairing})
+    return {a: {b: wins[(a, b)] / played[(a, b)] for b in names if (a, b) in played} for a in names}
+
+def rankings(results, rounds):
+    """[(name, win rate, avg score)] sorted best first"""
+    totals = {}
+    for pairing, performance in results.items():
+        for name in pairing:
+            stats = totals.setdefault(name, {'wins': 0, 'total_score': 0, 'rounds': 0})
+            stats['wins'] += performance[name]['wins']
+            stats['total_score'] += performance[name]['total_score']
+            stats['rounds'] += rounds
+    table = [(name, s['wins'] / s['rounds'], s['total_score'] / s['rounds']) for name, s in totals.items()]
+    return sorted(table, key=lambda row: (-row[1], -row[2]))
+
+def format_league(results, rounds):
+    lines = [f"{'#':>3}  {'Strategy':<20}{'Win rate':>10}{'Avg Score':>12}"]
+    for i, (name, rate, avg) in enumerate(rankings(results, rounds), 1):
+        lines.append(f"{i:>3}  {name:<20}{100 * rate:>9.1f}%{avg:>12.2f}")
+
+    matrix = win_rate_matrix(results, rounds)
+    names = list(matrix)
+    short = [name[:6] for name in names]
+    lines.append("")
+    lines.append(f"{'vs':<20}" + "".join(f"{s:>8}" for s in short))
+    for a in names:
+        cells = "".join(f"{100 * matrix[a][b]:>7.1f}%" if b in matrix[a] else f"{'-':>8}" for b in names)
+        lines.append(f"{a:<20}" + cells)
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin league over every STRATEGIES combination")
+    parser.add_argument("-r", "--rounds", type=int, default=100, help="rounds per pairing")
+    parser.add_argument("-s", "--strategies", nargs="+", default=None, metavar="NAME")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--cache", default=DEFAULT_CACHE)
+    parser.add_argument("--fixed-seats", action="store_true", help="skip seat permutations")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r{done}/{total} pairings", end="", flush=True)
+
+    start = time.perf_counter()
+    results = run_league(args.strategies, args.rounds, args.seed, args.workers, args.cache,
+                         not args.fixed_seats, args.max_turns, progress)
+    print(f"\r{len(results)} pairings in {time.perf_counter() - start:.1f}s\n")
+    print(format_league(results, args.rounds))
+
+if __name__ == "__main__":
+    main()
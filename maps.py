@@ -0,0 +1,325 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict, deque
+
+# ----------------- Obstacle maps -----------------
+# Text grids, one character per cell. MovingAI benchmark maps start with a
+# header and list their rows after a `map` line:
+#
+#     type octile
+#     height 48
+#     width 64
+#     map
+#     @@@@....
+#
+# '.', 'G' and 'S' are passable; every other character ('@', 'O', 'T', 'W',
+# '#', ...) is a wall. A file without the header is read as a plain grid, one
+# row per line, with short rows padded by walls.
+#
+# Loading a map precomputes its connected components, so whether one cell can
+# reach another is a label comparison, and for maps of up to ALL_PAIRS_LIMIT
+# open cells the shortest distance between every pair of cells. Both are
+# cached on disk in CACHE_DIR under a hash of the map's cells.
+
+PASSABLE = frozenset('.GS')
+CACHE_DIR = "map_cache"
+ALL_PAIRS_LIMIT = 4096  # open cells; bigger maps find distances by BFS on demand
+ROW_CACHE = 64          # on-demand BFS rows kept per map
+UNREACHABLE = 0xFFFF
+CACHE_MAGIC = b'AIRC'
+CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct('<4sBIIIB')  # magic, version, width, height, open cells, has table
+
+class GridMap:
+    """Static walls of a width x height grid, row-major (1 = wall)"""
+    def __init__(self, width, height, walls, name=None):
+        if len(walls) != width * height:
+            raise ValueError(f"{width}x{height} map needs {width * height} cells, got {len(walls)}")
+        self.width = width
+        self.height = height
+        self.walls = bytearray(walls)
+        self.name = name
+        self._connectivity = None
+        self._wall_positions = None
+
+    def is_wall(self, x, y):
+        return self.walls[y * self.width + x] != 0
+
+    def wall_positions(self):
+        if self._wall_positions is None:
+            w = self.width
+            self._wall_positions = [(i % w, i // w) for i, wall in enumerate(self.walls) if wall]
+        return self._wall_positions
+
+    def key(self):
+        """Hash of the map's size and cells, naming its cache file"""
+        digest = hashlib.sha1(struct.pack('<II', self.width, self.height))
+        digest.update(self.walls)
+        return digest.hexdigest()
+
+    @property
+    def connectivity(self):
+        if self._connectivity is None:
+            self._connectivity = Connectivity(self.width, self.height, self.walls)
+        return self._connectivity
+
+    def precompute(self, cache_dir=CACHE_DIR):
+        """Components and distances, read from or written to the disk cache"""
+        if self._connectivity is not None:
+            return self._connectivity
+        path = None if cache_dir is None else os.path.join(cache_dir, self.key() + ".conn")
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    self._connectivity = Connectivity.from_bytes(self.width, self.height, self.walls, f.read())
+            except ValueError:
+                self._connectivity = None  # stale or damaged: rebuild it
+        if self._connectivity is None:
+            self._connectivity = Connectivity(self.width, self.height, self.walls)
+            self._connectivity.all_pairs()
+            if path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}"
+                with open(tmp, 'wb') as f:
+                    f.write(self._connectivity.to_bytes())
+                os.replace(tmp, path)  # workers loading the same map may race
+        return self._connectivity
+
+    def nearest_open(self, pos):
+        """The open cell in the largest component nearest to pos (Manhattan), or None"""
+        conn = self.connectivity
+        x0, y0 = pos
+        for r in range(self.width + self.height):
+            for dx in range(-r, r + 1):
+                dy = r - abs(dx)
+                for y in {y0 - dy, y0 + dy}:
+                    x = x0 + dx
+                    if 0 <= x < self.width and 0 <= y < self.height and conn.in_main(x, y):
+                        return x, y
+        return None
+
+    def to_text(self):
+        """MovingAI .map text for this map"""
+        w = self.width
+        rows = ["".join('@' if wall else '.' for wall in self.walls[y * w:(y + 1) * w])
+                for y in range(self.height)]
+        return "\n".join(["type octile", f"height {self.height}", f"width {w}", "map"] + rows) + "\n"
+
+def parse_map(text, name=None):
+    """GridMap from MovingAI .map text or a plain text grid"""
+    lines = text.splitlines()
+    if lines and lines[0].startswith('type'):
+        header = {}
+        i = 0
+        while i < len(lines) and lines[i].strip() != 'map':
+            key, _, value = lines[i].strip().partition(' ')
+            header[key] = value.strip()
+            i += 1
+        try:
+            width, height = int(header['width']), int(header['height'])
+        except (KeyError, ValueError):
+            raise ValueError(f"{name or 'map'}: header needs width and height") from None
+        rows = lines[i + 1:i + 1 + height]
+        if len(rows) < height:
+            raise ValueError(f"{name or 'map'}: expected {height} rows, got {len(rows)}")
+    else:
+        rows = [line.rstrip() for line in lines if line.strip()]
+        height = len(rows)
+        width = max((len(row) for row in rows), default=0)
+    if not width or not height:
+        raise ValueError(f"{name or 'map'} is empty")
+    walls = bytearray(b'\x01') * (width * height)
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row[:width]):
+            if ch in PASSABLE:
+                walls[y * width + x] = 0
+    return GridMap(width, height, walls, name)
+
+def load_map(path, cache_dir=CACHE_DIR):
+    """Read a map file and precompute (or load the cached) connectivity"""
+    with open(path) as f:
+        grid_map = parse_map(f.read(), os.path.basename(path))
+    grid_map.precompute(cache_dir)
+    return grid_map
+
+def save_map(grid_map, path):
+    with open(path, 'w') as f:
+        f.write(grid_map.to_text())
+
+def warehouse(width, height, shelf=8, margin=2):
+    """Warehouse floor: two-deep shelf rows of length shelf, with aisles between them
+    and cross aisles every shelf + 2 columns, inside an open margin"""
+    walls = bytearray(width * height)
+    for y in range(margin, height - margin):
+        if (y - margin) % 3 == 2:
+            continue  # aisle
+        for x in range(margin, width - margin):
+            if (x - margin) % (shelf + 2) < shelf:
+                walls[y * width + x] = 1
+    return GridMap(width, height, walls, "warehouse")
+
+# ----------------- Connectivity -----------------
+class Connectivity:
+    """Connected components and shortest distances of a map without bots.
+
+    reachable() is O(1). distance() reads the all-pairs table when it has
+    been built, and otherwise runs (and remembers) one BFS per source cell.
+    """
+    def __init__(self, width, height, walls, labels=None, table=None):
+        self.width = width
+        self.height = height
+        self.stride = s = width + 2
+        self.cells = array('i', (i for i, wall in enumerate(walls) if not wall))  # open index -> cell
+        self.index = array('i', [-1]) * (width * height)                         # cell -> open index
+        # open index by padded cell (y + 1) * stride + x + 1, -1 for walls and the
+        # border, so the neighbours of p are p +- stride and p +- 1 without bounds tests
+        self.padded = array('i', [-1]) * (s * (height + 2))
+        for k, i in enumerate(self.cells):
+            self.index[i] = k
+            self.padded[(i // width + 1) * s + i % width + 1] = k
+        self.labels = self._label() if labels is None else labels
+        self.sizes = {}
+        for label in self.labels:
+            if label >= 0:
+                self.sizes[label] = self.sizes.get(label, 0) + 1
+        self.main = max(self.sizes, key=self.sizes.get, default=-1)
+        self.table = table  # array('H'), open x open, or None
+        self.rows = OrderedDict()
+
+    @property
+    def components(self):
+        return len(self.sizes)
+
+    def _label(self):
+        """Flood-fill component labels per cell (-1 for walls)"""
+        w, s, padded, cells = self.width, self.stride, self.padded, self.cells
+        labels = array('i', [-1]) * (w * self.height)
+        label = 0
+        for start in cells:
+            if labels[start] >= 0:
+                continue
+            labels[start] = label
+            queue = deque([(start // w + 1) * s + start % w + 1])
+            while queue:
+                p = queue.popleft()
+                for q in (p + s, p - s, p + 1, p - 1):
+                    k = padded[q]
+                    if k >= 0 and labels[cells[k]] < 0:
+                        labels[cells[k]] = label
+                        queue.append(q)
+            label += 1
+        return labels
+
+    def component(self, pos):
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.labels[y * self.width + x]
+        return -1
+
+    def in_main(self, x, y):
+        return self.labels[y * self.width + x] == self.main
+
+    def reachable(self, a, b):
+        """True if a path between a and b exists around the walls"""
+        label = self.component(a)
+        return label >= 0 and label == self.component(b)
+
+    def distance(self, a, b):
+        """Shortest path length from a to b around the walls, or None if unreachable"""
+        if not self.reachable(a, b):
+            return None
+        i = self.index[a[1] * self.width + a[0]]
+        j = self.index[b[1] * self.width + b[0]]
+        if self.table is not None:
+            return self.table[i * len(self.cells) + j]
+        return self._row(i)[j]
+
+    def estimate(self, a, b):
+        """Lower bound on steps from a to b: the exact distance when the table is
+        built, else Manhattan. None if b cannot be reached at all."""
+        if not self.reachable(a, b):
+            return None
+        if self.table is not None:
+            return self.table[self.index[a[1] * self.width + a[0]] * len(self.cells) +
+                              self.index[b[1] * self.width + b[0]]]
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def step_toward(self, pos, target):
+        """Move from pos that shortens the way to target around the walls, (0, 0) if none does"""
+        here = self.distance(target, pos)  # one BFS row per target, shared by every bot after it
+        if not here:
+            return 0, 0
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):  # greedy_strategy's order
+            d = self.distance(target, (pos[0] + dx, pos[1] + dy))
+            if d is not None and d < here:
+                return dx, dy
+        return 0, 0
+
+    def _bfs(self, k):
+        """Distances from open cell k to every open cell (UNREACHABLE elsewhere)"""
+        w, s, padded = self.width, self.stride, self.padded
+        row = array('H', [UNREACHABLE]) * len(self.cells)
+        row[k] = 0
+        start = self.cells[k]
+        queue = deque([(start // w + 1) * s + start % w + 1])
+        while queue:
+            p = queue.popleft()
+            d = row[padded[p]] + 1
+            for q in (p + s, p - s, p + 1, p - 1):
+                j = padded[q]
+                if j >= 0 and row[j] == UNREACHABLE:
+                    row[j] = d
+                    queue.append(q)
+        return row
+
+    def _row(self, k):
+        row = self.rows.get(k)
+        if row is None:
+            row = self.rows[k] = self._bfs(k)
+            if len(self.rows) > ROW_CACHE:
+                self.rows.popitem(last=False)
+        else:
+            self.rows.move_to_end(k)
+        return row
+
+    def all_pairs(self):
+        """Build the distance table if the map is small enough; True if it exists"""
+        n = len(self.cells)
+        if self.table is None and 0 < n <= ALL_PAIRS_LIMIT:
+            table = array('H')
+            for k in range(n):
+                table += self._bfs(k)
+            self.table = table
+        return self.table is not None
+
+    # --- disk cache ---
+    def to_bytes(self):
+        labels, table = array('i', self.labels), array('H', self.table or ())
+        if sys.byteorder == 'big':
+            labels.byteswap()
+            table.byteswap()
+        return (_CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, self.width, self.height,
+                                   len(self.cells), self.table is not None)
+                + labels.tobytes() + table.tobytes())
+
+    @classmethod
+    def from_bytes(cls, width, height, walls, data):
+        if len(data) < _CACHE_HEADER.size:
+            raise ValueError("truncated connectivity cache")
+        magic, version, w, h, n, has_table = _CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION or (w, h) != (width, height):
+            raise ValueError("connectivity cache is for another map or version")
+        pos = _CACHE_HEADER.size
+        labels = array('i', data[pos:pos + 4 * w * h])
+        pos += 4 * w * h
+        table = array('H', data[pos:pos + 2 * n * n]) if has_table else None
+        if len(labels) != w * h or (table is not None and len(table) != n * n):
+            raise ValueError("truncated connectivity cache")
+        if sys.byteorder == 'big':
+            labels.byteswap()
+            if table is not None:
+                table.byteswap()
+        return cls(width, height, walls, labels, table)
@@ -0,0 +1,23 @@
+TURN_MS = 350                             # one turn on screen at x1
+SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16, 64)  # Up/Down to change
+SKIP_BUDGET = 0.012                       # seconds of headless turns per frame while skipping
+
+# ----------------- Owed-time clock -----------------
+# The GUI plays turns at its own pace while the window keeps drawing at FPS:
+# every frame adds the wall time since the last one, times the speed, to the
+# time owed, and each TURN_MS owed is one turn to play. Skipping ignores the
+# clock and plays as many turns as fit in SKIP_BUDGET.
+
+def turns_due(owed, elapsed, speed, paused=False, skip=False):
+    """(turns to play this frame, ms still owed) after elapsed ms of wall time
+
+    turns is None while skipping: play until SKIP_BUDGET runs out. Paused,
+    nothing is owed for the time that passed.
+    """
+    if skip:
+        return None, owed
+    if paused:
+        return 0, owed
+    owed += elapsed * speed
+    turns = int(owed // TURN_MS)
+    return turns, owed - turns * TURN_MS
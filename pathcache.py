@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+PATH_CACHE_SIZE = 4096  # paths kept; the least recently used one goes first
+
+# ----------------- Path cache -----------------
+# Searches made through algorithms.cached_path keep the paths they find,
+# keyed by the search, the grid size, the start, the goals and a signature of
+# the map's walls in the bounding box of them all, where a shortest route runs
+# unless it has to detour. Along with each path the cache keeps its remainder
+# from the cell its first move leads to, so a bot walking the path finds its
+# next turn's answer already there. Walls never move, so the key only changes with the
+# map; bots do, so a lookup walks the stored path against the current
+# occupancy (O(path length)) before returning it. A path a bot now blocks
+# counts as an invalidation and is searched again. A path that is still free
+# is kept even if a bot stepping aside has opened a shorter one.
+#
+# A query that found no path is kept too, since proving that exhausts the
+# reachable area. It is only reused while every blocked cell on the board is
+# the same, checked by a hash of the whole occupancy.
+
+class PathCache:
+    def __init__(self, capacity=PATH_CACHE_SIZE):
+        self.capacity = capacity
+        self.enabled = True
+        self.paths = OrderedDict()  # key -> (moves, None) or (None, board signature)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def signature(self, start, goals, grid=None):
+        """Hash of the walls in the bounding box of start and the goals (None without walls)"""
+        walls = getattr(grid, 'walls', None)
+        if walls is None:
+            return None
+        x0, x1 = min(start[0], *(g[0] for g in goals)), max(start[0], *(g[0] for g in goals))
+        y0, y1 = min(start[1], *(g[1] for g in goals)), max(start[1], *(g[1] for g in goals))
+        w = grid.width
+        return hash(b''.join(walls[y * w + x0:y * w + x1 + 1] for y in range(y0, y1 + 1)))
+
+    def board_signature(self, occupied, grid=None):
+        """Hash of every blocked cell"""
+        cells = getattr(grid, 'occupied', None)
+        return hash(bytes(cells)) if cells is not None else hash(frozenset(occupied))
+
+    def lookup(self, key, start, can_enter, board):
+        """The stored moves for key if every cell on them can still be entered ([] for
+        no path while board() is unchanged), else None"""
+        entry = self.paths.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        path, signature = entry
+        if path is None:
+            valid = signature == board()
+        else:
+            valid = True
+            x, y = start
+            for dx, dy in path:
+                x, y = x + dx, y + dy
+                if not can_enter((x, y)):
+                    valid = False
+                    break
+        if not valid:
+            del self.paths[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        self.paths.move_to_end(key)
+        self.hits += 1
+        return list(path or ())
+
+    def store(self, key, path, board=None):
+        """Keep moves for key; path None records that there was none on this board"""
+        self.paths[key] = (tuple(path), None) if path is not None else (None, board)
+        self.paths.move_to_end(key)
+        self._trim()
+
+    def store_rest(self, key, path):
+        """Keep path's remainder after its first move under key, unless key already has moves"""
+        if key not in self.paths:
+            self.paths[key] = (tuple(path[1:]), None)
+            self._trim()
+
+    def _trim(self):
+        if len(self.paths) > self.capacity:
+            self.paths.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.paths.clear()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self.paths), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"path cache: {s['hits']} hits, {s['misses']} misses ({100 * s['hit_rate']:.1f}% hit), "
+                f"{s['invalidations']} invalidated, {s['evictions']} evicted, {s['size']}/{self.capacity} kept")
+
+path_cache = PathCache()
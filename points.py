@@ -0,0 +1,110 @@
+import math
+
+# ----------------- Point set -----------------
+# The points left in a round. Strategies treat it like the list it replaces
+# (iteration, len, `in`, remove), and it iterates in the order the points
+# were given, so ties broken by "first in the list" still go the same way.
+# Membership and removal are O(1) dict operations.
+#
+# nearest() answers the min(points, key=manhattan_distance) every strategy
+# used to run. Points are kept in square buckets sized for about one point
+# per bucket, and a query scans rings of buckets outwards from its own,
+# stopping once a ring is further away than the best point found. The
+# buckets are resized whenever the count drops to a quarter of what they
+# were sized for, so a nearly empty board does not scan empty rings.
+
+LINEAR_LIMIT = 32  # below this many points a plain scan beats the buckets
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def ring(bx, by, r):
+    """Buckets at Chebyshev distance r from bucket (bx, by)"""
+    if r == 0:
+        yield bx, by
+        return
+    for x in range(bx - r, bx + r + 1):
+        yield x, by - r
+        yield x, by + r
+    for y in range(by - r + 1, by + r):
+        yield bx - r, y
+        yield bx + r, y
+
+class PointSet:
+    """Remaining points of a round, see above"""
+    def __init__(self, width, height, points=()):
+        self.width = width
+        self.height = height
+        self.rank = {}  # point -> insertion number; dict order is iteration order
+        self.added = 0
+        for p in points:
+            if p not in self.rank:
+                self.rank[p] = self.added
+                self.added += 1
+        self._rebucket()
+
+    def _rebucket(self):
+        n = len(self.rank)
+        b = self.bucket = max(1, int(math.sqrt(self.width * self.height / max(n, 1))))
+        self.sized_for = n
+        self.rings = max(self.width, self.height) // b + 2
+        self.buckets = {}
+        for x, y in self.rank:
+            self.buckets.setdefault((x // b, y // b), set()).add((x, y))
+
+    def __len__(self):
+        return len(self.rank)
+
+    def __iter__(self):
+        return iter(self.rank)
+
+    def __contains__(self, pos):
+        return pos in self.rank
+
+    def __repr__(self):
+        return f"PointSet({list(self.rank)})"
+
+    def add(self, pos):
+        if pos not in self.rank:
+            self.rank[pos] = self.added
+            self.added += 1
+            b = self.bucket
+            self.buckets.setdefault((pos[0] // b, pos[1] // b), set()).add(pos)
+
+    def remove(self, pos):
+        """Remove a point; ValueError if it is not there, like list.remove"""
+        if pos not in self.rank:
+            raise ValueError(f"{pos} is not a point")
+        del self.rank[pos]
+        b = self.bucket
+        key = (pos[0] // b, pos[1] // b)
+        cell = self.buckets[key]
+        cell.discard(pos)
+        if not cell:
+            del self.buckets[key]
+        if LINEAR_LIMIT < len(self.rank) < self.sized_for // 4:
+            self._rebucket()
+
+    def discard(self, pos):
+        if pos in self.rank:
+            self.remove(pos)
+
+    def nearest(self, pos):
+        """The point closest to pos by Manhattan distance, the earliest one on
+        ties (what min() over the list returned); None when empty"""
+        if len(self.rank) <= LINEAR_LIMIT:
+            return min(self.rank, key=lambda p: manhattan(pos, p), default=None)
+        x, y = pos
+        b, rank, buckets = self.bucket, self.rank, self.buckets
+        bx, by = x // b, y // b
+        best, best_d = None, math.inf
+        for r in range(self.rings):
+            # every cell in ring r is at least (r - 1) * bucket + 1 steps away
+            if r > 0 and (r - 1) * b + 1 > best_d:
+                break
+            for key in ring(bx, by, r):
+                for p in buckets.get(key, ()):
+                    d = abs(p[0] - x) + abs(p[1] - y)
+                    if d < best_d or (d == best_d and rank[p] < rank[best]):
+                        best, best_d = p, d
+        return best
@@ -0,0 +1,139 @@
+import csv
+import json
+from search import counters
+from watchdog import decide
+
+# ----------------- Histogram -----------------
+class Histogram:
+    """Power-of-two buckets: bucket k counts values v with 2**(k-1) <= v < 2**k (bucket 0 is v == 0)"""
+    def __init__(self):
+        self.buckets = []
+
+    def add(self, value):
+        k = int(value).bit_length()
+        if k >= len(self.buckets):
+            self.buckets.extend([0] * (k + 1 - len(self.buckets)))
+        self.buckets[k] += 1
+
+    def labels(self):
+        return ["0"] + [f"<{2 ** k}" for k in range(1, len(self.buckets))]
+
+    def to_dict(self):
+        return dict(zip(self.labels(), self.buckets))
+
+# ----------------- Per-bot totals -----------------
+class BotProfile:
+    def __init__(self):
+        self.decisions = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.expanded = 0
+        self.pushed = 0
+        self.path_total = 0
+        self.paths = 0
+        self.stalls = 0    # strategy returned (0, 0)
+        self.blocked = 0   # strategy asked for a move that was not taken
+        self.time_us = Histogram()
+        self.nodes = Histogram()
+
+    def add(self, elapsed, expanded, pushed, path_length, stalled, moved):
+        self.decisions += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.expanded += expanded
+        self.pushed += pushed
+        if path_length is not None:
+            self.path_total += path_length
+            self.paths += 1
+        if stalled:
+            self.stalls += 1
+        elif not moved:
+            self.blocked += 1
+        self.time_us.add(elapsed * 1e6)
+        self.nodes.add(expanded)
+
+    def summary(self):
+        n = max(1, self.decisions)
+        return {
+            'decisions': self.decisions,
+            'avg_ms': 1000 * self.total_time / n,
+            'max_ms': 1000 * self.max_time,
+            'nodes_per_turn': self.expanded / n,
+            'pushes_per_turn': self.pushed / n,
+            'avg_path_length': self.path_total / self.paths if self.paths else None,
+            'stalls': self.stalls,
+            'stall_rate': self.stalls / n,
+            'blocked': self.blocked,
+            'time_us_histogram': self.time_us.to_dict(),
+            'nodes_histogram': self.nodes.to_dict(),
+        }
+
+# ----------------- Profiler -----------------
+class Profiler:
+    """Opt-in instrumentation for strategy decisions.
+
+    Hand one to Match/Simulation as profiler=...; every bot turn then goes
+    through move(), which times the strategy call and reads the expansions,
+    heap pushes and path length the searches report to search.counters.
+    Without a profiler the engine never touches any of this.
+    """
+    FIELDS = ['round', 'turn', 'bot', 'time_us', 'expanded', 'pushed', 'path_length',
+              'dx', 'dy', 'stalled', 'moved']
+
+    def __init__(self, keep_rows=True):
+        self.keep_rows = keep_rows
+        self.rows = []
+        self.bots = {}  # bot name -> BotProfile
+        self.round = 0
+
+    def start_round(self):
+        self.round += 1
+
+    def move(self, bot, grid, points, bots, turn, budget=None):
+        """Bot.move with the strategy call measured, within budget seconds if given"""
+        before_expanded, before_pushed = counters.expanded, counters.pushed
+        counters.path_length = None
+        counters.enabled = True
+        try:
+            move, elapsed = decide(bot, grid, points, bots, budget)
+        finally:
+            counters.enabled = False
+        old = (bot.x, bot.y)
+        bot.apply(move, grid, bots)
+
+        expanded = counters.expanded - before_expanded
+        pushed = counters.pushed - before_pushed
+        stalled = tuple(move) == (0, 0)
+        moved = (bot.x, bot.y) != old
+        profile = self.bots.get(bot.name)
+        if profile is None:
+            profile = self.bots[bot.name] = BotProfile()
+        profile.add(elapsed, expanded, pushed, counters.path_length, stalled, moved)
+        if self.keep_rows:
+            self.rows.append((self.round, turn, bot.name, round(elapsed * 1e6, 1), expanded, pushed,
+                              counters.path_length, move[0], move[1], int(stalled), int(moved)))
+
+    # --- reports ---
+    def summary(self):
+        return {name: profile.summary() for name, profile in self.bots.items()}
+
+    def format_summary(self):
+        lines = [f"{'Bot':<20}{'Avg ms':>9}{'Max ms':>9}{'Nodes/turn':>12}{'Pushes/turn':>13}"
+                 f"{'Avg path':>10}{'Stalls':>8}{'Blocked':>9}"]
+        for name, s in self.summary().items():
+            path = f"{s['avg_path_length']:.1f}" if s['avg_path_length'] is not None else "-"
+            lines.append(f"{name:<20}{s['avg_ms']:>9.3f}{s['max_ms']:>9.3f}{s['nodes_per_turn']:>12.1f}"
+                         f"{s['pushes_per_turn']:>13.1f}{path:>10}{s['stalls']:>8}{s['blocked']:>9}")
+        return "\n".join(lines)
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            writer.writerows(self.rows)
+
+    def to_json(self, path):
+        data = {'summary': self.summary(),
+                'rows': [dict(zip(self.FIELDS, row)) for row in self.rows]}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
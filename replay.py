@@ -0,0 +1,241 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from search import DIRECTIONS
+
+# ----------------- Replay log format -----------------
+# Header:  b'AIRP', u8 version, u32 width, u32 height, u32 bot count,
+#          then each bot name as u8 length + UTF-8.
+# Round:   u8 flags (bit 0: seed follows), [u64 seed], u32 turns, u32 points,
+#          spawns and points as cell indices (y * width + x, 1/2/4 bytes each
+#          depending on the grid size), then the moves: one code per bot per
+#          turn (0 = stayed, 1-4 = DIRECTIONS[code - 1]) packed three to a byte
+#          in base 5.
+# Footer:  u64 offset of every round, then u64 index offset, u32 round count,
+#          b'AIRI'. A log whose writer never closed has no footer; the reader
+#          then finds the rounds by walking the records.
+# All integers are little-endian. Version 1 logs (u8 bot count, u16 turns)
+# can still be read.
+
+MAGIC = b'AIRP'
+INDEX_MAGIC = b'AIRI'
+VERSION = 2
+CODES = [(0, 0)] + DIRECTIONS
+_CODE = {move: code for code, move in enumerate(CODES)}
+_HEADERS = {1: struct.Struct('<4sBIIB'), 2: struct.Struct('<4sBIII')}
+_ROUNDS = {1: struct.Struct('<BHI'), 2: struct.Struct('<BII')}
+_HEADER = _HEADERS[VERSION]
+_ROUND = _ROUNDS[VERSION]
+_PREFIX = struct.Struct('<4sB')  # magic and version, the same in every version
+_SEED = struct.Struct('<Q')
+_FOOTER = struct.Struct('<QI4s')
+
+def _cell_format(width, height):
+    cells = width * height
+    return 'B' if cells <= 1 << 8 else 'H' if cells <= 1 << 16 else 'I'
+
+def pack_moves(moves):
+    """Base-5 pack a flat list of move codes, three per byte"""
+    out = bytearray((len(moves) + 2) // 3)
+    for i in range(0, len(moves), 3):
+        a, b, c = (list(moves[i:i + 3]) + [0, 0])[:3]
+        out[i // 3] = a + 5 * b + 25 * c
+    return out
+
+def unpack_moves(data, count):
+    codes = []
+    for byte in data:
+        codes += (byte % 5, byte // 5 % 5, byte // 25)
+    return codes[:count]
+
+# ----------------- Writing -----------------
+def numbered_path(path, n):
+    """Where the nth of several logs recorded to path goes: path, then name-2.ext, name-3.ext, ..."""
+    if n <= 1:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{n}{ext}"
+
+class ReplayWriter:
+    """Appends rounds to a replay log; Match feeds it through its log argument
+
+    Sizes the format cannot hold raise ValueError, checked before the file is
+    opened for the header and when a round starts for its seed.
+    """
+    def __init__(self, path, width, height, names):
+        for label, value in (("width", width), ("height", height), ("bot count", len(names))):
+            if not 0 <= value < 1 << 32:
+                raise ValueError(f"Replay {label} must fit in 32 bits, got {value}")
+        self.file = open(path, 'wb')
+        self.width = width
+        self.height = height
+        self.bots = len(names)
+        self.cell = _cell_format(width, height)
+        self.offsets = array('Q')
+        self._round = None
+        self.file.write(_HEADER.pack(MAGIC, VERSION, width, height, len(names)))
+        for name in names:
+            encoded = name.encode('utf-8')[:255]
+            self.file.write(bytes([len(encoded)]) + encoded)
+
+    def start_round(self, seed, spawns, points):
+        if seed is not None and not 0 <= seed < 1 << 64:
+            raise ValueError(f"Replay round seeds must be in [0, 2**64), got {seed}")
+        self._flush()
+        self._round = (seed, list(spawns), list(points), [])
+
+    def turn(self, moves):
+        """Record one turn: each bot's displacement, in seat order"""
+        self._round[3].extend(_CODE[move] for move in moves)
+
+    def _flush(self):
+        if self._round is None:
+            return
+        seed, spawns, points, codes = self._round
+        self._round = None
+        w = self.width
+        has_seed = seed is not None
+        record = bytearray(_ROUND.pack(int(has_seed), len(codes) // self.bots, len(points)))
+        if has_seed:
+            record += _SEED.pack(seed)
+        cells = array(self.cell, [y * w + x for x, y in spawns + points])
+        if sys.byteorder == 'big':
+            cells.byteswap()
+        record += cells.tobytes()
+        record += pack_moves(codes)
+        self.offsets.append(self.file.tell())
+        self.file.write(record)
+
+    def close(self):
+        self._flush()
+        index = self.file.tell()
+        if sys.byteorder == 'big':
+            self.offsets.byteswap()
+        self.file.write(self.offsets.tobytes())
+        self.file.write(_FOOTER.pack(index, len(self.offsets), INDEX_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ----------------- Reading -----------------
+class RoundLog:
+    """One decoded round: seed (or None), spawns, points and per-turn moves"""
+    def __init__(self, seed, spawns, points, moves):
+        self.seed = seed
+        self.spawns = spawns
+        self.points = points
+        self.moves = moves  # moves[turn][seat] -> (dx, dy)
+
+    @property
+    def turns(self):
+        return len(self.moves)
+
+    def frames(self):
+        """Yield (turn, positions, remaining points, scores) from the start to the last turn"""
+        positions = list(self.spawns)
+        remaining = set(self.points)
+        scores = [0] * len(positions)
+        yield 0, list(positions), set(remaining), list(scores)
+        for turn, moves in enumerate(self.moves, 1):
+            for seat, (dx, dy) in enumerate(moves):
+                x, y = positions[seat]
+                positions[seat] = (x + dx, y + dy)
+                if positions[seat] in remaining:
+                    remaining.discard(positions[seat])
+                    scores[seat] += 1
+            yield turn, list(positions), set(remaining), list(scores)
+
+class ReplayReader:
+    """Memory-mapped replay log with O(1) access to any round"""
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _PREFIX.unpack_from(self.data, 0)
+        if magic != MAGIC or version not in _HEADERS:
+            raise ValueError(f"{path} is not a version {', '.join(map(str, _HEADERS))} replay log")
+        header = _HEADERS[version]
+        self.round_header = _ROUNDS[version]
+        _, _, self.width, self.height, bots = header.unpack_from(self.data, 0)
+        pos = header.size
+        self.names = []
+        for _ in range(bots):
+            length = self.data[pos]
+            self.names.append(self.data[pos + 1:pos + 1 + length].decode('utf-8'))
+            pos += 1 + length
+        self.first_round = pos
+        self.cell = _cell_format(self.width, self.height)
+        self.cell_size = struct.calcsize(self.cell)
+
+        self.index_offset = None
+        if len(self.data) >= pos + _FOOTER.size:
+            index, count, magic = _FOOTER.unpack_from(self.data, len(self.data) - _FOOTER.size)
+            if magic == INDEX_MAGIC and index + 8 * count + _FOOTER.size == len(self.data):
+                self.index_offset, self.count = index, count
+        if self.index_offset is None:
+            self.offsets = self._scan()
+            self.count = len(self.offsets)
+
+    def _record_size(self, offset):
+        flags, turns, points = self.round_header.unpack_from(self.data, offset)
+        size = self.round_header.size + (_SEED.size if flags & 1 else 0)
+        bots = len(self.names)
+        return size + (bots + points) * self.cell_size + (turns * bots + 2) // 3
+
+    def _scan(self):
+        """Round offsets of a log without an index (its writer never closed)"""
+        offsets = []
+        pos, end = self.first_round, len(self.data)
+        while pos + self.round_header.size <= end:
+            size = self._record_size(pos)
+            if pos + size > end:
+                break  # truncated last round
+            offsets.append(pos)
+            pos += size
+        return offsets
+
+    def offset(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(f"round {i} out of range (log has {self.count})")
+        if self.index_offset is None:
+            return self.offsets[i]
+        return _SEED.unpack_from(self.data, self.index_offset + 8 * i)[0]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return self.round(i)
+
+    def round(self, i):
+        pos = self.offset(i)
+        flags, turns, count = self.round_header.unpack_from(self.data, pos)
+        pos += self.round_header.size
+        seed = None
+        if flags & 1:
+            seed = _SEED.unpack_from(self.data, pos)[0]
+            pos += _SEED.size
+        bots, w = len(self.names), self.width
+        cells = array(self.cell, self.data[pos:pos + (bots + count) * self.cell_size])
+        pos += len(cells) * self.cell_size
+        if sys.byteorder == 'big':
+            cells.byteswap()
+        positions = [(c % w, c // w) for c in cells]
+        codes = unpack_moves(self.data[pos:pos + (turns * bots + 2) // 3], turns * bots)
+        moves = [tuple(CODES[c] for c in codes[t * bots:(t + 1) * bots]) for t in range(turns)]
+        return RoundLog(seed, positions[:bots], positions[bots:], moves)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
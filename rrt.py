@@ -0,0 +1,176 @@
+import random
+from search import counters, deadline
+
+# ----------------- Nearest-neighbour index -----------------
+class BucketIndex:
+    """Grid-bucket index over tree nodes for nearest-node queries under Manhattan distance.
+
+    Ties go to the node inserted first, the same node min(tree.keys(), ...) picked.
+    """
+    def __init__(self, width, height, bucket=8):
+        self.bucket = bucket
+        self.cols = (width + bucket - 1) // bucket
+        self.rows = (height + bucket - 1) // bucket
+        self.buckets = {}  # (bx, by) -> {node: insertion order}
+
+    def add(self, node, order):
+        key = (node[0] // self.bucket, node[1] // self.bucket)
+        self.buckets.setdefault(key, {})[node] = order
+
+    def remove(self, node):
+        key = (node[0] // self.bucket, node[1] // self.bucket)
+        cell = self.buckets.get(key)
+        if cell is not None:
+            cell.pop(node, None)
+            if not cell:
+                del self.buckets[key]
+
+    def nearest(self, target):
+        tx, ty = target
+        bx, by = tx // self.bucket, ty // self.bucket
+        best, best_key = None, None
+        for r in range(max(self.cols, self.rows) + 1):
+            # every cell in ring r is at least (r - 1) * bucket + 1 steps away
+            if best_key is not None and r > 0 and (r - 1) * self.bucket + 1 > best_key[0]:
+                break
+            for key in self._ring(bx, by, r):
+                for node, order in self.buckets.get(key, {}).items():
+                    d = abs(node[0] - tx) + abs(node[1] - ty)
+                    if best_key is None or (d, order) < best_key:
+                        best, best_key = node, (d, order)
+        return best
+
+    def _ring(self, bx, by, r):
+        if r == 0:
+            yield bx, by
+            return
+        for x in range(bx - r, bx + r + 1):
+            yield x, by - r
+            yield x, by + r
+        for y in range(by - r + 1, by + r):
+            yield bx - r, y
+            yield bx + r, y
+
+# ----------------- Persistent RRT -----------------
+class RRT:
+    """Rapidly-exploring random tree on the grid that can be kept between turns.
+
+    Each turn the owner calls reroot() with the bot's new cell and prune() with
+    the cells other bots now block, then grow() towards its target. The tree
+    holds at most one node per cell, so it is bounded by the grid; max_nodes
+    optionally caps it lower, starting over from the root once reached.
+    """
+    def __init__(self, root, width, height, bucket=8, max_nodes=None):
+        self.width = width
+        self.height = height
+        self.bucket = bucket
+        self.max_nodes = max_nodes
+        self._reset(root)
+
+    def _reset(self, root):
+        self.root = root
+        self.parent = {root: None}
+        self.children = {root: set()}
+        self.order = 0
+        self.index = BucketIndex(self.width, self.height, self.bucket)
+        self._add(root, None)
+
+    def _add(self, node, parent):
+        self.parent[node] = parent
+        self.children[node] = set()
+        if parent is not None:
+            self.children[parent].add(node)
+        self.index.add(node, self.order)
+        self.order += 1
+
+    def __len__(self):
+        return len(self.parent)
+
+    def __contains__(self, node):
+        return node in self.parent
+
+    def reroot(self, pos):
+        """Make pos the root, reversing the branch to it; start over if pos is not in the tree"""
+        if pos == self.root:
+            return
+        if pos not in self.parent:
+            self._reset(pos)
+            return
+        chain = [pos]
+        while self.parent[chain[-1]] is not None:
+            chain.append(self.parent[chain[-1]])
+        for child, parent in zip(chain, chain[1:]):
+            self.children[parent].discard(child)
+            self.children[child].add(parent)
+            self.parent[parent] = child
+        self.parent[pos] = None
+        self.root = pos
+
+    def prune(self, blocked):
+        """Drop every subtree hanging from a non-root node in blocked"""
+        for node in blocked:
+            if node in self.parent and node != self.root:
+                self._remove_subtree(node)
+
+    def _remove_subtree(self, node):
+        self.children[self.parent[node]].discard(node)
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            stack.extend(self.children.pop(n))
+            del self.parent[n]
+            self.index.remove(n)
+
+    def grow(self, goal, occupied, max_iter=500, goal_bias=0.8, rng=random):
+        """Extend the tree up to max_iter samples, or until search.deadline passes;
+        True once goal is in the tree"""
+        if goal in self.parent:
+            return True
+        if self.max_nodes is not None and len(self.parent) >= self.max_nodes:
+            self._reset(self.root)
+        size = len(self.parent)
+        timed = deadline.at is not None
+        for i in range(max_iter):
+            # one nearest-node query can scan most of an empty board: look every sample
+            if timed and deadline.passed():
+                counters.expanded += i
+                counters.pushed += len(self.parent) - size
+                return False
+            # Bias sampling toward goal
+            if rng.random() < goal_bias:
+                target = goal
+            else:
+                target = (rng.randint(0, self.width-1), rng.randint(0, self.height-1))
+
+            nearest = self.index.nearest(target)
+
+            # One 4-connected step, along the axis with the larger gap
+            dx = target[0] - nearest[0]
+            dy = target[1] - nearest[1]
+            if dx == 0 and dy == 0:
+                continue
+            if abs(dx) >= abs(dy):
+                new_node = (nearest[0] + (1 if dx > 0 else -1), nearest[1])
+            else:
+                new_node = (nearest[0], nearest[1] + (1 if dy > 0 else -1))
+
+            if (0 <= new_node[0] < self.width and 0 <= new_node[1] < self.height and
+                    new_node not in occupied and new_node not in self.parent):
+                self._add(new_node, nearest)
+                if new_node == goal:
+                    counters.expanded += i + 1
+                    counters.pushed += len(self.parent) - size
+                    return True
+        counters.expanded += max_iter
+        counters.pushed += len(self.parent) - size
+        return False
+
+    def path_to(self, node):
+        """Moves from the root to node (which must be in the tree)"""
+        path = []
+        while self.parent[node] is not None:
+            parent = self.parent[node]
+            path.append((node[0] - parent[0], node[1] - parent[1]))
+            node = parent
+        counters.path_length = len(path)
+        return path[::-1]
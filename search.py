@@ -0,0 +1,180 @@
+from collections import deque
+import heapq
+import time
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+# ----------------- Counters -----------------
+class SearchCounters:
+    """Running totals every search adds to once per call; profiler.Profiler reads them.
+
+    path_length is the length of the last path found (None if none was); it is
+    only filled in where that is free unless enabled is set.
+    """
+    __slots__ = ('expanded', 'pushed', 'path_length', 'enabled')
+
+    def __init__(self):
+        self.expanded = 0
+        self.pushed = 0
+        self.path_length = None
+        self.enabled = False
+
+counters = SearchCounters()
+
+# ----------------- Decision deadline -----------------
+CHECK_EVERY = 64  # expansions between looks at the clock
+
+class Deadline:
+    """When the decision being made has to be ready, as a time.perf_counter() value.
+
+    The engine sets it around a strategy call that has a budget (see
+    watchdog.py). Searches that can stop early look at it every CHECK_EVERY
+    expansions and, once it has passed, answer with the best they have so
+    far; hit records that one did, so a partial answer is not cached.
+    """
+    __slots__ = ('at', 'hit')
+
+    def __init__(self):
+        self.at = None
+        self.hit = False
+
+    def start(self, budget):
+        self.at = None if budget is None else time.perf_counter() + budget
+        self.hit = False
+
+    def stop(self):
+        self.at = None
+
+    def passed(self):
+        """True once the deadline has gone by (never without one)"""
+        if self.at is not None and time.perf_counter() >= self.at:
+            self.hit = True
+            return True
+        return False
+
+deadline = Deadline()
+
+# ----------------- Came-from maps -----------------
+# A search keeps two maps instead of a path per queue entry:
+#   parent[node] -> previous node on the chosen path (None for the start)
+#   first[node]  -> first move of that path (None for the start)
+# so expanding a node is O(1) and only the answer is rebuilt.
+
+def _sign(v):
+    return (v > 0) - (v < 0)
+
+def reconstruct_path(parent, node):
+    """Rebuild the moves from the search start to node"""
+    path = []
+    while parent[node] is not None:
+        prev = parent[node]
+        path.append((_sign(node[0] - prev[0]), _sign(node[1] - prev[1])))
+        node = prev
+    return path[::-1]
+
+def first_step(first, node):
+    """First move towards node, or (0, 0) if there is none"""
+    step = first.get(node) if node is not None else None
+    return step if step is not None else (0, 0)
+
+# ----------------- BFS -----------------
+def bfs_search(start, goal_set, can_enter):
+    """Breadth-first search; returns (goal or None, parent, first)
+
+    A node keeps the path it was first discovered with, which is the path the
+    old per-entry-copy BFS returned. If the deadline passes first it gives up
+    with no goal: every node it holds is as far from one as the next.
+    """
+    parent = {start: None}
+    first = {start: None}
+    queue = deque([start])
+    expanded = 0
+    timed = deadline.at is not None
+
+    while queue:
+        current = queue.popleft()
+        if current in goal_set:
+            counters.expanded += expanded
+            counters.pushed += len(parent) - 1
+            if counters.enabled:
+                counters.path_length = len(reconstruct_path(parent, current))
+            return current, parent, first
+        if timed and expanded % CHECK_EVERY == 0 and deadline.passed():
+            break
+        expanded += 1
+
+        x, y = current
+        step = first[current]
+        for dx, dy in DIRECTIONS:
+            nxt = (x + dx, y + dy)
+            if nxt not in parent and can_enter(nxt):
+                parent[nxt] = current
+                first[nxt] = step or (dx, dy)
+                queue.append(nxt)
+
+    counters.expanded += expanded
+    counters.pushed += len(parent) - 1
+    return None, parent, first
+
+# ----------------- Heap search -----------------
+def heap_search(start, goal_set, can_enter, priority, start_key):
+    """Best-first search over a heap of (*key, node); returns (goal or None, parent, first)
+
+    priority(g, node) gives the heap key of a node reached in g moves. The old
+    strategies broke equal-key ties by comparing whole paths; the first move
+    decides that comparison, so ties here keep the smaller first move. That
+    reproduces every first move the path-copying searches made.
+
+    Anytime: if the deadline passes first, the node it was about to expand,
+    the best-ranked one reached, is returned in place of a goal.
+    """
+    parent = {start: None}
+    first = {start: None}
+    depth = {start: 0}
+    best = {start: start_key}
+    closed = set()
+    heap = [start_key + (start,)]
+    pushed = 0
+    timed = deadline.at is not None
+
+    while heap:
+        current = heapq.heappop(heap)[-1]
+        if current in goal_set:
+            counters.expanded += len(closed)
+            counters.pushed += pushed
+            counters.path_length = depth[current]
+            return current, parent, first
+        if current in closed:
+            continue
+        if timed and len(closed) % CHECK_EVERY == 0 and deadline.passed():
+            counters.expanded += len(closed)
+            counters.pushed += pushed
+            counters.path_length = depth[current]
+            return current, parent, first
+        closed.add(current)
+
+        x, y = current
+        g = depth[current] + 1
+        step = first[current]
+        for dx, dy in DIRECTIONS:
+            nxt = (x + dx, y + dy)
+            if nxt in closed or not can_enter(nxt):
+                continue
+            key = priority(g, nxt)
+            move = step or (dx, dy)
+            old = best.get(nxt)
+            if old is None or key < old:
+                best[nxt] = key
+                parent[nxt] = current
+                first[nxt] = move
+                depth[nxt] = g
+                heapq.heappush(heap, key + (nxt,))
+                pushed += 1
+            elif key == old and move < first[nxt]:
+                parent[nxt] = current
+                first[nxt] = move
+                depth[nxt] = g
+
+    counters.expanded += len(closed)
+    counters.pushed += pushed
+    return None, parent, first
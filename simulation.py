@@ -0,0 +1,360 @@
+import argparse
+import random
+import time
+from array import array
+import algorithms  # 引入演算法集合
+from host import StrategyHost
+from maps import load_map
+from pathcache import path_cache
+from points import PointSet
+from profiler import Profiler
+from replay import ReplayWriter
+from watchdog import budgets_for, decide
+from world import World
+
+# --- Parameters ---
+GRID_SIZE = algorithms.GRID_SIZE
+POINT_COUNT = 12
+MAX_TURNS = 100
+BOT_COLORS = [(255, 0, 0), (0, 128, 255), (0, 200, 0), (255, 128, 0)]
+
+STRATEGIES = [
+    ("Random", algorithms.random_strategy),
+    ("Greedy", algorithms.greedy_strategy),
+    ("Rule-based", algorithms.rule_based_strategy),
+    ("BFS", algorithms.bfs_strategy),
+    ("A*", algorithms.a_star_strategy),
+    ("D* Lite", algorithms.dstar_lite_strategy),
+    ("JPS", algorithms.jps_strategy),
+    ("RRT", algorithms.rrt_strategy),
+    ("Hybrid", algorithms.hybrid_strategy),
+    ("Best-First Search", algorithms.best_first_strategy),
+    ("Weighted A*", algorithms.weighted_a_star_strategy),
+    ("Wall Follower", algorithms.wall_follower_strategy),
+    ("WHCA*", algorithms.whca_strategy),
+    ("HPA*", algorithms.hpa_strategy),
+]
+
+# --- Bot Class ---
+class Bot:
+    # __slots__ keeps bots small and attribute access fast for runs with
+    # hundreds of them; last_direction is wall_follower_strategy's memory and
+    # memory is a per-round scratch dict other strategies keep state in;
+    # overruns counts the round's decisions that went over their time budget
+    __slots__ = ('x', 'y', 'color', 'strategy', 'name', 'score', 'total_score',
+                 'wins', 'turns_taken', 'last_direction', 'memory', 'overruns')
+
+    def __init__(self, x, y, color, strategy, name):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.strategy = strategy
+        self.name = name
+        self.score = 0
+        self.total_score = 0
+        self.wins = 0
+        self.turns_taken = 0
+        self.memory = {}
+        self.overruns = 0
+
+    def reset(self, x, y):
+        """Put the bot back on its spawn cell and clear per-round strategy state"""
+        self.x, self.y = x, y
+        self.score = 0
+        self.turns_taken = 0
+        self.overruns = 0
+        if hasattr(self, 'last_direction'):
+            del self.last_direction
+        self.memory = {}
+
+    def move(self, grid, points, bots):
+        self.apply(self.strategy(self, grid, points, bots), grid, bots)
+
+    def apply(self, move, grid, bots):
+        """Take the step a strategy chose, if it is legal"""
+        dx, dy = move
+        if abs(dx) + abs(dy) != 1:
+            return  # 4-connected: only single orthogonal steps are legal
+        nx, ny = self.x + dx, self.y + dy
+        width, height = algorithms.grid_bounds(grid)
+        if 0 <= nx < width and 0 <= ny < height:
+            if getattr(grid, 'occupied', None) is not None:
+                blocked = grid.is_occupied(nx, ny)  # O(1), includes our own cell
+            else:
+                blocked = any(bot.x == nx and bot.y == ny for bot in bots if bot is not self)
+            if not blocked:
+                self.x, self.y = nx, ny
+
+def generate_points(width=GRID_SIZE, height=GRID_SIZE, count=POINT_COUNT):
+    return World(width, height).generate_points(count)
+
+def spawn_positions(width=GRID_SIZE, height=GRID_SIZE, count=4):
+    """Starting cells in seat order: the corners, then spread over the grid"""
+    return World(width, height).spawn_positions(count)
+
+def round_seed(seed, round_index):
+    """Seed for one round, derived only from the tournament seed and the round's index"""
+    return (seed << 32) ^ round_index
+
+def parse_budget(values):
+    """--budget arguments in ms ("5", "RRT=20") -> {bot name or None: seconds}"""
+    budget = {}
+    for value in values:
+        name, _, ms = value.rpartition('=')
+        budget[name or None] = float(ms) / 1000
+    return budget
+
+def find_strategy(name):
+    """Look up a strategy function by its registered name"""
+    for strategy_name, strategy in STRATEGIES:
+        if strategy_name == name:
+            return strategy
+    raise KeyError(f"Unknown strategy: {name}")
+
+# ----------------- Match -----------------
+class Match:
+    """A single round: owns the points and the turn loop, no rendering"""
+    def __init__(self, bots, points=None, max_turns=MAX_TURNS, seed=None,
+                 width=GRID_SIZE, height=GRID_SIZE, point_count=POINT_COUNT, profiler=None,
+                 log=None, batch=False, grid_map=None, bitboard=False, budget=None, host=None):
+        # generate_points and the random strategies draw from the module-level
+        # random, so seeding it here makes the whole round reproducible
+        if seed is not None:
+            random.seed(seed)
+        self.world = World(width, height, grid_map, bitboard)  # a grid_map sets the size and walls
+        self.bots = bots
+        self.seed = seed
+        spawns = self.world.spawn_positions(len(bots))
+        if points is None:
+            points = self.world.generate_points(point_count, spawns)
+        self.points = PointSet(self.world.width, self.world.height, points)
+        self.max_turns = max_turns
+        self.turn = 0
+        self.profiler = profiler
+        self.log = log  # replay.ReplayWriter
+        # host: a host.StrategyHost deciding every bot's move in its worker
+        # processes; the profiler times decisions in this one, so not both
+        if host is not None and profiler is not None:
+            raise ValueError("A profiled match decides in this process; drop the profiler or the host")
+        self.host = host
+        # budget: seconds per decision, for everyone or {bot name: seconds};
+        # see watchdog.py
+        self.budgets = budgets_for(bots, budget)
+        # batch: strategies with a batched version decide for all their bots
+        # in one call from the turn-start board (see batched.py); the profiler
+        # times single decisions, so it turns batching off, and so does a
+        # budget for the bots it applies to
+        self.batches = {}
+        if batch and profiler is None and host is None:
+            for seat, bot in enumerate(bots):
+                if self.budgets is not None and self.budgets[seat] is not None:
+                    continue
+                if getattr(bot.strategy, 'batch', None) is not None:
+                    self.batches.setdefault(bot.strategy, []).append(seat)
+
+        for bot, (x, y) in zip(bots, spawns):
+            bot.reset(x, y)
+        self.world.start_round(self.points, bots)
+        if host is not None:
+            host.start_round(self)
+        if profiler is not None:
+            profiler.start_round()
+        if log is not None:
+            log.start_round(seed, spawns, self.points)
+
+    @property
+    def finished(self):
+        return not self.points or self.turn >= self.max_turns
+
+    def step(self):
+        """Advance one turn: every bot moves once and collects any point it lands on"""
+        world = self.world
+        profiler = self.profiler
+        moves = [] if self.log is not None else None
+        if self.host is not None:
+            decided = self.host.decide(self)
+        else:
+            decided = self.decide_batches() if self.batches else None
+        budgets = self.budgets
+        for seat, bot in enumerate(self.bots):
+            old = (bot.x, bot.y)
+            budget = budgets[seat] if budgets is not None else None
+            if decided is not None and seat in decided:
+                bot.apply(decided[seat], world, self.bots)
+            elif profiler is not None:
+                profiler.move(bot, world, self.points, self.bots, self.turn, budget)
+            elif budget is not None:
+                bot.apply(decide(bot, world, self.points, self.bots, budget)[0], world, self.bots)
+            else:
+                bot.move(world, self.points, self.bots)
+            bot.turns_taken += 1
+            if moves is not None:
+                moves.append((bot.x - old[0], bot.y - old[1]))
+            if (bot.x, bot.y) != old:
+                world.bot_moved(old, (bot.x, bot.y))
+            if world.has_point(bot.x, bot.y):
+                bot.score += 1
+                self.points.remove((bot.x, bot.y))
+                world.point_collected((bot.x, bot.y))
+                if self.host is not None:
+                    self.host.point_collected((bot.x, bot.y))
+        if moves is not None:
+            self.log.turn(moves)
+        world.end_turn()
+        self.turn += 1
+
+    def decide_batches(self):
+        """{seat: move} for every bot whose strategy decides in batches"""
+        xs = array('i', (bot.x for bot in self.bots))
+        ys = array('i', (bot.y for bot in self.bots))
+        decided = {}
+        for strategy, seats in self.batches.items():
+            dxs, dys = strategy.batch(self.world, self.bots, seats, xs, ys, self.points)
+            for seat, dx, dy in zip(seats, dxs, dys):
+                decided[seat] = (int(dx), int(dy))
+        return decided
+
+    def run(self):
+        while not self.finished:
+            self.step()
+        return self.winner()
+
+    def winner(self):
+        return max(self.bots, key=lambda b: b.score)
+
+# ----------------- Simulation -----------------
+class Simulation:
+    """A tournament of rounds between a fixed set of bots"""
+    def __init__(self, strategies, strategy_names, max_turns=MAX_TURNS,
+                 width=GRID_SIZE, height=GRID_SIZE, point_count=POINT_COUNT, profiler=None,
+                 log=None, batch=False, grid_map=None, bitboard=False, budget=None, host=None):
+        if grid_map is not None:
+            width, height = grid_map.width, grid_map.height
+        self.bots = [
+            Bot(x, y, BOT_COLORS[i % len(BOT_COLORS)], strategy, name)
+            for i, ((x, y), strategy, name)
+            in enumerate(zip(spawn_positions(width, height, len(strategies)), strategies, strategy_names))
+        ]
+        self.max_turns = max_turns
+        self.width = width
+        self.height = height
+        self.point_count = point_count
+        self.profiler = profiler
+        self.log = log
+        self.batch = batch
+        self.grid_map = grid_map
+        self.bitboard = bitboard
+        self.budget = budget
+        self.host = host
+        self.rounds_played = 0
+        self.performance = {bot.name: {'wins': 0, 'total_score': 0, 'total_turns': 0} for bot in self.bots}
+        if budgets_for(self.bots, budget) is not None:
+            for stats in self.performance.values():
+                stats['overruns'] = 0
+
+    def new_match(self, seed=None):
+        return Match(self.bots, max_turns=self.max_turns, seed=seed,
+                     width=self.width, height=self.height, point_count=self.point_count,
+                     profiler=self.profiler, log=self.log, batch=self.batch, grid_map=self.grid_map,
+                     bitboard=self.bitboard, budget=self.budget, host=self.host)
+
+    def record(self, match):
+        """Fold a finished match into the performance table"""
+        winner_bot = match.winner()
+        self.performance[winner_bot.name]['wins'] += 1
+        for bot in self.bots:
+            bot.total_score += bot.score
+            self.performance[bot.name]['total_score'] += bot.score
+            self.performance[bot.name]['total_turns'] += match.turn
+            if 'overruns' in self.performance[bot.name]:
+                self.performance[bot.name]['overruns'] += bot.overruns
+        winner_bot.wins += 1
+        self.rounds_played += 1
+
+    def run(self, total_rounds, seed=None, first_round=0):
+        """Play rounds first_round .. first_round + total_rounds - 1, seeding each one if seed is given"""
+        for round_index in range(first_round, first_round + total_rounds):
+            match = self.new_match(None if seed is None else round_seed(seed, round_index))
+            match.run()
+            self.record(match)
+        return self.performance
+
+def format_results(performance, total_rounds):
+    """Plain-text version of the final results table, with overruns when there were budgets"""
+    budgeted = any('overruns' in stats for stats in performance.values())
+    lines = [f"{'Bot':<20}{'Wins':>8}{'Avg Score':>12}{'Efficiency':>12}" + (f"{'Overruns':>10}" if budgeted else "")]
+    for name, stats in performance.items():
+        avg_score = stats['total_score'] / total_rounds
+        efficiency = 100 * stats['wins'] / total_rounds
+        line = f"{name:<20}{stats['wins']:>8}{avg_score:>12.2f}{efficiency:>11.1f}%"
+        if budgeted:
+            line += f"{stats.get('overruns', 0):>10}"
+        lines.append(line)
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an AI Battle Bots tournament without rendering")
+    parser.add_argument("-r", "--rounds", type=int, default=100)
+    parser.add_argument("-s", "--strategies", nargs=4, default=["Random", "Greedy", "Rule-based", "BFS"],
+                        metavar="NAME", help="four names from STRATEGIES, in seat order")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--width", type=int, default=GRID_SIZE)
+    parser.add_argument("--height", type=int, default=GRID_SIZE)
+    parser.add_argument("--points", type=int, default=POINT_COUNT)
+    parser.add_argument("--map", metavar="FILE", help="obstacle map (MovingAI .map or text grid); sets the size")
+    parser.add_argument("--profile", action="store_true", help="time every strategy decision")
+    parser.add_argument("--profile-csv", metavar="FILE", help="write per-turn profile rows as CSV")
+    parser.add_argument("--profile-json", metavar="FILE", help="write the profile summary and rows as JSON")
+    parser.add_argument("--replay", metavar="FILE", help="record every round to a binary replay log")
+    parser.add_argument("--seed", type=int, help="seed each round from this and its index")
+    parser.add_argument("--batch", action="store_true",
+                        help="let strategies with a batched version decide all their bots at once")
+    parser.add_argument("--bitboard", action="store_true",
+                        help="answer distance-field queries with big-int bitboards (bitboard.py)")
+    parser.add_argument("--budget", nargs="+", metavar="MS",
+                        help="time per decision in ms, for every bot (MS) or one strategy (NAME=MS)")
+    parser.add_argument("--processes", type=int, metavar="N",
+                        help="decide in N worker processes sharing the board (host.py); 0 = one per bot")
+    args = parser.parse_args(argv)
+
+    if args.replay and args.seed is not None and not 0 <= args.seed < 1 << 32:
+        parser.error("--replay stores 64-bit round seeds, so --seed must be in [0, 2**32)")
+
+    strategies = [find_strategy(name) for name in args.strategies]
+    profiler = None
+    if args.profile or args.profile_csv or args.profile_json:
+        if args.processes is not None:
+            parser.error("--profile times decisions in this process; it cannot be combined with --processes")
+        profiler = Profiler()
+    grid_map = load_map(args.map) if args.map else None
+    sim = Simulation(strategies, args.strategies, max_turns=args.max_turns,
+                     width=args.width, height=args.height, point_count=args.points,
+                     profiler=profiler, batch=args.batch, grid_map=grid_map, bitboard=args.bitboard,
+                     budget=parse_budget(args.budget) if args.budget else None,
+                     host=StrategyHost(args.processes or None) if args.processes is not None else None)
+    log = ReplayWriter(args.replay, sim.width, sim.height, args.strategies) if args.replay else None
+    sim.log = log
+    start = time.perf_counter()
+    try:
+        sim.run(args.rounds, seed=args.seed)
+    finally:
+        if log is not None:
+            log.close()
+        if sim.host is not None:
+            sim.host.close()
+    elapsed = time.perf_counter() - start
+
+    print(format_results(sim.performance, args.rounds))
+    print(f"\n{args.rounds} rounds in {elapsed:.2f}s ({args.rounds / elapsed:.0f} rounds/s)")
+    if profiler is not None:
+        print()
+        print(profiler.format_summary())
+        if path_cache.hits or path_cache.misses:
+            print(path_cache.format_stats())
+        if args.profile_csv:
+            profiler.to_csv(args.profile_csv)
+        if args.profile_json:
+            profiler.to_json(args.profile_json)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import itertools
+import random
+import pytest
+from assignment import BIDS_PER_TURN, Assignment, Auction
+
+class Bot:
+    def __init__(self, x, y, strategy="team"):
+        self.x, self.y, self.strategy = x, y, strategy
+
+class Board:
+    """The parts of World an Auction reads: an open board with points"""
+    def __init__(self, width, height, points, bots=()):
+        self.width, self.height = width, height
+        self.points = list(points)
+        self.bots = list(bots)
+        self.turn = 0
+
+    def point_lookup(self):
+        return set(self.points)
+
+def _cost(bot, point):
+    return abs(bot.x - point[0]) + abs(bot.y - point[1])
+
+def _settle(auction):
+    while auction.queue:
+        auction.update(budget=10 ** 6)
+
+def _optimum(bots, points):
+    """Cheapest total distance matching every bot (or every point, if fewer) by brute force"""
+    if len(points) >= len(bots):
+        return min(sum(map(_cost, bots, chosen)) for chosen in itertools.permutations(points, len(bots)))
+    return min(sum(map(_cost, chosen, points)) for chosen in itertools.permutations(bots, len(points)))
+
+def _total(auction):
+    pairs = auction.holder.items() if auction.reverse else auction.holds.items()
+    assert all(target is not None for _, target in pairs)
+    return sum(_cost(bot, point) for bot, point in pairs)
+
+def test_auction_beats_nearest_first():
+    # nearest-first in seat order gives B (1, 0) and A (5, 0), 6 steps in all
+    a, b = Bot(0, 0), Bot(3, 0)
+    auction = Auction(Board(8, 8, [(2, 0), (5, 0)]), [b, a])
+    _settle(auction)
+    assert auction.holds == {a: (2, 0), b: (5, 0)}
+
+@pytest.mark.parametrize("seed", range(20))
+def test_auction_is_within_eps_per_bot_of_optimal(seed):
+    rng = random.Random(seed)
+    cells = [(x, y) for x in range(20) for y in range(20)]
+    picked = rng.sample(cells, rng.randint(5, 9))
+    bots = [Bot(x, y) for x, y in picked[:4]]
+    points = picked[4:]  # 1 to 5 points: some boards swap to points bidding for bots
+    optimum = _optimum(bots, points)
+    for eps in (1.0, 1 / (len(bots) + 1)):
+        auction = Auction(Board(20, 20, points), bots, eps=eps, bucket=4)
+        _settle(auction)
+        assert auction.reverse == (len(points) < len(bots))
+        assigned = min(len(bots), len(points))
+        assert len(auction.holder) == assigned
+        assert _total(auction) <= optimum + assigned * eps
+        if eps < 1 / assigned:  # integer costs: the auction is exact
+            assert _total(auction) == optimum
+
+def test_bid_budget_leaves_bidders_queued_until_later_turns():
+    rng = random.Random(5)
+    picked = rng.sample([(x, y) for x in range(30) for y in range(30)], 30)
+    bots = [Bot(x, y) for x, y in picked[:15]]
+    board = Board(30, 30, picked[15:], bots)
+    unlimited = Auction(board, bots)
+    _settle(unlimited)
+
+    assignment = Assignment(board)
+    assignment.target(bots[0])
+    auction = assignment.auction(bots[0])
+    assert auction.bids == BIDS_PER_TURN
+    assert auction.queue
+    waiting = [bot for bot in bots if assignment.target(bot) is None]
+    assert waiting  # these fall back to their strategy's own choice this turn
+    assert auction.bids == BIDS_PER_TURN  # asking again in the same turn runs no more bids
+
+    while auction.queue:
+        board.turn += 1
+        assignment.target(bots[0])
+        assert auction.bids <= BIDS_PER_TURN * (board.turn + 1)
+    assert auction.holds == unlimited.holds
+    assert all(assignment.target(bot) is not None for bot in bots)
@@ -0,0 +1,45 @@
+import random
+from array import array
+import pytest
+import batched
+from simulation import Simulation, find_strategy
+
+np = pytest.importorskip("numpy")
+
+NAMES = ["Random", "Greedy", "Greedy", "Rule-based", "Rule-based", "Random", "Greedy", "Rule-based"]
+
+def _both(monkeypatch, call):
+    """call() with NumPy and with the plain-Python path, from the same random state"""
+    state = random.getstate()
+    fast = call()
+    after = random.getstate()
+    random.setstate(state)
+    with monkeypatch.context() as m:
+        m.setattr(batched, "np", None)
+        plain = call()
+    assert random.getstate() == after
+    return fast, plain
+
+def _ints(result):
+    if isinstance(result, tuple):
+        return tuple(_ints(part) for part in result)
+    return [int(v) for v in result]
+
+@pytest.mark.parametrize("size", [12, 40])  # a NearestSearch board and a DistanceField one
+def test_numpy_and_plain_python_agree(monkeypatch, size):
+    sim = Simulation([find_strategy(name) for name in NAMES], NAMES, width=size, height=size,
+                     point_count=size, batch=True)
+    for round_index in range(5):
+        match = sim.new_match(seed=round_index)
+        while not match.finished:
+            world, bots, points = match.world, match.bots, match.points
+            xs = array('i', (bot.x for bot in bots))
+            ys = array('i', (bot.y for bot in bots))
+            seats = list(range(len(bots)))
+            if points:
+                fast, plain = _both(monkeypatch, lambda: batched._descend(world, seats, xs, ys))
+                assert _ints(fast) == _ints(plain)
+            for batch in (batched.random_batch, batched.greedy_batch, batched.rule_based_batch):
+                fast, plain = _both(monkeypatch, lambda: batch(world, bots, seats, xs, ys, points))
+                assert _ints(fast) == _ints(plain)
+            match.step()
@@ -0,0 +1,63 @@
+import random
+from algorithms import _bfs
+from bitboard import INF, Bitboard
+from maps import GridMap
+from search import bfs_search, first_step, reconstruct_path
+from simulation import Simulation
+
+def _random_board(rng):
+    width, height = rng.randint(1, 40), rng.randint(1, 40)
+    density = rng.choice((0.0, 0.1, 0.3))
+    walls = bytearray(rng.random() < density for _ in range(width * height))
+    cells = [(x, y) for y in range(height) for x in range(width) if not walls[y * width + x]]
+    rng.shuffle(cells)
+    bots = cells[:rng.randint(0, 6)]
+    points = set(cells[len(bots):len(bots) + rng.randint(0, 8)])
+    points.update(rng.sample(bots, min(len(bots), 1)))  # a point under a bot is still a point
+    return width, height, walls, bots, points, cells
+
+def test_queries_match_bfs_on_random_boards():
+    rng = random.Random(22)
+    for _ in range(400):
+        width, height, walls, bots, points, cells = _random_board(rng)
+        board = Bitboard(width, height, walls, points, bots)
+        blocked = set(bots)
+
+        def free(p):
+            x, y = p
+            return 0 <= x < width and 0 <= y < height and not walls[y * width + x] and p not in blocked
+
+        def can_enter(p):
+            return free(p) or p in points
+
+        for start in cells[:10]:
+            found, parent, _ = bfs_search(start, points, can_enter)
+            expected = len(reconstruct_path(parent, found)) if found is not None else INF
+            assert board.distance(start) == (expected if can_enter(start) else INF)
+
+            _, parent, _ = bfs_search(start, set(), free)  # no goals: floods everything reachable
+            reached = board.reachable(start)
+            assert {p for p in cells if reached >> board.index(p) & 1} == set(parent)
+
+def test_descend_matches_bfs_path_in_matches():
+    """Seeded matches on open and walled boards, both sides of NearestSearch's size limit"""
+    checked = []
+
+    def checking(bot, grid, points, bots):
+        field = grid.distance_field
+        assert isinstance(field, Bitboard)
+        goal, _, first = _bfs((bot.x, bot.y), points, bots, grid)
+        move = field.descend((bot.x, bot.y))
+        assert move == (first_step(first, goal) if goal is not None else (0, 0))
+        checked.append(move)
+        return move
+
+    rng = random.Random(7)
+    for size in (6, 16, 30):
+        for density in (0.0, 0.2):
+            walls = bytearray(rng.random() < density for _ in range(size * size))
+            grid_map = GridMap(size, size, walls) if density else None
+            sim = Simulation([checking] * 4, ["a", "b", "c", "d"], width=size, height=size,
+                             max_turns=60, grid_map=grid_map, bitboard=True)
+            sim.run(20, seed=size)
+    assert len(checked) > 5000
@@ -0,0 +1,59 @@
+import random
+from dstar import INF, DStarLite
+from search import DIRECTIONS, bfs_search, reconstruct_path
+
+def _bfs_distance(width, height, walls, blocked, start, goals):
+    def can_enter(p):
+        x, y = p
+        if not (0 <= x < width and 0 <= y < height):
+            return False
+        return p in goals or not (walls[y * width + x] or p in blocked)
+    found, parent, _ = bfs_search(start, goals, can_enter)
+    return len(reconstruct_path(parent, found)) if found is not None else INF
+
+def _step(rng, width, height, walls, taken, pos):
+    """pos moved one random free step, or left where it is"""
+    x, y = pos
+    moves = [(x + dx, y + dy) for dx, dy in DIRECTIONS
+             if 0 <= x + dx < width and 0 <= y + dy < height
+             and not walls[(y + dy) * width + x + dx] and (x + dx, y + dy) not in taken]
+    return rng.choice(moves) if moves else pos
+
+def test_replanning_matches_a_fresh_search():
+    rng = random.Random(18)
+    for _ in range(150):
+        width, height = rng.randint(3, 12), rng.randint(3, 12)
+        density = rng.choice((0.0, 0.15, 0.3))
+        walls = bytearray(rng.random() < density for _ in range(width * height))
+        open_cells = [(x, y) for y in range(height) for x in range(width) if not walls[y * width + x]]
+        if len(open_cells) < 6:
+            continue
+        rng.shuffle(open_cells)
+        pos, others = open_cells[0], open_cells[1:4]
+        goals = set(open_cells[4:4 + rng.randint(1, 6)])
+        planner = DStarLite(width, height, pos, goals, others, walls)
+        for _ in range(25):
+            planner.compute()
+            fresh = DStarLite(width, height, pos, goals, others, walls)
+            fresh.compute()
+            expected = _bfs_distance(width, height, walls, set(others), pos, goals)
+            assert planner.g.get(pos, INF) == fresh.g.get(pos, INF) == expected
+
+            move = planner.next_move()
+            if expected not in (0, INF):  # the chosen step is on a shortest path
+                nxt = (pos[0] + move[0], pos[1] + move[1])
+                assert _bfs_distance(width, height, walls, set(others), nxt, goals) == expected - 1
+                pos = nxt
+            goals.discard(pos)  # collected
+            if not goals:
+                break
+            for i, p in enumerate(others):  # one after another, like a turn
+                others[i] = _step(rng, width, height, walls, {pos, *others}, p)
+            if rng.random() < 0.2:  # another bot collects a point
+                gone = rng.choice(sorted(goals))
+                goals.discard(gone)
+                if not goals:
+                    break
+            planner.move_start(pos)
+            planner.remove_goals(planner.goals.difference(goals))
+            planner.set_blocked(others)
@@ -0,0 +1,22 @@
+from algorithms import _bfs
+from flowfield import NearestSearch
+from search import first_step
+from simulation import Simulation
+
+def test_nearest_search_matches_bfs_path():
+    """300 seeded matches on boards small enough for NearestSearch: every move is bfs_path's"""
+    checked = []
+
+    def checking(bot, grid, points, bots):
+        field = grid.distance_field
+        assert isinstance(field, NearestSearch)
+        goal, _, first = _bfs((bot.x, bot.y), points, bots, grid)
+        move = field.descend((bot.x, bot.y))
+        assert move == first_step(first, goal)
+        checked.append(move)
+        return move
+
+    for size in (6, 10, 16):
+        sim = Simulation([checking] * 4, ["a", "b", "c", "d"], width=size, height=size, max_turns=60)
+        sim.run(100, seed=size)
+    assert len(checked) > 10000
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from eleventh import GameView, INFO_HEIGHT
+from maps import load_map
+from simulation import Bot, Simulation, find_strategy
+from world import World
+
+MAP = os.path.join(os.path.dirname(__file__), os.pardir, "maps", "warehouse.map")
+
+def covered(rect, dirty):
+    return any(d.contains(rect) for d in dirty)
+
+def layout(size, width=10, height=10):
+    view = GameView(None, None, None)
+    view._layout(size, World(width, height))
+    return view
+
+def test_dirty_rects_cover_moves_collected_points_and_scores():
+    view = layout((500, 500 + INFO_HEIGHT))
+    bot = Bot(2, 2, (255, 0, 0), None, "a")
+    points = [(3, 2), (7, 7)]
+    restore, draw, info_changed, dirty = view.plan([bot], points, (1, 0, "", (0,)))
+    assert restore == [] and draw == set(points) and info_changed
+    assert all(covered(view._cell(*pos), dirty) for pos in points)
+
+    old = view._bot_rect(bot)
+    bot.x, bot.score = 3, 1
+    points = [(7, 7)]
+    restore, draw, info_changed, dirty = view.plan([bot], points, (1, 1, "", (1,)))
+    assert covered(old, dirty) and covered(view._bot_rect(bot), dirty)
+    assert view._point_rect((3, 2)) in restore and covered(view._cell(3, 2), dirty)
+    assert info_changed and view.info_rect in dirty
+    assert (7, 7) not in draw and not covered(view._cell(7, 7), dirty)
+
+    restore, draw, info_changed, dirty = view.plan([bot], points, (1, 1, "", (1,)))
+    assert not info_changed and view.info_rect not in dirty
+    assert dirty == [view._bot_rect(bot)] * 2
+
+def test_points_under_a_bot_that_left_are_redrawn():
+    view = layout((60, 60 + INFO_HEIGHT))  # 6 px cells: the bot's circle spills into its neighbours
+    bot = Bot(4, 4, (255, 0, 0), None, "a")
+    points = [(5, 4), (3, 5), (8, 8)]
+    view.plan([bot], points, None)
+    bot.x = 3
+    restore, draw, info_changed, dirty = view.plan([bot], points, None)
+    assert {(5, 4), (3, 5)} <= draw
+    assert (8, 8) not in draw
+
+@pytest.mark.parametrize("grid_map", [None, "warehouse"])
+@pytest.mark.parametrize("size", [(320, 280), (80, INFO_HEIGHT + 60)])  # 5 px cells: circles spill over
+def test_incremental_frames_match_a_full_redraw(grid_map, size, tmp_path):
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode(size)
+        background = pygame.Surface((40, 40))
+        for y in range(40):
+            pygame.draw.line(background, (y * 6, 40, 200 - y * 4), (0, y), (39, y))
+        font = pygame.font.Font(None, 20)
+        names = ["BFS", "A*", "Greedy", "BFS"]
+        sim = Simulation([find_strategy(name) for name in names], names, width=12, height=12,
+                         grid_map=load_map(MAP, tmp_path) if grid_map else None)
+        match = sim.new_match(seed=3)
+        view = GameView(background, font, font)
+        fresh = pygame.Surface(size)
+        while True:
+            view.render(screen, sim.bots, match.points, 1, match.turn, match.world)
+            full = GameView(background, font, font)
+            full.render(fresh, sim.bots, match.points, 1, match.turn, match.world)
+            assert pygame.image.tostring(screen, "RGB") == pygame.image.tostring(fresh, "RGB"), match.turn
+            if match.finished:
+                break
+            match.step()
+    finally:
+        pygame.quit()
@@ -0,0 +1,47 @@
+import random
+from jps_plus import JumpTable, jps_plus_search
+from search import bfs_search, reconstruct_path
+
+def _length(path):
+    return sum(abs(b[0] - a[0]) + abs(b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+def _bfs_length(table, start, goal):
+    def can_enter(p):
+        return not table.is_blocked(*p) or p == goal  # a goal with a bot on it is still a goal
+    found, parent, _ = bfs_search(start, {goal}, can_enter)
+    return len(reconstruct_path(parent, found)) if found is not None else None
+
+def _random_table(rng):
+    width, height = rng.randint(2, 14), rng.randint(2, 14)
+    density = rng.choice((0.0, 0.1, 0.25, 0.4))
+    cells = [(x, y) for x in range(width) for y in range(height)]
+    return JumpTable(width, height, [p for p in cells if rng.random() < density]), cells
+
+def test_matches_bfs_on_random_maps():
+    rng = random.Random(5)
+    for _ in range(3000):
+        table, cells = _random_table(rng)
+        start = rng.choice(cells)
+        goal = rng.choice(cells)
+        if start == goal or table.is_blocked(*start):
+            continue
+        path = jps_plus_search(table, start, goal)
+        assert (_length(path) if path else None) == _bfs_length(table, start, goal)
+
+def test_moving_obstacles_matches_a_fresh_table():
+    rng = random.Random(8)
+    for _ in range(200):
+        table, cells = _random_table(rng)
+        for _ in range(20):
+            old = rng.choice([p for p in cells if table.is_blocked(*p)] or cells)
+            new = rng.choice(cells)
+            if table.is_blocked(*new):
+                continue
+            if table.is_blocked(*old):
+                table.move_obstacle(old, new)
+            else:
+                table.set_blocked(new, 1)
+        fresh = JumpTable(table.width, table.height, [p for p in cells if table.is_blocked(*p)])
+        assert table.east == fresh.east
+        assert table.west == fresh.west
+        assert table.stops == fresh.stops
@@ -0,0 +1,20 @@
+import league
+
+PAIRING = ("BFS", "A*", "Greedy", "Random")
+
+def test_pairing_key_changes_with_a_strategy_source(monkeypatch):
+    others = ("BFS", "A*", "Random", "RRT")
+    key, other_key = league.pairing_key(PAIRING, 10, 0, 100), league.pairing_key(others, 10, 0, 100)
+    assert league.pairing_key(PAIRING, 10, 0, 100) == key
+    assert league.pairing_key(PAIRING[::-1], 10, 0, 100) != key
+    monkeypatch.setitem(league._versions, "Greedy", "edited")
+    assert league.pairing_key(PAIRING, 10, 0, 100) != key
+    assert league.pairing_key(others, 10, 0, 100) == other_key  # pairings without Greedy are kept
+
+def test_pairing_key_changes_with_the_cache_version(monkeypatch):
+    key = league.pairing_key(PAIRING, 10, 0, 100)
+    monkeypatch.setattr(league, "CACHE_VERSION", league.CACHE_VERSION + 1)
+    assert league.pairing_key(PAIRING, 10, 0, 100) != key
+
+def test_strategy_version_hashes_the_source():
+    assert len({league.strategy_version(name) for name in PAIRING}) == len(PAIRING)
@@ -0,0 +1,25 @@
+from pacing import SPEEDS, TURN_MS, turns_due
+
+def test_one_turn_per_turn_ms_at_x1():
+    assert turns_due(0.0, TURN_MS - 1, 1) == (0, TURN_MS - 1)
+    assert turns_due(TURN_MS - 1, 1, 1) == (1, 0)
+
+def test_speed_scales_the_time_owed():
+    assert turns_due(0.0, TURN_MS, 4) == (4, 0)
+    assert turns_due(0.0, TURN_MS, 0.25) == (0, TURN_MS / 4)
+    assert turns_due(0.0, 16, SPEEDS[-1]) == (2, 16 * 64 - 2 * TURN_MS)
+
+def test_leftover_carries_over_frames():
+    owed, played = 0.0, 0
+    for _ in range(60):  # one second of frames at 60 FPS
+        turns, owed = turns_due(owed, 1000 / 60, 1)
+        played += turns
+    assert played == 1000 // TURN_MS
+    assert 0 <= owed < TURN_MS
+
+def test_paused_owes_nothing():
+    assert turns_due(100.0, 5000, 8, paused=True) == (0, 100.0)
+
+def test_skip_plays_as_many_as_fit():
+    assert turns_due(100.0, 16, 1, skip=True) == (None, 100.0)
+    assert turns_due(100.0, 16, 1, paused=True, skip=True) == (None, 100.0)
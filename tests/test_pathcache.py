@@ -0,0 +1,16 @@
+from pathcache import path_cache
+from simulation import Simulation, find_strategy
+
+NAMES = ["Best-First Search", "Weighted A*", "HPA*", "Best-First Search"]
+
+def test_strategies_hit_the_cache_in_a_match():
+    path_cache.clear()
+    try:
+        sim = Simulation([find_strategy(name) for name in NAMES], NAMES, width=30, height=30, point_count=20)
+        sim.new_match(seed=4).run()
+        stats = path_cache.stats()
+        assert stats['misses'] > 0
+        assert stats['hits'] > 0
+        assert stats['size'] > 0
+    finally:
+        path_cache.clear()
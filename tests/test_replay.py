@@ -0,0 +1,41 @@
+import pytest
+from replay import ReplayReader, ReplayWriter, numbered_path
+
+def test_hundreds_of_bots(tmp_path):
+    path = tmp_path / "bots.rpl"
+    bots = 300
+    with ReplayWriter(path, 50, 50, [f"bot {i}" for i in range(bots)]) as log:
+        log.start_round((1 << 64) - 1, [(i % 50, i // 50) for i in range(bots)], [(49, 49)])
+        log.turn([(1, 0)] * bots)
+    with ReplayReader(path) as reader:
+        round_log = reader[0]
+        assert len(reader.names) == bots
+        assert round_log.seed == (1 << 64) - 1
+        assert round_log.moves == [((1, 0),) * bots]
+
+def test_more_than_65535_turns(tmp_path):
+    path = tmp_path / "long.rpl"
+    with ReplayWriter(path, 10, 10, ["a", "b"]) as log:
+        log.start_round(7, [(0, 0), (9, 9)], [(5, 5)])
+        for _ in range(70000):
+            log.turn([(0, 1), (0, -1)])
+    with ReplayReader(path) as reader:
+        assert reader[0].turns == 70000
+
+def test_seed_out_of_range_raises(tmp_path):
+    with ReplayWriter(tmp_path / "seed.rpl", 10, 10, ["a"]) as log:
+        with pytest.raises(ValueError):
+            log.start_round(1 << 64, [(0, 0)], [])
+        with pytest.raises(ValueError):
+            log.start_round(-1, [(0, 0)], [])
+
+def test_bad_header_raises_before_opening(tmp_path):
+    path = tmp_path / "wide.rpl"
+    with pytest.raises(ValueError):
+        ReplayWriter(path, 1 << 32, 10, ["a"])
+    assert not path.exists()
+
+def test_numbered_paths_keep_every_game():
+    assert numbered_path("game.rpl", 1) == "game.rpl"
+    assert numbered_path("game.rpl", 2) == "game-2.rpl"
+    assert numbered_path("logs/game", 3) == "logs/game-3"
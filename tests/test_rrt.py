@@ -0,0 +1,63 @@
+import random
+from rrt import RRT
+
+def _check_tree(tree, blocked):
+    """Every node hangs from the root by 4-connected steps, off blocked cells, and is indexed"""
+    assert tree.parent[tree.root] is None
+    assert set(tree.children) == set(tree.parent)
+    indexed = {node for cell in tree.index.buckets.values() for node in cell}
+    assert indexed == set(tree.parent)
+    for node, parent in tree.parent.items():
+        assert 0 <= node[0] < tree.width and 0 <= node[1] < tree.height
+        if parent is None:
+            assert node == tree.root
+            continue
+        assert node not in blocked
+        assert abs(node[0] - parent[0]) + abs(node[1] - parent[1]) == 1
+        assert node in tree.children[parent]
+    for parent, children in tree.children.items():
+        assert all(tree.parent[child] == parent for child in children)
+    for node in tree.parent:  # no orphans or cycles: the parent chain ends at the root
+        seen = set()
+        while node != tree.root:
+            assert node not in seen
+            seen.add(node)
+            node = tree.parent[node]
+
+def _follow(tree, node):
+    x, y = tree.root
+    cells = []
+    for dx, dy in tree.path_to(node):
+        assert abs(dx) + abs(dy) == 1
+        x, y = x + dx, y + dy
+        cells.append((x, y))
+    assert (x, y) == node
+    return cells
+
+def test_reroot_and_prune_keep_a_valid_tree():
+    rng = random.Random(9)
+    for _ in range(60):
+        width, height = rng.randint(4, 20), rng.randint(4, 20)
+        cells = [(x, y) for x in range(width) for y in range(height)]
+        rng.shuffle(cells)
+        pos, others = cells[0], cells[1:5]
+        tree = RRT(pos, width, height, bucket=rng.choice((2, 4, 8)))
+        for _ in range(30):
+            goal = rng.choice([c for c in cells if c != pos and c not in others])
+            blocked = set(others)
+            if tree.grow(goal, blocked, max_iter=300, rng=rng):
+                path = _follow(tree, goal)
+                assert not blocked & set(path)
+                dx, dy = tree.path_to(goal)[0]
+                pos = (pos[0] + dx, pos[1] + dy)  # one step along it
+            elif rng.random() < 0.3:
+                pos = rng.choice([c for c in cells if c not in blocked])  # off the tree: starts over
+            # the other bots wander, some onto the tree
+            others = [rng.choice([c for c in cells if c != pos and c not in others]) if rng.random() < 0.5
+                      else p for p in others]
+            tree.reroot(pos)
+            tree.prune(others)
+            assert tree.root == pos
+            _check_tree(tree, set(others))
+            for node in rng.sample(sorted(tree.parent), min(10, len(tree))):
+                assert not set(others) & set(_follow(tree, node))
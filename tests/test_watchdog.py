@@ -0,0 +1,69 @@
+import time
+from assignment import Auction
+from host import StrategyHost
+from search import deadline
+from simulation import Simulation, find_strategy
+from watchdog import DEFAULT_MOVE, decide
+from world import World
+
+def slow_strategy(bot, grid, points, bots):
+    time.sleep(0.02)
+    return 1, 0
+
+def hung_strategy(bot, grid, points, bots):
+    time.sleep(30)
+    return 1, 0
+
+def _simulation(strategies, budget, **kwargs):
+    names = [f"bot {i}" for i in range(len(strategies))]
+    return Simulation(strategies, names, width=10, height=10, budget=budget, **kwargs)
+
+def test_over_budget_plays_the_default_move():
+    sim = _simulation([slow_strategy, find_strategy("BFS")], {"bot 0": 0.002})
+    match = sim.new_match(seed=1)
+    slow = match.bots[0]
+    spawn = (slow.x, slow.y)
+    for _ in range(3):
+        match.step()
+    assert (slow.x, slow.y) == spawn
+    assert slow.overruns == 3
+    assert match.bots[1].overruns == 0
+
+def test_decide_counts_the_overrun():
+    sim = _simulation([slow_strategy], None)
+    match = sim.new_match(seed=1)
+    bot = match.bots[0]
+    move, elapsed = decide(bot, match.world, match.points, match.bots, 0.002)
+    assert move == DEFAULT_MOVE
+    assert elapsed >= 0.02
+    assert bot.overruns == 1
+
+def test_searches_give_up_at_the_deadline():
+    sim = _simulation([find_strategy("BFS")] * 2, None)
+    match = sim.new_match(seed=1)
+    world, bot = match.world, match.bots[0]
+    deadline.start(0.0)
+    try:
+        assert world.distance_field.descend((bot.x, bot.y)) == (0, 0)
+        auction = Auction(world, match.bots)
+        auction.update()
+        assert auction.bids == 0
+    finally:
+        deadline.stop()
+
+def test_host_cuts_off_a_hung_strategy():
+    with StrategyHost(processes=2) as host:
+        sim = _simulation([hung_strategy, find_strategy("BFS")], 0.05, host=host)
+        match = sim.new_match(seed=1)
+        hung, other = match.bots
+        spawn, other_spawn = (hung.x, hung.y), (other.x, other.y)
+        start = time.perf_counter()
+        moved = False
+        for _ in range(2):
+            match.step()
+            moved |= (other.x, other.y) != other_spawn
+        assert time.perf_counter() - start < 5
+        assert (hung.x, hung.y) == spawn
+        assert hung.overruns == 2
+        assert other.overruns == 0
+        assert moved  # the other worker's moves still came through
@@ -0,0 +1,38 @@
+import whca
+from maps import parse_map
+from search import counters
+
+# The wall leaves one way round, on the right: (0, 0) is 2 steps from the
+# bot by Manhattan distance but 10 around the wall, (4, 0) is 6 either way.
+MAP = """\
+.....
+@@@@.
+.....
+"""
+
+def _walled():
+    grid_map = parse_map(MAP)
+    connectivity = grid_map.precompute(cache_dir=None)
+    walls = {(x, y) for x, y in grid_map.wall_positions()}
+    return connectivity, walls
+
+def test_pick_target_measures_around_the_walls():
+    connectivity, _ = _walled()
+    table = whca.ReservationTable()
+    points = [(0, 0), (4, 0)]
+    assert table.pick_target("bot", (0, 2), points) == (0, 0)
+    assert table.pick_target("bot", (0, 2), points, connectivity.estimate) == (4, 0)
+
+def test_plan_with_the_map_estimate_expands_less():
+    connectivity, walls = _walled()
+    expanded = []
+    for estimate in (None, connectivity.estimate):
+        before = counters.expanded
+        path = whca.plan(whca.ReservationTable(), "bot", (0, 2), (0, 0), 0, 12, 5, 3,
+                         set(), set(), walls, estimate)
+        expanded.append(counters.expanded - before)
+        assert path[0] == (0, 2) and path[-1] == (0, 0)
+        assert len(path) == 11  # 10 steps, no waiting
+        assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+        assert not walls & set(path)
+    assert expanded[1] < expanded[0]
@@ -0,0 +1,92 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from maps import load_map
+from simulation import GRID_SIZE, MAX_TURNS, POINT_COUNT, Simulation, find_strategy, format_results
+
+# ----------------- Sharding -----------------
+def split_rounds(total_rounds, shards):
+    """Split round indices 0..total_rounds-1 into contiguous (first_round, count) shards"""
+    shards = max(1, min(shards, total_rounds))
+    base, extra = divmod(total_rounds, shards)
+    result = []
+    first = 0
+    for i in range(shards):
+        count = base + (1 if i < extra else 0)
+        result.append((first, count))
+        first += count
+    return result
+
+def run_shard(strategy_names, seed, first_round, count, max_turns=MAX_TURNS,
+              width=GRID_SIZE, height=GRID_SIZE, point_count=POINT_COUNT, map_path=None):
+    """Worker entry point: play a slice of the tournament and return its performance table"""
+    strategies = [find_strategy(name) for name in strategy_names]
+    grid_map = load_map(map_path) if map_path else None  # precomputed data comes from the disk cache
+    sim = Simulation(strategies, strategy_names, max_turns=max_turns,
+                     width=width, height=height, point_count=point_count, grid_map=grid_map)
+    return sim.run(count, seed=seed, first_round=first_round)
+
+def merge_performance(tables):
+    """Sum wins, total_score and total_turns of several performance tables"""
+    merged = {}
+    for table in tables:
+        for name, stats in table.items():
+            total = merged.setdefault(name, {'wins': 0, 'total_score': 0, 'total_turns': 0})
+            for key in total:
+                total[key] += stats[key]
+    return merged
+
+# ----------------- Tournament -----------------
+def run_tournament(strategy_names, total_rounds, seed=0, workers=None, shards=None, max_turns=MAX_TURNS,
+                   width=GRID_SIZE, height=GRID_SIZE, point_count=POINT_COUNT, map_path=None):
+    """Play total_rounds rounds across a process pool.
+
+    Every round is seeded from (seed, round index) alone, so the merged result
+    is identical for any number of workers or shards.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers * 4
+    plan = split_rounds(total_rounds, shards)
+    options = (max_turns, width, height, point_count, map_path)
+    if map_path:
+        load_map(map_path)  # build the map's cache once, before the workers read it
+
+    if workers == 1:
+        tables = [run_shard(strategy_names, seed, first, count, *options) for first, count in plan]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_shard, strategy_names, seed, first, count, *options)
+                       for first, count in plan]
+            tables = [future.result() for future in futures]
+
+    performance = merge_performance(tables)
+    # Keep the seat order of strategy_names, like show_final_results expects
+    return {name: performance[name] for name in strategy_names if name in performance}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a seeded tournament across worker processes")
+    parser.add_argument("-r", "--rounds", type=int, default=10000)
+    parser.add_argument("-s", "--strategies", nargs=4, default=["Random", "Greedy", "Rule-based", "BFS"],
+                        metavar="NAME", help="four names from STRATEGIES, in seat order")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--width", type=int, default=GRID_SIZE)
+    parser.add_argument("--height", type=int, default=GRID_SIZE)
+    parser.add_argument("--points", type=int, default=POINT_COUNT)
+    parser.add_argument("--map", metavar="FILE", help="obstacle map (MovingAI .map or text grid); sets the size")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    performance = run_tournament(args.strategies, args.rounds, seed=args.seed,
+                                 workers=args.workers, max_turns=args.max_turns,
+                                 width=args.width, height=args.height, point_count=args.points,
+                                 map_path=args.map)
+    elapsed = time.perf_counter() - start
+
+    print(format_results(performance, args.rounds))
+    print(f"\n{args.rounds} rounds in {elapsed:.2f}s ({args.rounds / elapsed:.0f} rounds/s)")
+
+if __name__ == "__main__":
+    main()
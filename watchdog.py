@@ -0,0 +1,43 @@
+import time
+from search import deadline
+
+DEFAULT_MOVE = (0, 0)   # what a bot does on a turn its strategy overran
+OVERRUN_GRACE = 0.0005  # seconds past the budget a search may take to notice and return
+
+# ----------------- Decision budgets -----------------
+# A bot with a budget has that many seconds to decide each turn. The deadline
+# the searches look at (search.deadline) is set around the call, so heap
+# searches, JPS, RRT and D* Lite stop in time and answer with the best move
+# they have. Python cannot interrupt a call that never looks, so in-process
+# the watchdog is the clock around it: a move that comes back later than the
+# budget plus OVERRUN_GRACE is thrown away, the bot plays DEFAULT_MOVE and the
+# overrun is counted on the bot. A hard limit needs another process:
+# host.StrategyHost stops waiting for a worker that overruns and replaces it.
+
+def budgets_for(bots, budget):
+    """Seconds per decision for each seat, or None if nobody has a budget
+
+    budget is None, one number for every bot, or {bot name: seconds} where
+    the None key, if any, covers the bots not named.
+    """
+    if budget is None:
+        return None
+    if isinstance(budget, dict):
+        seats = [budget.get(bot.name, budget.get(None)) for bot in bots]
+    else:
+        seats = [budget] * len(bots)
+    return seats if any(b is not None for b in seats) else None
+
+def decide(bot, grid, points, bots, budget=None):
+    """bot's move within budget seconds (None: no limit); returns (move, seconds taken)"""
+    deadline.start(budget)
+    start = time.perf_counter()
+    try:
+        move = bot.strategy(bot, grid, points, bots)
+    finally:
+        elapsed = time.perf_counter() - start
+        deadline.stop()
+    if budget is not None and elapsed > budget + OVERRUN_GRACE:
+        bot.overruns += 1
+        move = DEFAULT_MOVE
+    return move, elapsed
@@ -0,0 +1,128 @@
+import heapq
+from search import CHECK_EVERY, DIRECTIONS, counters, deadline
+
+# ----------------- Windowed Hierarchical Cooperative A* -----------------
+# Bots using the planner share one space-time reservation table per round.
+# A plan covers the next `window` turns: path[i] is the bot's cell at the end
+# of turn start + i (path[0] is where it stands when planning). A bot may end
+# turn t on a cell only if nobody else holds that cell at t, nor at t - 1:
+# bots move one after another within a turn, so stepping onto a cell another
+# bot is just leaving (following or swapping) is never safe.
+#
+# The "hierarchical" heuristic is the true distance ignoring other bots: on a
+# map, connectivity.estimate (exact around the walls once its table is built),
+# on an open board the Manhattan distance.
+
+WAIT = (0, 0)
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+class ReservationTable:
+    def __init__(self):
+        self.cells = {}    # (x, y, t) -> bot holding the cell at the end of turn t
+        self.owned = {}    # bot -> its keys, in time order
+        self.targets = {}  # bot -> point it is heading for
+
+    def holder(self, x, y, t):
+        return self.cells.get((x, y, t))
+
+    def reserve(self, bot, path, start, target):
+        keys = self.owned.setdefault(bot, [])
+        for t, (x, y) in enumerate(path, start):
+            key = (x, y, t)
+            if key not in self.cells:
+                self.cells[key] = bot
+                keys.append(key)
+        self.targets[bot] = target
+
+    def release(self, bot):
+        for key in self.owned.pop(bot, ()):
+            if self.cells.get(key) is bot:
+                del self.cells[key]
+        self.targets.pop(bot, None)
+
+    def active(self, bot, now):
+        """True if bot holds reservations from now on, i.e. is planning jointly"""
+        keys = self.owned.get(bot)
+        return bool(keys) and keys[-1][2] > now
+
+    def pick_target(self, bot, pos, points, estimate=None):
+        """Nearest point no other cooperating bot is heading for (nearest overall if all are taken)
+
+        estimate: distance(a, b) around the walls, e.g. connectivity.estimate;
+        Manhattan without one. The points must be reachable from pos.
+        """
+        claimed = {target for owner, target in self.targets.items() if owner is not bot}
+        free = [p for p in points if p not in claimed] or points
+        distance = estimate or _manhattan
+        return min(free, key=lambda p: distance(pos, p))
+
+def plan(table, bot, start, goal, now, window, width, height, static, occupied, walls=(),
+         estimate=None):
+    """Space-time A* from start at turn now; the cells from now until goal or the window end, or []
+
+    static: cells to treat as blocked throughout (bots not planning jointly).
+    occupied: cells blocked right now, checked for the first step only.
+    walls: the map's walls.
+    estimate: distance(a, b) around the walls for the heuristic, Manhattan without one.
+    Past search.deadline it plans up to the cell nearest the goal it reached.
+    """
+    cells = table.cells
+    horizon = now + window
+
+    def h(x, y):
+        if estimate is not None:
+            d = estimate((x, y), goal)
+            if d is not None:
+                return d
+        return abs(x - goal[0]) + abs(y - goal[1])
+
+    def free(x, y, t):
+        if not (0 <= x < width and 0 <= y < height) or (x, y) in static or (x, y) in walls:
+            return False
+        if t == now + 1 and (x, y) != start and (x, y) in occupied:
+            return False
+        other = cells.get((x, y, t))
+        if other is not None and other is not bot:
+            return False
+        other = cells.get((x, y, t - 1))
+        return other is None or other is bot
+
+    node = (start[0], start[1], now)
+    parent = {node: None}
+    heap = [(h(*start), h(*start), node)]  # (f, h, node): ties go to the node nearer the goal
+    closed = set()
+    found = None
+    best = (h(*start), node)
+    timed = deadline.at is not None
+    while heap:
+        _, dist, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        x, y, t = node
+        if dist == 0 or t == horizon:
+            found = node
+            break
+        best = min(best, (dist, node))
+        if timed and len(closed) % CHECK_EVERY == 0 and deadline.passed():
+            found = best[1]
+            break
+        for dx, dy in DIRECTIONS + [WAIT]:
+            nx, ny = x + dx, y + dy
+            nxt = (nx, ny, t + 1)
+            if nxt not in parent and free(nx, ny, t + 1):
+                parent[nxt] = node
+                hn = h(nx, ny)
+                heapq.heappush(heap, (t + 1 - now + hn, hn, nxt))
+    counters.expanded += len(closed)
+    counters.pushed += len(parent) - 1
+    if found is None:
+        return []
+    path = []
+    while found is not None:
+        path.append(found[:2])
+        found = parent[found]
+    counters.path_length = len(path) - 1
+    return path[::-1]
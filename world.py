@@ -0,0 +1,239 @@
+import itertools
+import random
+from algorithms import GRID_SIZE
+from assignment import Assignment
+from bitboard import Bitboard
+import flowfield
+from flowfield import DistanceField, NearestSearch
+from hpa import HPAGraph
+from jps_plus import JumpTable
+from whca import ReservationTable
+
+# ----------------- Cell lookups -----------------
+class CellView:
+    """Read-only `pos in view` over a per-cell bytearray, optionally ignoring one cell"""
+    __slots__ = ('cells', 'width', 'height', 'exclude')
+
+    def __init__(self, cells, width, height, exclude=None):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.exclude = exclude
+
+    def __contains__(self, pos):
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height and pos != self.exclude:
+            return self.cells[y * self.width + x] != 0
+        return False
+
+# ----------------- World -----------------
+class World:
+    """Per-round state the engine hands to strategies as their `grid` argument.
+
+    Carries the grid dimensions (any width x height), flat bytearrays for
+    blocked cells (walls and bots) and remaining points that the engine
+    updates as bots move and points are taken, and shared services like the
+    distance field, which are built on first use and kept up to date through
+    bot_moved / point_collected.
+
+    With a grid_map (maps.GridMap) the world takes its size and static walls
+    from the map, and spawns and points only go in its largest connected area.
+    With bitboard=True the distance field is a bitboard.Bitboard, answering
+    the same queries by flooding big-int bitmasks instead of keeping a
+    distance per cell. Otherwise boards of up to flowfield.SEARCH_CELLS cells
+    get a flowfield.NearestSearch, which searches per query instead.
+    """
+    def __init__(self, width=GRID_SIZE, height=GRID_SIZE, grid_map=None, bitboard=False):
+        if grid_map is not None:
+            width, height = grid_map.width, grid_map.height
+        self.width = width
+        self.height = height
+        self.map = grid_map
+        self.bitboard = bitboard
+        self.walls = bytearray(grid_map.walls) if grid_map is not None else bytearray(width * height)
+        self.points = []
+        self.bots = []
+        self.occupied = bytearray(self.walls)
+        self.point_map = bytearray(width * height)
+        self.turn = 0
+        self._distance_field = None
+        self._jump_table = None
+        self._hpa = None
+        self._reservations = None
+        self._assignment = None
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_open(self, x, y):
+        """Not a wall and, on a map, connected to the map's largest area"""
+        if self.map is None:
+            return True
+        return self.map.connectivity.in_main(x, y)
+
+    def open_cells(self):
+        if self.map is None:
+            return self.width * self.height
+        conn = self.map.connectivity
+        return conn.sizes.get(conn.main, 0)
+
+    def corners(self):
+        """Starting corners, in seat order"""
+        w, h = self.width - 1, self.height - 1
+        return [(0, 0), (w, 0), (0, h), (w, h)]
+
+    def spawn_positions(self, count):
+        """The four corners first, then further cells spread evenly over the grid
+
+        On a map each corner is replaced by the nearest open cell.
+        """
+        spawns = self.corners()[:count]
+        if self.map is not None:
+            spawns = list(dict.fromkeys(self.map.nearest_open(c) for c in spawns))
+        taken = set(spawns)
+        cells = self.width * self.height
+        step = max(1, cells // (count - len(spawns) + 1))
+        for i in itertools.chain(range(step, cells, step), range(cells)):
+            if len(spawns) >= count:
+                break
+            pos = (i % self.width, i // self.width)
+            if pos not in taken and self.is_open(*pos):
+                spawns.append(pos)
+                taken.add(pos)
+        return spawns
+
+    def generate_points(self, count, exclude=None):
+        """count distinct random cells, never on a spawn cell (the corners by default)
+
+        Up to half the open cells are drawn by rejection, which stays cheap
+        there; denser boards sample the open cells without replacement.
+        """
+        excluded = set(self.corners() if exclude is None else exclude)
+        count = min(count, self.open_cells() - len(excluded))
+        if count * 2 > self.open_cells():
+            w = self.width
+            if self.map is None:
+                cells = range(self.width * self.height)
+            else:
+                conn = self.map.connectivity
+                cells = [i for i in conn.cells if conn.labels[i] == conn.main]
+            picked = ((i % w, i // w) for i in random.sample(cells, min(len(cells), count + len(excluded))))
+            return [p for p in picked if p not in excluded][:count]
+        points = set()
+        while len(points) < count:
+            p = (random.randint(0, self.width-1), random.randint(0, self.height-1))
+            if p not in excluded and self.is_open(*p):
+                points.add(p)
+        return list(points)
+
+    def start_round(self, points, bots):
+        self.points = points
+        self.bots = bots
+        self.turn = 0
+        self._distance_field = None
+        self._jump_table = None
+        self._hpa = None
+        self._reservations = None
+        self._assignment = None
+        w = self.width
+        self.occupied = bytearray(self.walls)
+        for bot in bots:
+            self.occupied[bot.y * w + bot.x] = 1
+        self.point_map = bytearray(self.width * self.height)
+        for x, y in points:
+            self.point_map[y * w + x] = 1
+
+    # --- O(1) queries ---
+    def is_occupied(self, x, y):
+        return self.occupied[y * self.width + x] != 0
+
+    def has_point(self, x, y):
+        return self.point_map[y * self.width + x] != 0
+
+    def occupancy(self, exclude=None):
+        """View of bot and wall cells usable like get_occupied_positions' set"""
+        return CellView(self.occupied, self.width, self.height, exclude)
+
+    def wall_lookup(self):
+        return CellView(self.walls, self.width, self.height)
+
+    def point_lookup(self, exclude=None):
+        return CellView(self.point_map, self.width, self.height, exclude)
+
+    @property
+    def connectivity(self):
+        """The map's components and distances (maps.Connectivity), None on an open board"""
+        return self.map.connectivity if self.map is not None else None
+
+    def obstacles(self):
+        """Every blocked cell: the map's walls, then the bots"""
+        walls = self.map.wall_positions() if self.map is not None else []
+        return walls + [(bot.x, bot.y) for bot in self.bots]
+
+    @property
+    def distance_field(self):
+        if self._distance_field is None:
+            if self.bitboard:
+                self._distance_field = Bitboard(self.width, self.height, self.walls, self.points,
+                                                [(bot.x, bot.y) for bot in self.bots])
+            elif self.width * self.height <= flowfield.SEARCH_CELLS:
+                self._distance_field = NearestSearch(self)
+            else:
+                self._distance_field = DistanceField(self.width, self.height, self.points, self.obstacles())
+        return self._distance_field
+
+    @property
+    def jump_table(self):
+        if self._jump_table is None:
+            self._jump_table = JumpTable(self.width, self.height, self.obstacles())
+        return self._jump_table
+
+    @property
+    def hpa(self):
+        """Cluster graph for hierarchical path-finding (hpa.HPAGraph)"""
+        if self._hpa is None:
+            self._hpa = HPAGraph(self.width, self.height, self.walls, [(bot.x, bot.y) for bot in self.bots])
+        return self._hpa
+
+    @property
+    def reservations(self):
+        """Space-time reservation table shared by bots planning with WHCA*"""
+        if self._reservations is None:
+            self._reservations = ReservationTable()
+        return self._reservations
+
+    @property
+    def assignment(self):
+        """Bot -> point auction per team of bots sharing a strategy"""
+        if self._assignment is None:
+            self._assignment = Assignment(self)
+        return self._assignment
+
+    # --- engine updates ---
+    def bot_moved(self, old, new):
+        w = self.width
+        self.occupied[old[1] * w + old[0]] = 0
+        self.occupied[new[1] * w + new[0]] = 1
+        self._services_moved(old, new)
+
+    def point_collected(self, pos):
+        self.point_map[pos[1] * self.width + pos[0]] = 0
+        self._services_collected(pos)
+
+    def _services_moved(self, old, new):
+        """Bring the shared services that track bots up to date"""
+        if self._distance_field is not None:
+            self._distance_field.move_obstacle(old, new)
+        if self._jump_table is not None:
+            self._jump_table.move_obstacle(old, new)
+        if self._hpa is not None:
+            self._hpa.move_obstacle(old, new)
+
+    def _services_collected(self, pos):
+        if self._distance_field is not None:
+            self._distance_field.remove_point(pos)
+        if self._assignment is not None:
+            self._assignment.point_collected(pos)
+
+    def end_turn(self):
+        self.turn += 1